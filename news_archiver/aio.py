@@ -0,0 +1,642 @@
+"""
+Async-native API for embedding the archiver in an asyncio application.
+
+Scraping, archive resolution and Readwise submission are available as
+coroutines and async generators built on a shared aiohttp session, so
+thousands of lookups can run on one event loop without thread pools:
+
+    async with AsyncArchiverClient(limit=20) as client:
+        articles = await scrape_articles(config, 'economist', 'Mar 29th 2025', client=client)
+        async for result in iter_archive_results(articles['economist'], client=client):
+            print(result.article.title, result.archive_url)
+
+Requires the optional aiohttp dependency (pip install news_archiver[aio]).
+"""
+import os
+import asyncio
+import logging
+import functools
+from urllib.parse import urlsplit
+from datetime import datetime, timezone
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from news_archiver.archiver import (
+    ARCHIVE_BASE_URL, parse_timemap, extract_archive_link_from_html
+)
+from news_archiver.readwise_integration import READWISE_SAVE_URL, build_readwise_payload, readwise_date
+from news_archiver.records import ArticleRecord, ArchiveResult, ReadwiseResult
+from news_archiver.scrapers import SCRAPERS
+from news_archiver.singleflight import AsyncSingleFlight
+from news_archiver.urls import SeenUrlIndex
+from news_archiver.delta import IssueHistory, ISSUE_HISTORY_FILE
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# File (under the output directory) recording every article URL already processed
+SEEN_URLS_FILE = 'seen_urls.txt'
+
+class AsyncArchiverClient:
+    """
+    Shared aiohttp session with connection limits for all async operations.
+
+    Use it as an async context manager and pass it to every call that should
+    share its connection pool, limits and request coalescing.
+    """
+
+    def __init__(self, limit=20, limit_per_host=4, timeout=60):
+        """
+        Initialize the client.
+
+        Args:
+            limit (int): Maximum number of simultaneous connections.
+            limit_per_host (int): Maximum number of simultaneous connections per host.
+            timeout (float): Total timeout for a single request, in seconds.
+        """
+        if aiohttp is None:
+            raise ImportError("news_archiver.aio requires aiohttp. Install it with: pip install news_archiver[aio]")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.session = None
+        self.flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Open the underlying session."""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self):
+        """Close the underlying session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get(self, url):
+        """
+        Fetch a URL, following redirects.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            tuple: (status code, final URL, body text).
+        """
+        async with self.session.get(url) as response:
+            text = await response.text(errors='replace')
+            return response.status, str(response.url), text
+
+    async def post_json(self, url, payload, headers=None):
+        """
+        POST a JSON payload.
+
+        Args:
+            url (str): The URL to post to.
+            payload (dict): JSON body.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            tuple: (status code, parsed JSON body or None).
+        """
+        async with self.session.post(url, json=payload, headers=headers) as response:
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+            return response.status, data
+
+class _ClientScope:
+    """Use the given client, or open a temporary one for the duration of a call."""
+
+    def __init__(self, client):
+        self.client = client
+        self.owned = client is None
+
+    async def __aenter__(self):
+        if self.owned:
+            self.client = AsyncArchiverClient()
+        await self.client.open()
+        return self.client
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.owned:
+            await self.client.close()
+
+async def _in_thread(fn, *args):
+    """Run blocking file I/O or HTML parsing in the default executor, off the event loop."""
+    return await asyncio.get_event_loop().run_in_executor(None, functools.partial(fn, *args))
+
+# Scraping
+
+async def _atlantic_issues(scraper, client):
+    """Fetch and parse The Atlantic's backissues page into scraper.issue_urls."""
+    status, _, html = await client.get(scraper.backissues_url)
+    if status == 200:
+        scraper.issue_urls = await _in_thread(scraper.parse_issue_links, html)
+    return scraper.issue_urls
+
+async def _economist_issues(scraper, client):
+    """Walk The Economist's weekly edition archive concurrently into the scraper's catalog."""
+    status, _, html = await client.get(scraper.archive_url)
+    if status != 200:
+        return {}
+
+    editions, years, page_urls = await _in_thread(scraper._parse_archive_page, html)
+    catalog = {}
+    scraper._merge_editions(catalog, editions)
+
+    landing_year = max((issue_date.year for issue_date in catalog), default=None)
+    pending = set(page_urls)
+    for year in years:
+        if year != landing_year and not (scraper.start_year and year < scraper.start_year):
+            pending.add(f"{scraper.archive_url}?year={year}")
+
+    seen = {scraper.archive_url}
+    while pending:
+        urls = sorted(pending - seen)
+        seen.update(pending)
+        pending = set()
+        for result in await asyncio.gather(*(client.get(url) for url in urls), return_exceptions=True):
+            if isinstance(result, Exception) or result[0] != 200:
+                continue
+            editions, _, page_urls = await _in_thread(scraper._parse_archive_page, result[2])
+            scraper._merge_editions(catalog, editions)
+            pending.update(page_urls)
+        pending -= seen
+
+    scraper._build_issue_index(catalog)
+    return scraper.issue_urls
+
+# Coroutines filling a scraper's issue catalog, by source name
+ISSUE_LISTERS = {
+    'atlantic': _atlantic_issues,
+    'economist': _economist_issues,
+}
+
+async def get_available_issues(source, output_path=None, client=None):
+    """
+    Get the available issues of a source.
+
+    Args:
+        source (str): Source name (e.g. 'economist').
+        output_path (str, optional): Directory for the scraper's output files.
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Returns:
+        dict: Dictionary mapping issue names to their URLs.
+    """
+    scraper = SCRAPERS[source](output_path or os.path.join('data', source))
+    async with _ClientScope(client) as client:
+        return await ISSUE_LISTERS[source](scraper, client)
+
+async def _resolve_issue(scraper, issue, client):
+    """
+    Fetch an issue's page from the URL its name maps to, without the issue listing.
+
+    The async counterpart of BaseScraper.resolve_issue; the page is downloaded
+    right away instead of checked with HEAD, since it is needed anyway.
+
+    Returns:
+        tuple: (issue URL, page HTML), or (None, None) if the issue could not be resolved this way.
+    """
+    candidate = scraper.issue_from_template(issue)
+    if not candidate:
+        return None, None
+    issue_name, url = candidate
+    try:
+        status, final_url, html = await client.get(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug("Could not fetch %s: %s", url, e)
+        return None, None
+    if status != 200 or urlsplit(final_url).path.rstrip('/') != urlsplit(url).path.rstrip('/'):
+        logger.info("No issue page at %s; looking %s up in the issue list.", url, issue)
+        return None, None
+    logger.info("Resolved %s to %s", issue_name, url)
+    scraper.selected_issue = issue_name
+    scraper.issue_urls.setdefault(issue_name, url)
+    return url, html
+
+def _save_and_extract(scraper, html):
+    """Save an issue page and extract its article records (blocking)."""
+    html_path = os.path.join(scraper.output_path, scraper.issue_file)
+    with open(html_path, "w", encoding="utf-8") as file:
+        file.write(html)
+    return scraper.article_records(scraper.extract_articles(html_path))
+
+async def scrape_source(source, selected_issue, output_path=None, seen_index=None, client=None, issue_history=None):
+    """
+    Scrape the articles of one issue of a source.
+
+    An issue whose name maps straight to its URL is fetched without walking
+    the issue listing. Saving and parsing the page run off the event loop.
+
+    Args:
+        source (str): Source name (e.g. 'atlantic').
+        selected_issue (str): Issue name, date (Economist) or issue URL.
+        output_path (str, optional): Directory for the scraper's output files.
+        seen_index (SeenUrlIndex, optional): Index used to skip articles already processed.
+        client (AsyncArchiverClient, optional): Shared client.
+        issue_history (IssueHistory, optional): Article sets of the issues processed before,
+                                                used to only return articles added since.
+
+    Returns:
+        list: ArticleRecord objects for articles not seen before (empty if the issue could not be found).
+    """
+    scraper = SCRAPERS[source](
+        output_path or os.path.join('data', source), selected_issue, seen_index=seen_index, issue_history=issue_history
+    )
+    html = None
+
+    async with _ClientScope(client) as client:
+        if selected_issue.startswith('http'):
+            issue_url = selected_issue
+        else:
+            issue_url, html = await _resolve_issue(scraper, selected_issue, client)
+        if not issue_url:
+            await ISSUE_LISTERS[source](scraper, client)
+            issue_url = scraper.issue_urls.get(selected_issue)
+            if not issue_url and hasattr(scraper, 'find_issue_by_date'):
+                issue_name = scraper.find_issue_by_date(selected_issue)
+                if issue_name:
+                    scraper.selected_issue = issue_name
+                    issue_url = scraper.issue_urls[issue_name]
+        if not issue_url:
+            logger.warning("Issue '%s' not found for %s.", selected_issue, source.capitalize())
+            return []
+
+        if html is None:
+            status, _, html = await client.get(issue_url)
+            if status != 200:
+                logger.error("Failed to download issue page %s: %s", issue_url, status)
+                return []
+
+    return await _in_thread(_save_and_extract, scraper, html)
+
+async def scrape_articles(config, source=None, selected_issue=None, client=None, include_seen=False):
+    """
+    Scrape articles from all enabled sources (or one source) concurrently.
+
+    Unlike the blocking API there is no interactive selection, so an issue must be given.
+    Only articles added to an issue since it was last processed are returned.
+    Articles recorded as processed by earlier runs are skipped; the async API does not
+    record the articles it processes, so callers that want later runs to skip them
+    should record finished articles with SeenUrlIndex.record and IssueHistory.record.
+
+    Args:
+        config (dict): The configuration dictionary.
+        source (str, optional): Specific source to scrape (if None, scrape all enabled sources).
+        selected_issue (str): Issue to scrape.
+        client (AsyncArchiverClient, optional): Shared client.
+        include_seen (bool): Also return articles that earlier runs already processed.
+
+    Returns:
+        dict: Dictionary mapping source names to lists of ArticleRecord objects.
+    """
+    if not selected_issue:
+        raise ValueError("selected_issue is required for async scraping")
+
+    sources = config.get('sources', {})
+    names = [
+        name for name, source_config in sources.items()
+        if name in SCRAPERS and source_config.get('enabled', False) and (not source or name == source)
+    ]
+    seen_index = SeenUrlIndex(
+        os.path.join(config.get('output_directory', 'data'), SEEN_URLS_FILE),
+        ignore_existing=include_seen
+    )
+    issue_history = IssueHistory(
+        os.path.join(config.get('output_directory', 'data'), ISSUE_HISTORY_FILE),
+        ignore_existing=include_seen
+    )
+
+    async with _ClientScope(client) as client:
+        articles = await asyncio.gather(*(
+            scrape_source(name, selected_issue, sources[name].get('output_path'), seen_index, client, issue_history)
+            for name in names
+        ))
+    return {name: records for name, records in zip(names, articles) if records}
+
+# Archive resolution
+
+async def find_existing_snapshot(article_url, max_age_days=None, archive_base_url=ARCHIVE_BASE_URL, client=None):
+    """
+    Look up the newest existing snapshot of an article via the archive's timemap.
+
+    Args:
+        article_url (str): The original article URL.
+        max_age_days (float, optional): Only reuse snapshots at most this old. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Returns:
+        str: URL of a fresh enough snapshot or None if the article must be captured.
+    """
+    timemap_url = f'{archive_base_url.rstrip("/")}/timemap/{article_url}'
+    async with _ClientScope(client) as client:
+        try:
+            status, _, text = await client.get(timemap_url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Error fetching timemap for %s: %s", article_url, e)
+            return None
+
+    if status != 200:
+        return None
+    snapshots = parse_timemap(text)
+    if not snapshots:
+        return None
+
+    captured_at, snapshot_url = snapshots[-1]
+    if max_age_days is not None:
+        age = datetime.now(timezone.utc) - captured_at
+        if age.total_seconds() > max_age_days * 86400:
+            return None
+    return snapshot_url
+
+async def resolve_archive_link(archive_link, client=None, max_retries=3, retry_delay=2):
+    """
+    Resolve an archive.today link to its final archive URL.
+
+    The redirect is followed and the snapshot link extracted from the same response.
+
+    Args:
+        archive_link (str): The archive.today URL.
+        client (AsyncArchiverClient, optional): Shared client.
+        max_retries (int): Maximum number of attempts.
+        retry_delay (float): Delay between attempts in seconds.
+
+    Returns:
+        str: The final archive URL or None if it could not be resolved.
+    """
+    async with _ClientScope(client) as client:
+        for attempt in range(max_retries):
+            try:
+                status, _, html = await client.get(archive_link)
+                if status == 429:
+                    logger.warning("Rate limited (429). Waiting before retrying...")
+                    await asyncio.sleep(retry_delay * 2)
+                    continue
+                if status == 200:
+                    archive_url = extract_archive_link_from_html(html)
+                    if archive_url:
+                        return archive_url
+                    logger.warning("No archive link found in %s on attempt %d", archive_link, attempt + 1)
+                else:
+                    logger.warning("Failed to fetch page: %s", status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning("Error fetching the page on attempt %d: %s", attempt + 1, e)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
+    return None
+
+async def archive_article_result(article, client=None, reuse_snapshots=True, max_snapshot_age_days=None,
+                                 archive_base_url=ARCHIVE_BASE_URL):
+    """
+    Archive a single article, reusing an existing snapshot when possible.
+
+    Concurrent calls for the same article on the same client share one resolution.
+
+    Args:
+        article (str or ArticleRecord): The article URL or record.
+        client (AsyncArchiverClient, optional): Shared client.
+        reuse_snapshots (bool): Reuse existing snapshots found via the timemap.
+        max_snapshot_age_days (float, optional): Maximum age of a reused snapshot. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+
+    Returns:
+        ArchiveResult: The outcome for the article.
+    """
+    record = ArticleRecord.coerce(article)
+
+    async def resolve():
+        if reuse_snapshots:
+            snapshot_url = await find_existing_snapshot(record.url, max_snapshot_age_days, archive_base_url, client)
+            if snapshot_url:
+                return snapshot_url, ArchiveResult.REUSED
+        archive_link = f'{archive_base_url.rstrip("/")}/{record.url}'
+        archive_url = await resolve_archive_link(archive_link, client)
+        if archive_url:
+            return archive_url, ArchiveResult.CAPTURED
+        return None, ArchiveResult.FAILED
+
+    async with _ClientScope(client) as client:
+        archive_url, status = await client.flight.do(('archive', record.url), resolve)
+    error = None if archive_url else f"Could not archive {record.url}"
+    return ArchiveResult(record, archive_url, status, error)
+
+async def archive_article(article_url, client=None, reuse_snapshots=True, max_snapshot_age_days=None,
+                          archive_base_url=ARCHIVE_BASE_URL):
+    """
+    Archive a single article, reusing an existing snapshot when possible.
+
+    Args:
+        article_url (str): The article URL.
+        client (AsyncArchiverClient, optional): Shared client.
+        reuse_snapshots (bool): Reuse existing snapshots found via the timemap.
+        max_snapshot_age_days (float, optional): Maximum age of a reused snapshot. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+
+    Returns:
+        str: The final archive URL or None if archiving failed.
+    """
+    result = await archive_article_result(
+        article_url, client, reuse_snapshots, max_snapshot_age_days, archive_base_url
+    )
+    return result.archive_url
+
+async def iter_archive_results(articles, client=None, **options):
+    """
+    Archive articles concurrently, yielding each result as soon as it is ready.
+
+    Args:
+        articles (list): Article URLs or ArticleRecord objects.
+        client (AsyncArchiverClient, optional): Shared client.
+        **options: reuse_snapshots, max_snapshot_age_days and archive_base_url, as for archive_article.
+
+    Yields:
+        ArchiveResult: One result per unique article, in completion order.
+    """
+    records = {}
+    for article in articles:
+        record = ArticleRecord.coerce(article)
+        records.setdefault(record.url, record)
+
+    async with _ClientScope(client) as client:
+        tasks = [archive_article_result(record, client, **options) for record in records.values()]
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+
+async def archive_articles(article_urls, client=None, **options):
+    """
+    Archive articles concurrently.
+
+    Args:
+        article_urls (list): Article URLs.
+        client (AsyncArchiverClient, optional): Shared client.
+        **options: reuse_snapshots, max_snapshot_age_days and archive_base_url, as for archive_article.
+
+    Returns:
+        dict: Mapping of each article URL to its final archive URL (None if archiving failed),
+              in the order the articles were given.
+    """
+    results = dict.fromkeys(article_urls)
+    async for result in iter_archive_results(article_urls, client, **options):
+        results[result.article_url] = result.archive_url
+    return results
+
+# Readwise submission
+
+async def add_document_to_readwise(url, title=None, author=None, tags=None, access_token=None,
+                                   published_date=None, client=None):
+    """
+    Add a document to Readwise Reader.
+
+    Args:
+        url (str): The document's unique URL.
+        title (str, optional): The document's title.
+        author (str, optional): The document's author.
+        tags (list of str, optional): A list of tags for the document.
+        access_token (str): Readwise access token.
+        published_date (str, optional): The document's publication date (ISO 8601).
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Returns:
+        dict: The response from the Readwise API or None if failed.
+    """
+    if not access_token:
+        logger.error("No Readwise access token provided.")
+        return None
+
+    headers = {'Authorization': f'Token {access_token}'}
+    payload = build_readwise_payload(url, title, author, tags, published_date)
+
+    async def save():
+        try:
+            status, data = await client.post_json(READWISE_SAVE_URL, payload, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            logger.warning("Error adding document to Readwise: %s", err)
+            return None
+        if status in (200, 201):
+            return data
+        logger.warning("HTTP Error adding document to Readwise: %s", status)
+        return None
+
+    async with _ClientScope(client) as client:
+        return await client.flight.do(('readwise', access_token, url), save)
+
+async def iter_readwise_results(archive_urls, titles=None, author=None, tags=None, access_token=None,
+                                authors=None, published_dates=None, client=None):
+    """
+    Submit documents to Readwise concurrently, yielding each outcome as it completes.
+
+    Args:
+        archive_urls (list): List of archive URLs to add to Readwise.
+        titles (list, optional): List of article titles corresponding to the URLs.
+        author (str, optional): Author name to use for articles without their own.
+        tags (list, optional): List of tags to apply to all articles.
+        access_token (str): Readwise access token.
+        authors (list, optional): List of per-article authors corresponding to the URLs.
+        published_dates (list, optional): List of publication dates corresponding to the URLs.
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Yields:
+        ReadwiseResult: One result per unique archive URL, in completion order.
+    """
+    def item(values, i):
+        return values[i] if values and i < len(values) else None
+
+    async with _ClientScope(client) as client:
+        async def submit(i, url):
+            response = await add_document_to_readwise(
+                url, item(titles, i), item(authors, i) or author, tags, access_token, item(published_dates, i), client
+            )
+            if response:
+                return ReadwiseResult(url, ReadwiseResult.ADDED, response)
+            return ReadwiseResult(url, ReadwiseResult.FAILED, error="Readwise request failed")
+
+        submitted = set()
+        tasks = []
+        for i, url in enumerate(archive_urls):
+            if url not in submitted:
+                submitted.add(url)
+                tasks.append(submit(i, url))
+
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+
+async def add_articles_to_readwise(archive_urls, titles=None, author=None, tags=None, access_token=None,
+                                   authors=None, published_dates=None, client=None):
+    """
+    Add multiple articles to Readwise Reader concurrently.
+
+    Args:
+        archive_urls (list): List of archive URLs to add to Readwise.
+        titles (list, optional): List of article titles corresponding to the URLs.
+        author (str, optional): Author name to use for articles without their own.
+        tags (list, optional): List of tags to apply to all articles.
+        access_token (str): Readwise access token.
+        authors (list, optional): List of per-article authors corresponding to the URLs.
+        published_dates (list, optional): List of publication dates corresponding to the URLs.
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Returns:
+        list: List of successful additions (responses from the Readwise API).
+    """
+    successful_additions = []
+    async for result in iter_readwise_results(
+        archive_urls, titles, author, tags, access_token, authors, published_dates, client
+    ):
+        if result.ok:
+            successful_additions.append(result.response)
+    return successful_additions
+
+async def submit_to_readwise(archive_results, tags=None, access_token=None, client=None):
+    """
+    Add successfully archived articles to Readwise Reader concurrently.
+
+    Titles, authors and publication dates come from each result's article record.
+    Each result's readwise attribute is set to the outcome of its submission.
+
+    Args:
+        archive_results (list): ArchiveResult objects; failed results are skipped.
+        tags (list, optional): List of tags to apply to all articles.
+        access_token (str): Readwise access token.
+        client (AsyncArchiverClient, optional): Shared client.
+
+    Returns:
+        list: One ReadwiseResult per unique archive URL, in completion order.
+    """
+    archived = [result for result in archive_results if result.ok]
+    readwise_results = {}
+    async for readwise_result in iter_readwise_results(
+        [result.archive_url for result in archived],
+        titles=[result.article.title for result in archived],
+        authors=[result.article.author for result in archived],
+        published_dates=[readwise_date(result.article.date) for result in archived],
+        tags=tags,
+        access_token=access_token,
+        client=client
+    ):
+        readwise_results[readwise_result.url] = readwise_result
+
+    for result in archived:
+        result.readwise = readwise_results.get(result.archive_url)
+    return list(readwise_results.values())
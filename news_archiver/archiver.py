@@ -4,20 +4,80 @@ Module for archiving articles using archive.today.
 import requests
 from bs4 import BeautifulSoup
 import os
-import time
+import re
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from news_archiver.singleflight import SingleFlight
+from news_archiver.records import ArticleRecord, ArchiveResult
+from news_archiver.circuit import guarded_get, guarded_request, ChallengeError, CircuitOpenError
+from news_archiver import deadline
+from news_archiver.deadline import DeadlineExceeded
+from news_archiver.capture import CapturePoller, wait_for_capture, is_capture_in_progress
+from news_archiver.verify import verifier
+
+logger = logging.getLogger(__name__)
+
+# Base URL of the archive service; point this at a local stand-in for testing
+ARCHIVE_BASE_URL = "http://archive.today"
+
+# Entries of a Memento link-format timemap, e.g. <url>; rel="memento"; datetime="..."
+TIMEMAP_ENTRY_PATTERN = re.compile(r'<([^>]+)>\s*;([^<]*)')
+
+# Coalesces concurrent resolutions of the same archive.today link
+_archive_flight = SingleFlight()
+
+class CapturePending(Exception):
+    """Raised when archive.today is still capturing a page."""
+
+    def __init__(self, poll_url):
+        super().__init__(f"Capture in progress at {poll_url}")
+        self.poll_url = poll_url
+
+def poll_capture(poll_url):
+    """
+    Check once whether a capture in progress has finished.
+    
+    Args:
+        poll_url (str): URL of the capture's in-progress page.
+    
+    Returns:
+        str: The snapshot URL, or None while the capture is still in progress.
+    
+    Raises:
+        CircuitOpenError: If the host kept blocking requests for longer than the park timeout.
+        DeadlineExceeded: If the time budget or run deadline ran out.
+        requests.RequestException: If the page could not be fetched.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    
+    response = guarded_get(poll_url, headers=headers)
+    if response.status_code != 200 or is_capture_in_progress(response.url):
+        return None
+    # Finished captures redirect to the snapshot
+    return extract_archive_link_from_html(response.text) or response.url
 
 def create_directory(dir_path):
     """Create directory if it doesn't exist."""
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
-def get_archive_links(article_urls, output_path="data/archives"):
+def save_links(links, links_path):
+    """Write one link per line to a file."""
+    with open(links_path, 'w') as outfile:
+        for link in links:
+            outfile.write(f"{link}\n")
+
+def get_archive_links(article_urls, output_path="data/archives", archive_base_url=ARCHIVE_BASE_URL):
     """
     Generate archive.today links for a list of article URLs.
     
     Args:
         article_urls (list): List of article URLs to archive.
         output_path (str): Path to save the generated archive links.
+        archive_base_url (str): Base URL of the archive service.
     
     Returns:
         list: List of archive.today URLs.
@@ -26,17 +86,93 @@ def get_archive_links(article_urls, output_path="data/archives"):
     archive_links = []
     
     for url in article_urls:
-        archive_links.append(f'http://archive.today/{url}')
+        archive_links.append(archive_link_for(url, archive_base_url))
     
     # Save the archive links to a file
     links_path = os.path.join(output_path, "archive_links.txt")
-    with open(links_path, 'w') as outfile:
-        for link in archive_links:
-            outfile.write(f"{link}\n")
+    save_links(archive_links, links_path)
     
-    print(f"Archive links generated and saved to {links_path}")
+    logger.debug("Archive links generated and saved to %s", links_path)
     return archive_links
 
+def parse_timemap(timemap_text):
+    """
+    Parse a Memento link-format timemap into its snapshots.
+    
+    Args:
+        timemap_text (str): Body of a timemap response.
+    
+    Returns:
+        list: List of (datetime, snapshot URL) tuples, oldest first.
+    """
+    snapshots = []
+    for url, params in TIMEMAP_ENTRY_PATTERN.findall(timemap_text):
+        rel = re.search(r'rel="([^"]*)"', params)
+        if not rel or 'memento' not in rel.group(1).split():
+            continue
+        
+        captured_at = None
+        date_match = re.search(r'datetime="([^"]*)"', params)
+        if date_match:
+            try:
+                captured_at = parsedate_to_datetime(date_match.group(1))
+            except (TypeError, ValueError):
+                captured_at = None
+        if captured_at is None:
+            # Fall back to the 14-digit timestamp in timestamped snapshot URLs
+            stamp_match = re.search(r'/(\d{14})/', url)
+            if not stamp_match:
+                continue
+            captured_at = datetime.strptime(stamp_match.group(1), "%Y%m%d%H%M%S")
+        if captured_at.tzinfo is None:
+            captured_at = captured_at.replace(tzinfo=timezone.utc)
+        snapshots.append((captured_at, url))
+    
+    snapshots.sort(key=lambda snapshot: snapshot[0])
+    return snapshots
+
+def find_existing_snapshot(article_url, max_age_days=None, archive_base_url=ARCHIVE_BASE_URL):
+    """
+    Look up the newest existing snapshot of an article via the archive's timemap.
+    
+    Args:
+        article_url (str): The original article URL.
+        max_age_days (float, optional): Only reuse snapshots at most this old. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+    
+    Returns:
+        str: URL of a fresh enough snapshot or None if the article must be captured.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    timemap_url = f'{archive_base_url.rstrip("/")}/timemap/{article_url}'
+    
+    try:
+        response = guarded_get(timemap_url, headers=headers)
+    except ChallengeError:
+        logger.warning("Challenge page served for the timemap of %s", article_url)
+        return None
+    except DeadlineExceeded:
+        raise
+    except requests.exceptions.RequestException as e:
+        logger.warning("Error fetching timemap for %s: %s", article_url, e)
+        return None
+    
+    if response.status_code != 200:
+        return None
+    
+    snapshots = parse_timemap(response.text)
+    if not snapshots:
+        return None
+    
+    captured_at, snapshot_url = snapshots[-1]
+    if max_age_days is not None:
+        age = datetime.now(timezone.utc) - captured_at
+        if age.total_seconds() > max_age_days * 86400:
+            return None
+    return snapshot_url
+
 def get_final_redirected_url(initial_url, max_retries=3, retry_delay=2):
     """
     Fetches the final URL after following all redirects.
@@ -48,6 +184,10 @@ def get_final_redirected_url(initial_url, max_retries=3, retry_delay=2):
     
     Returns:
         str: The final URL after all redirects or None if failed.
+    
+    Raises:
+        CircuitOpenError: If the host kept blocking requests for longer than the park timeout.
+        DeadlineExceeded: If the time budget or run deadline ran out.
     """
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -55,14 +195,41 @@ def get_final_redirected_url(initial_url, max_retries=3, retry_delay=2):
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(initial_url, headers=headers)
+            response = guarded_get(initial_url, headers=headers)
             return response.url
+        except ChallengeError:
+            # The next attempt waits until the host's breaker lets a probe through
+            logger.warning("Challenge page served for %s on attempt %d", initial_url, attempt + 1)
+        except DeadlineExceeded:
+            raise
         except requests.RequestException as e:
-            print(f"Attempt {attempt+1}/{max_retries} failed: {e}")
+            logger.warning("Attempt %d/%d failed: %s", attempt + 1, max_retries, e)
             if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+                deadline.sleep(retry_delay)
+    
+    logger.error("Failed to get redirected URL for %s after %d attempts", initial_url, max_retries)
+    return None
+
+def extract_archive_link_from_html(html):
+    """
+    Find the snapshot link on an archive.today page.
+    
+    Args:
+        html (str): The archive.today page HTML.
+    
+    Returns:
+        str: The first link in the page's TEXT-BLOCK or None if there is none.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    
+    # Find the first div with class "TEXT-BLOCK"
+    text_block = soup.find("div", class_="TEXT-BLOCK")
     
-    print(f"Failed to get redirected URL for {initial_url} after {max_retries} attempts")
+    if text_block:
+        # Find the first anchor tag inside this div
+        archive_link = text_block.find("a", href=True)
+        if archive_link:
+            return archive_link["href"]
     return None
 
 def extract_actual_archive_link(archive_page_url, max_retries=3, retry_delay=2):
@@ -76,6 +243,11 @@ def extract_actual_archive_link(archive_page_url, max_retries=3, retry_delay=2):
     
     Returns:
         str: The actual archive link or None if not found.
+    
+    Raises:
+        CircuitOpenError: If the host kept blocking requests for longer than the park timeout.
+        DeadlineExceeded: If the time budget or run deadline ran out.
+        CapturePending: If archive.today is still capturing the page.
     """
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -83,43 +255,84 @@ def extract_actual_archive_link(archive_page_url, max_retries=3, retry_delay=2):
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(archive_page_url, headers=headers)
+            response = guarded_get(archive_page_url, headers=headers)
+            if is_capture_in_progress(response.url):
+                raise CapturePending(response.url)
             
             if response.status_code == 429:
-                print("Rate limited (429). Waiting before retrying...")
-                time.sleep(retry_delay * 2)  # Longer delay for rate limiting
+                logger.warning("Rate limited (429). Waiting before retrying...")
+                deadline.sleep(retry_delay * 2)  # Longer delay for rate limiting
                 continue
             elif response.status_code != 200:
-                print(f"Failed to fetch page: {response.status_code}")
-                time.sleep(retry_delay)
+                logger.warning("Failed to fetch page: %s", response.status_code)
+                deadline.sleep(retry_delay)
                 continue
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Find the first div with class "TEXT-BLOCK"
-            text_block = soup.find("div", class_="TEXT-BLOCK")
+            archive_link = extract_archive_link_from_html(response.text)
+            if archive_link:
+                return archive_link
             
-            if text_block:
-                # Find the first anchor tag inside this div
-                archive_link = text_block.find("a", href=True)
-                if archive_link:
-                    return archive_link["href"]
-            
-            print(f"No archive link found in {archive_page_url} on attempt {attempt+1}")
+            logger.warning("No archive link found in %s on attempt %d", archive_page_url, attempt + 1)
             if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+                deadline.sleep(retry_delay)
                 
+        except ChallengeError:
+            logger.warning("Challenge page served for %s on attempt %d", archive_page_url, attempt + 1)
+        except DeadlineExceeded:
+            raise
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching the page on attempt {attempt+1}: {e}")
+            logger.warning("Error fetching the page on attempt %d: %s", attempt + 1, e)
             if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+                deadline.sleep(retry_delay)
     
     return None
 
+def resolve_archive_link(archive_link):
+    """
+    Resolve an archive.today link to its final archive URL.
+    
+    Concurrent calls for the same link share a single redirect fetch and
+    snapshot extraction.
+    
+    Args:
+        archive_link (str): The archive.today URL.
+    
+    Returns:
+        str: The final archive URL or None if it could not be resolved.
+    
+    Raises:
+        CapturePending: If archive.today is still capturing the page.
+    """
+    return _archive_flight.do(archive_link, _resolve_archive_link, archive_link)
+
+def _resolve_archive_link(archive_link):
+    """Follow the redirect and extract the snapshot link for one archive.today URL."""
+    logger.debug("Processing: %s", archive_link)
+    
+    # Get the redirected URL
+    redirected_url = get_final_redirected_url(archive_link)
+    if not redirected_url:
+        return None
+    
+    logger.debug("Redirected to: %s", redirected_url)
+    if is_capture_in_progress(redirected_url):
+        raise CapturePending(redirected_url)
+    
+    # Extract the actual archive link
+    actual_archive_link = extract_actual_archive_link(redirected_url)
+    if actual_archive_link:
+        logger.debug("Extracted archive link: %s", actual_archive_link)
+    
+    # Add a small delay to avoid rate limiting
+    deadline.sleep(1)
+    return actual_archive_link
+
 def process_archive_links(archive_links, output_path="data/archives"):
     """
     Process a list of archive.today links to get the final archive URLs.
     
+    Duplicate links are resolved once and reused.
+    
     Args:
         archive_links (list): List of archive.today URLs.
         output_path (str): Path to save the processed archive links.
@@ -129,48 +342,393 @@ def process_archive_links(archive_links, output_path="data/archives"):
     """
     create_directory(output_path)
     final_archive_urls = []
+    resolved = {}
     
     for link in archive_links:
-        print(f"Processing: {link}")
-        
-        # Get the redirected URL
-        redirected_url = get_final_redirected_url(link)
-        if not redirected_url:
-            continue
+        if link not in resolved:
+            try:
+                resolved[link] = resolve_and_wait(link)
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                logger.warning("Giving up on %s: %s", link, e)
+                resolved[link] = None
+        elif resolved[link]:
+            logger.debug("Reusing archive link for duplicate: %s", link)
         
-        print(f"Redirected to: {redirected_url}")
-        
-        # Extract the actual archive link
-        actual_archive_link = extract_actual_archive_link(redirected_url)
-        if actual_archive_link:
-            print(f"Extracted archive link: {actual_archive_link}")
+        actual_archive_link = resolved[link]
+        if actual_archive_link and actual_archive_link not in final_archive_urls:
             final_archive_urls.append(actual_archive_link)
-        
-        # Add a small delay to avoid rate limiting
-        time.sleep(1)
     
     # Save the final archive links to a file
     final_links_path = os.path.join(output_path, "final_archive_links.txt")
-    with open(final_links_path, 'w') as outfile:
-        for link in final_archive_urls:
-            outfile.write(f"{link}\n")
+    save_links(final_archive_urls, final_links_path)
     
-    print(f"Final archive links saved to {final_links_path}")
+    logger.info("Final archive links saved to %s", final_links_path)
     return final_archive_urls
 
-def archive_articles(article_urls, output_path="data/archives"):
+def resolve_and_wait(archive_link):
+    """
+    Resolve an archive.today link, waiting in this thread for a capture in progress to finish.
+    
+    Args:
+        archive_link (str): The archive.today URL.
+    
+    Returns:
+        str: The final archive URL or None if it could not be resolved.
+    """
+    try:
+        return resolve_archive_link(archive_link)
+    except CapturePending as pending:
+        logger.info("Waiting for archive.today to finish capturing %s", archive_link)
+        return wait_for_capture(poll_capture, pending.poll_url)
+
+def archive_link_for(article_url, archive_base_url=ARCHIVE_BASE_URL):
+    """Return the archive.today link that captures an article."""
+    return f'{archive_base_url.rstrip("/")}/{article_url}'
+
+def request_capture(article_url, archive_base_url=ARCHIVE_BASE_URL):
+    """
+    Ask archive.today for a new capture of an article through its submit form.
+    
+    Unlike resolving the article's archive.today link, which leads to its
+    latest snapshot, this captures the article again even if it has been
+    captured before.
+    
+    Args:
+        article_url (str): URL of the article.
+        archive_base_url (str): Base URL of the archive service.
+    
+    Returns:
+        str: The new snapshot URL or None if the capture could not be requested.
+    
+    Raises:
+        CircuitOpenError: If the host kept blocking requests for longer than the park timeout.
+        DeadlineExceeded: If the time budget or run deadline ran out.
+        CapturePending: If archive.today is still capturing the page.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    submit_url = f'{archive_base_url.rstrip("/")}/submit/'
+    
+    try:
+        response = guarded_request('POST', submit_url, headers=headers, data={'url': article_url, 'anyway': '1'})
+    except ChallengeError:
+        logger.warning("Challenge page served when requesting a capture of %s", article_url)
+        return None
+    except DeadlineExceeded:
+        raise
+    except requests.exceptions.RequestException as e:
+        # A request cut short by the time budget means the budget ran out
+        deadline.check_deadline()
+        logger.warning("Could not request a capture of %s: %s", article_url, e)
+        return None
+    
+    # The form answers with the capture's in-progress page, either by redirect or in a Refresh header
+    location = response.url
+    refresh = response.headers.get('Refresh', '')
+    if 'url=' in refresh.lower():
+        location = refresh[refresh.lower().index('url=') + 4:].strip()
+    if is_capture_in_progress(location):
+        raise CapturePending(location)
+    if response.status_code != 200:
+        logger.warning("Could not request a capture of %s: HTTP %s", article_url, response.status_code)
+        return None
+    snapshot_url = extract_archive_link_from_html(response.text)
+    if snapshot_url:
+        return snapshot_url
+    return location if location.rstrip('/') != submit_url.rstrip('/') else None
+
+def capture_again(article_url, archive_base_url=ARCHIVE_BASE_URL):
+    """
+    Capture an article again, waiting in this thread for the capture to finish.
+    
+    Concurrent calls for the same article share one capture request.
+    
+    Args:
+        article_url (str): URL of the article.
+        archive_base_url (str): Base URL of the archive service.
+    
+    Returns:
+        str: The new snapshot URL or None if no capture was made.
+    """
+    try:
+        return _archive_flight.do(('submit', article_url), request_capture, article_url, archive_base_url)
+    except CapturePending as pending:
+        logger.info("Waiting for archive.today to finish capturing %s", article_url)
+        return wait_for_capture(poll_capture, pending.poll_url)
+
+def archive_article_result(article, reuse_snapshots=True, max_snapshot_age_days=None,
+                           archive_base_url=ARCHIVE_BASE_URL, store=None, capture_poller=None, on_captured=None):
+    """
+    Archive a single article, reusing an existing snapshot when possible.
+    
+    If archive.today is still capturing the article and a capture poller is
+    given, the article is parked with it and returned with the status pending;
+    the result is updated in place once the capture finishes. Without a
+    poller, this waits for the capture.
+    
+    Args:
+        article (str or ArticleRecord): The article URL or record.
+        reuse_snapshots (bool): Reuse an existing snapshot found via the timemap.
+        max_snapshot_age_days (float, optional): Maximum age of a reused snapshot. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+        store (ResultsStore, optional): Results store the outcome is recorded in.
+        capture_poller (CapturePoller, optional): Poller a capture in progress is parked with.
+        on_captured (callable, optional): Called with the result once a parked capture has
+                                          produced a snapshot (on the poller's callback pool).
+    
+    Returns:
+        ArchiveResult: The outcome for the article.
+    """
+    result = ArchiveResult(ArticleRecord.coerce(article))
+    url = result.article_url
+    archive_link = None
+    
+    try:
+        if reuse_snapshots:
+            snapshot_url = _archive_flight.do(
+                ('timemap', url), find_existing_snapshot, url, max_snapshot_age_days, archive_base_url
+            )
+            if snapshot_url:
+                logger.debug("Reusing existing snapshot: %s", snapshot_url)
+                result.archive_url = snapshot_url
+                result.status = ArchiveResult.REUSED
+        
+        if not result.ok:
+            archive_link = archive_link_for(url, archive_base_url)
+            try:
+                result.archive_url = resolve_archive_link(archive_link)
+            except CapturePending as pending:
+                if capture_poller is None:
+                    result.archive_url = wait_for_capture(poll_capture, pending.poll_url)
+                else:
+                    result.status = ArchiveResult.PENDING
+                    capture_poller.add(pending.poll_url, lambda snapshot_url, error: _finish_capture(
+                        result, archive_link, snapshot_url, error, store, on_captured
+                    ))
+            if result.archive_url:
+                result.status = ArchiveResult.CAPTURED
+            elif result.status != ArchiveResult.PENDING:
+                result.error = f"Could not resolve {archive_link}"
+    except CircuitOpenError as e:
+        logger.warning("Giving up on %s: %s", url, e)
+        result.status = ArchiveResult.BLOCKED
+        result.error = str(e)
+    except DeadlineExceeded as e:
+        logger.warning("Giving up on %s: %s", url, e)
+        result.archive_url = None
+        result.status = ArchiveResult.TIMED_OUT
+        result.error = str(e)
+    
+    if store:
+        store.add_archive_result(result, archive_link)
+    return result
+
+def _finish_capture(result, archive_link, snapshot_url, error, store=None, on_captured=None):
+    """Update a parked result once its capture is done, record it, and hand it on if it was captured."""
+    if snapshot_url:
+        logger.debug("Capture of %s finished: %s", archive_link, snapshot_url)
+        result.archive_url = snapshot_url
+        result.status = ArchiveResult.CAPTURED
+    elif isinstance(error, CircuitOpenError):
+        result.status = ArchiveResult.BLOCKED
+        result.error = str(error)
+    elif isinstance(error, DeadlineExceeded):
+        result.status = ArchiveResult.TIMED_OUT
+        result.error = str(error)
+    else:
+        result.status = ArchiveResult.FAILED
+        result.error = str(error) if error else f"Capture of {archive_link} did not finish in time"
+    if result.status != ArchiveResult.CAPTURED:
+        logger.warning("Giving up on %s: %s", result.article_url, result.error)
+    if store:
+        store.add_archive_result(result, archive_link)
+    if result.ok and on_captured:
+        on_captured(result)
+
+def verify_archive_result(result, archive_base_url=ARCHIVE_BASE_URL, store=None):
+    """
+    Check an archived article's snapshot, and capture the article again while the snapshot is broken.
+    
+    Up to verifier.retries fresh captures are requested through archive.today's
+    submit form, since resolving the article's archive.today link again would
+    lead back to the same snapshot. If none of them yields a working snapshot,
+    the result loses its archive URL and gets the status invalid. Snapshots
+    that cannot be checked are kept.
+    
+    Args:
+        result (ArchiveResult): The outcome of archiving the article; updated in place.
+        archive_base_url (str): Base URL of the archive service.
+        store (ResultsStore, optional): Results store a changed outcome is recorded in.
+    
+    Returns:
+        bool: True if the result has a snapshot that may be added to Readwise.
+    """
+    if not result.ok or not verifier.enabled:
+        return result.ok
+    archive_link = archive_link_for(result.article_url, archive_base_url)
+    rejected = []
+    
+    while True:
+        check = verifier.check(result.archive_url, result.article_url)
+        if not check.broken:
+            if rejected and store:
+                store.add_archive_result(result, archive_link)
+            return True
+        logger.warning("Snapshot %s of %s is broken: %s", result.archive_url, result.article_url, check.reason)
+        rejected.append(result.archive_url)
+        if len(rejected) > verifier.retries:
+            break
+        
+        logger.info("Capturing %s again", result.article_url)
+        try:
+            snapshot_url = capture_again(result.article_url, archive_base_url)
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logger.warning("Giving up on %s: %s", result.article_url, e)
+            break
+        if not snapshot_url or snapshot_url in rejected:
+            break
+        result.archive_url = snapshot_url
+        result.status = ArchiveResult.CAPTURED
+    
+    result.archive_url = None
+    result.status = ArchiveResult.INVALID
+    result.error = f"No working snapshot: {check.reason}"
+    if store:
+        store.add_archive_result(result, archive_link)
+    return False
+
+def verify_archive_results(results, archive_base_url=ARCHIVE_BASE_URL, store=None):
+    """
+    Check the snapshots of archived articles concurrently, capturing broken ones again.
+    
+    Args:
+        results (list): ArchiveResult objects; updated in place.
+        archive_base_url (str): Base URL of the archive service.
+        store (ResultsStore, optional): Results store changed outcomes are recorded in.
+    
+    Returns:
+        int: Number of articles left without a working snapshot.
+    """
+    archived = [result for result in results if result.ok]
+    if not archived or not verifier.enabled:
+        return 0
+    logger.info("Verifying %d snapshots...", len(archived))
+    verified = verifier.run_all(lambda result: verify_archive_result(result, archive_base_url, store), archived)
+    return verified.count(False)
+
+def archive_article_results(articles, output_path="data/archives", reuse_snapshots=True,
+                            max_snapshot_age_days=None, archive_base_url=ARCHIVE_BASE_URL, store=None):
+    """
+    Archive a list of articles and report the outcome for each one.
+    
+    Existing snapshots are looked up first; only articles without a fresh
+    enough snapshot go through the slower capture path. Captures still in
+    progress are polled in the background while the remaining articles are
+    resolved. All snapshots are then verified concurrently, and articles with
+    a broken snapshot are captured again. Duplicate articles are archived once.
+    
+    Args:
+        articles (list): Article URLs or ArticleRecord objects to archive.
+        output_path (str): Path to save all output files.
+        reuse_snapshots (bool): Reuse existing snapshots found via the timemap.
+        max_snapshot_age_days (float, optional): Maximum age of a reused snapshot. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
+        store (ResultsStore, optional): Results store each outcome is recorded in as it is known.
+    
+    Returns:
+        list: One ArchiveResult per unique article, in the order the articles were given.
+    """
+    results = {}
+    for article in articles:
+        record = ArticleRecord.coerce(article)
+        if record.url not in results:
+            results[record.url] = ArchiveResult(record)
+    to_capture = []
+    
+    if reuse_snapshots:
+        for url, result in results.items():
+            try:
+                snapshot_url = _archive_flight.do(
+                    ('timemap', url), find_existing_snapshot, url, max_snapshot_age_days, archive_base_url
+                )
+            except (CircuitOpenError, DeadlineExceeded):
+                snapshot_url = None
+            if snapshot_url:
+                logger.debug("Reusing existing snapshot: %s", snapshot_url)
+                result.archive_url = snapshot_url
+                result.status = ArchiveResult.REUSED
+                if store:
+                    store.add_archive_result(result)
+            else:
+                to_capture.append(url)
+        logger.info("Found existing snapshots for %d of %d articles.", len(results) - len(to_capture), len(results))
+    else:
+        to_capture = list(results)
+    
+    if to_capture:
+        # Generate archive.today links
+        archive_links = get_archive_links(to_capture, output_path, archive_base_url)
+        
+        # Resolve the archive links to the final archive URLs
+        poller = CapturePoller(poll_capture)
+        for url, archive_link in zip(to_capture, archive_links):
+            result = results[url]
+            try:
+                result.archive_url = resolve_archive_link(archive_link)
+            except CapturePending as pending:
+                result.status = ArchiveResult.PENDING
+                poller.add(pending.poll_url, lambda snapshot_url, error, result=result, archive_link=archive_link:
+                           _finish_capture(result, archive_link, snapshot_url, error, store))
+                continue
+            except CircuitOpenError as e:
+                logger.warning("Giving up on %s: %s", url, e)
+                result.status = ArchiveResult.BLOCKED
+                result.error = str(e)
+            except DeadlineExceeded as e:
+                logger.warning("Giving up on %s: %s", url, e)
+                result.status = ArchiveResult.TIMED_OUT
+                result.error = str(e)
+            else:
+                if result.archive_url:
+                    result.status = ArchiveResult.CAPTURED
+                else:
+                    result.error = f"Could not resolve {archive_link}"
+            if store:
+                store.add_archive_result(result, archive_link)
+        with poller:
+            poller.wait()
+    
+    # Only working snapshots are saved
+    invalid = verify_archive_results(results.values(), archive_base_url, store)
+    if invalid:
+        logger.warning("%d articles have no working snapshot.", invalid)
+    
+    # Save the final archive links to a file
+    create_directory(output_path)
+    final_links_path = os.path.join(output_path, "final_archive_links.txt")
+    save_links(dict.fromkeys(result.archive_url for result in results.values() if result.ok), final_links_path)
+    logger.info("Final archive links saved to %s", final_links_path)
+    if store:
+        store.flush()
+    return list(results.values())
+
+def archive_articles(article_urls, output_path="data/archives", reuse_snapshots=True,
+                     max_snapshot_age_days=None, archive_base_url=ARCHIVE_BASE_URL):
     """
     Run the full archiving process for a list of article URLs.
     
     Args:
         article_urls (list): List of article URLs to archive.
         output_path (str): Path to save all output files.
+        reuse_snapshots (bool): Reuse existing snapshots found via the timemap.
+        max_snapshot_age_days (float, optional): Maximum age of a reused snapshot. If None, any age.
+        archive_base_url (str): Base URL of the archive service.
     
     Returns:
         list: List of final archive URLs.
     """
-    # Generate archive.today links
-    archive_links = get_archive_links(article_urls, output_path)
-    
-    # Process the archive links to get the final archive URLs
-    return process_archive_links(archive_links, output_path) 
\ No newline at end of file
+    results = archive_article_results(
+        article_urls, output_path, reuse_snapshots, max_snapshot_age_days, archive_base_url
+    )
+    return list(dict.fromkeys(result.archive_url for result in results if result.ok))
@@ -0,0 +1,233 @@
+"""
+Module for waiting on archive.today captures that are still in progress.
+
+When archive.today has no snapshot of an article yet, it starts a capture
+and serves an in-progress page until the snapshot is ready, which can take
+minutes. Rather than holding a worker while it waits, the article is parked
+with a CapturePoller: one background thread checks every parked capture at
+increasing intervals (first_interval, then multiplied by backoff up to
+max_interval), while the workers go on with other articles. As soon as a
+snapshot appears, the article's callback runs on a separate small pool, e.g.
+to submit it to Readwise. Captures still in progress after max_wait seconds
+are given up on.
+"""
+import time
+import heapq
+import itertools
+import logging
+import threading
+import requests
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from news_archiver import deadline
+from news_archiver.deadline import DeadlineExceeded
+from news_archiver.circuit import CircuitOpenError, ChallengeError
+
+logger = logging.getLogger(__name__)
+
+# Polling schedule of captures in progress, in seconds
+_settings = {'first_interval': 5, 'backoff': 2.0, 'max_interval': 60, 'max_wait': 600}
+
+def configure_capture(first_interval=5, backoff=2.0, max_interval=60, max_wait=600):
+    """
+    Set the polling schedule of captures in progress.
+
+    Args:
+        first_interval (float): Seconds before the first check.
+        backoff (float): Factor the interval grows by after each check.
+        max_interval (float): Longest interval between checks.
+        max_wait (float): Seconds after which a capture still in progress is given up on.
+    """
+    _settings.update(first_interval=first_interval, backoff=backoff, max_interval=max_interval, max_wait=max_wait)
+
+def is_capture_in_progress(url):
+    """Return True if a URL is archive.today's page for a capture in progress."""
+    return urlsplit(url).path.startswith('/wip/')
+
+def _next_interval(interval):
+    """Return the interval following one check."""
+    return min(interval * _settings['backoff'], _settings['max_interval'])
+
+def wait_for_capture(check, poll_url):
+    """
+    Wait in the calling thread for a capture in progress to finish.
+
+    Args:
+        check (callable): Function taking poll_url and returning the snapshot URL, or None while in progress.
+        poll_url (str): URL of the capture's in-progress page.
+
+    Returns:
+        str: The snapshot URL, or None if the capture did not finish within max_wait.
+
+    Raises:
+        CircuitOpenError: If the host kept blocking requests for longer than the park timeout.
+        DeadlineExceeded: If the time budget or run deadline ran out.
+    """
+    started = time.monotonic()
+    interval = _settings['first_interval']
+    while True:
+        left = _settings['max_wait'] - (time.monotonic() - started)
+        if left <= 0:
+            return None
+        deadline.sleep(min(interval, left))
+        try:
+            snapshot_url = check(poll_url)
+        except (CircuitOpenError, DeadlineExceeded):
+            raise
+        except (ChallengeError, requests.exceptions.RequestException) as e:
+            logger.debug("Error checking capture %s: %s", poll_url, e)
+            snapshot_url = None
+        if snapshot_url:
+            return snapshot_url
+        interval = _next_interval(interval)
+
+class _PendingCapture:
+    """A parked capture and its polling state."""
+
+    __slots__ = ('poll_url', 'callback', 'started', 'interval')
+
+    def __init__(self, poll_url, callback):
+        self.poll_url = poll_url
+        self.callback = callback
+        self.started = time.monotonic()
+        self.interval = _settings['first_interval']
+
+class CapturePoller:
+    """Polls parked captures in the background and reports each one once it finishes."""
+
+    def __init__(self, check, max_workers=2):
+        """
+        Initialize the poller.
+
+        Args:
+            check (callable): Function taking a poll URL and returning the snapshot URL, or None while in progress.
+            max_workers (int): Number of callbacks run at once.
+        """
+        self.check = check
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        # Captures added and not yet reported (including those whose callback is running)
+        self._active = 0
+        self._closed = False
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self):
+        """Number of captures not yet reported."""
+        with self._cond:
+            return self._active
+
+    def add(self, poll_url, callback):
+        """
+        Park a capture in progress.
+
+        Args:
+            poll_url (str): URL of the capture's in-progress page.
+            callback (callable): Called as callback(snapshot_url, error) once the capture is done:
+                                 with the snapshot URL, with (None, exception) if polling had to
+                                 stop, or with (None, None) if it was still in progress after max_wait.
+        """
+        item = _PendingCapture(poll_url, callback)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Capture poller is closed")
+            self._active += 1
+            heapq.heappush(self._heap, (item.started + item.interval, next(self._seq), item))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='capture-poller', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        logger.debug("Waiting for the capture at %s", poll_url)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    # Once the run deadline has passed, every check fails at once
+                    if self._heap and (self._heap[0][0] <= now or deadline.run_expired()):
+                        break
+                    timeout = None
+                    if self._heap:
+                        # Wake when the next check is due or the run deadline passes,
+                        # whichever comes first; with nothing parked, wait for a submit
+                        timeout = self._heap[0][0] - now
+                        left = deadline.remaining()
+                        if left is not None:
+                            timeout = min(timeout, left)
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+                _, _, item = heapq.heappop(self._heap)
+            self._poll(item)
+
+    def _poll(self, item):
+        """Check one capture and either report it or schedule its next check."""
+        try:
+            snapshot_url = self.check(item.poll_url)
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            self._report(item, None, e)
+            return
+        except (ChallengeError, requests.exceptions.RequestException) as e:
+            logger.debug("Error checking capture %s: %s", item.poll_url, e)
+            snapshot_url = None
+        except Exception as e:
+            logger.exception("Unexpected error checking capture %s: %s", item.poll_url, e)
+            self._report(item, None, e)
+            return
+
+        if snapshot_url:
+            self._report(item, snapshot_url, None)
+            return
+        now = time.monotonic()
+        if now - item.started >= _settings['max_wait']:
+            self._report(item, None, None)
+            return
+        item.interval = _next_interval(item.interval)
+        due = min(now + item.interval, item.started + _settings['max_wait'])
+        with self._cond:
+            heapq.heappush(self._heap, (due, next(self._seq), item))
+
+    def _report(self, item, snapshot_url, error):
+        """Run a finished capture's callback on the callback pool."""
+        self._executor.submit(self._complete, item, snapshot_url, error)
+
+    def _complete(self, item, snapshot_url, error):
+        try:
+            item.callback(snapshot_url, error)
+        except Exception as e:
+            logger.exception("Error handling the capture at %s: %s", item.poll_url, e)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """
+        Wait until every parked capture has been reported.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. If None, wait until done.
+
+        Returns:
+            bool: True if all captures were reported, False if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._active == 0, timeout)
+
+    def close(self):
+        """Stop polling (captures still parked are not reported) and wait for running callbacks."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,243 @@
+"""
+Module for recording and replaying HTTP interactions.
+
+In record mode every HTTP exchange made through requests (issue pages,
+archive.today lookups and redirects, Readwise calls) is captured, together
+with how long it took, and written to a cassette file when recording stops.
+In replay mode the cassette answers those requests instead of the network,
+optionally taking as long as the recorded exchanges did, so two versions of
+the pipeline can be timed against exactly the same responses, offline.
+
+Exchanges are captured at the transport adapter, below redirect handling, so
+a replayed redirect chain goes through the same requests code as a live one.
+Request headers (including the Readwise token) are never written to the
+cassette.
+"""
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Cassette modes
+RECORD = 'record'
+REPLAY = 'replay'
+
+# The active cassette, or None while HTTP traffic goes to the network
+_cassette = None
+
+# HTTPAdapter.send as it was before a cassette was installed
+_original_send = None
+
+# Response headers that describe the wire encoding rather than the stored body
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that the cassette has no recording of."""
+
+def _request_key(method, url, body):
+    """
+    Build the key a request is matched on.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Full request URL.
+        body (bytes or str, optional): Request body.
+
+    Returns:
+        str: The key.
+    """
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += " " + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+def _encode_body(content):
+    """Return a JSON-safe form of a response body and the encoding used for it."""
+    try:
+        return content.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode('ascii'), 'base64'
+
+def _decode_body(body, encoding):
+    """Return the bytes of a body stored by _encode_body."""
+    if encoding == 'base64':
+        return base64.b64decode(body)
+    return body.encode('utf-8')
+
+class Cassette:
+    """A file of recorded HTTP exchanges, used either to record or to replay."""
+
+    def __init__(self, path, mode, latency=None):
+        """
+        Initialize the cassette.
+
+        Args:
+            path (str): Path of the cassette file (read in replay mode, written in record mode).
+            mode (str): RECORD or REPLAY.
+            latency (float, optional): In replay mode, multiplier applied to the recorded
+                                       duration of each exchange before answering (None answers at once).
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions = []
+        self._replay = {}
+        self.hits = 0
+        self.misses = 0
+
+        if mode == REPLAY:
+            with open(path, 'r') as infile:
+                data = json.load(infile)
+            for interaction in data.get('interactions', []):
+                self._replay.setdefault(interaction['key'], []).append(interaction)
+            logger.info("Loaded %d recorded HTTP exchanges from %s", len(data.get('interactions', [])), path)
+
+    def record(self, request, response, elapsed):
+        """
+        Add a live exchange to the cassette.
+
+        Args:
+            request (requests.PreparedRequest): The request sent.
+            response (requests.Response): The response received (its body is read).
+            elapsed (float): Seconds the exchange took.
+        """
+        body, encoding = _encode_body(response.content)
+        interaction = {
+            'key': _request_key(request.method, request.url, request.body),
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: value for name, value in response.headers.items()
+                        if name.lower() not in _DROPPED_HEADERS},
+            'body': body,
+            'body_encoding': encoding,
+            'elapsed': round(elapsed, 6),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def replay(self, adapter, request):
+        """
+        Answer a request from the cassette.
+
+        Repeated requests for the same URL get the recorded responses in
+        order; once those run out, the last one is repeated.
+
+        Args:
+            adapter (HTTPAdapter): The adapter the request was sent through.
+            request (requests.PreparedRequest): The request.
+
+        Returns:
+            requests.Response: The recorded response.
+
+        Raises:
+            CassetteMissError: If the request was never recorded.
+        """
+        key = _request_key(request.method, request.url, request.body)
+        with self._lock:
+            recorded = self._replay.get(key)
+            if not recorded:
+                self.misses += 1
+                raise CassetteMissError(f"No recorded response for {request.method} {request.url}", request=request)
+            interaction = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+            self.hits += 1
+
+        if self.latency:
+            time.sleep(interaction['elapsed'] * self.latency)
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = _decode_body(interaction['body'], interaction['body_encoding'])
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
+
+    def save(self):
+        """
+        Write the recorded exchanges to the cassette file.
+
+        Returns:
+            int: Number of exchanges written.
+        """
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._lock:
+            interactions = list(self._interactions)
+        with open(self.path, 'w') as outfile:
+            json.dump({'version': 1, 'interactions': interactions}, outfile, indent=1)
+        logger.info("Recorded %d HTTP exchanges to %s", len(interactions), self.path)
+        return len(interactions)
+
+def _cassette_send(adapter, request, **kwargs):
+    """HTTPAdapter.send replacement that records to or replays from the active cassette."""
+    cassette = _cassette
+    if cassette is None:
+        return _original_send(adapter, request, **kwargs)
+    if cassette.mode == REPLAY:
+        return cassette.replay(adapter, request)
+
+    start = time.perf_counter()
+    response = _original_send(adapter, request, **kwargs)
+    cassette.record(request, response, time.perf_counter() - start)
+    return response
+
+def enable_cassette(path, mode, latency=None):
+    """
+    Start recording HTTP traffic to, or replaying it from, a cassette file.
+
+    Args:
+        path (str): Path of the cassette file.
+        mode (str): RECORD or REPLAY.
+        latency (float, optional): In replay mode, multiplier for the recorded
+                                   durations (e.g. 1.0 for the recorded timing).
+
+    Returns:
+        Cassette: The active cassette.
+    """
+    global _cassette, _original_send
+    cassette = Cassette(path, mode, latency)
+    if _original_send is None:
+        _original_send = HTTPAdapter.send
+        HTTPAdapter.send = _cassette_send
+    _cassette = cassette
+    return cassette
+
+def disable_cassette():
+    """
+    Stop recording or replaying, saving the cassette if it was recording.
+
+    Returns:
+        Cassette: The cassette that was active, or None.
+    """
+    global _cassette, _original_send
+    cassette, _cassette = _cassette, None
+    if _original_send is not None:
+        HTTPAdapter.send = _original_send
+        _original_send = None
+    if cassette is not None:
+        if cassette.mode == RECORD:
+            cassette.save()
+        elif cassette.misses:
+            logger.warning("%d request(s) had no recorded response in %s", cassette.misses, cassette.path)
+    return cassette
@@ -0,0 +1,342 @@
+"""
+Module for per-host circuit breakers.
+
+When a host starts refusing work (CAPTCHA challenge pages, sustained 429s or
+server errors), retrying every pending request only makes the block worse.
+A breaker counts those failures per host and, past a threshold, opens: no
+requests are sent to the host and callers are parked until the reset timeout
+has passed. One probe request is then let through (half-open); if it
+succeeds the breaker closes and all parked callers resume, otherwise it opens
+again with a longer timeout.
+"""
+import re
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+from news_archiver.throttle import limited_request
+from news_archiver.deadline import DeadlineExceeded, remaining, check_deadline
+
+logger = logging.getLogger(__name__)
+
+# Breaker states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Response classes
+RESPONSE_OK = 'ok'
+RESPONSE_CHALLENGE = 'challenge'
+RESPONSE_RATE_LIMITED = 'rate_limited'
+RESPONSE_ERROR = 'error'
+
+# The first <title> of a page, i.e. the document's own title
+TITLE_PATTERN = re.compile(r'<title[^>]*>([^<]*)', re.IGNORECASE)
+
+# Titles of CAPTCHA / bot-check interstitials served instead of content
+CHALLENGE_TITLE_PATTERN = re.compile(
+    r'\s*(?:just a moment|attention required!?(?: \| cloudflare)?|one more step|'
+    r'please complete the security check|are you a robot\??)\s*(?:\.\.\.)?\s*$',
+    re.IGNORECASE
+)
+
+# Challenge forms of those interstitials
+CHALLENGE_FORM_PATTERN = re.compile(
+    r'<form[^>]*(?:id=["\']?challenge-form|action=["\'][^"\']*(?:__cf_chl|captcha))',
+    re.IGNORECASE
+)
+
+# CAPTCHA widgets, which archived pages may embed as well
+CHALLENGE_WIDGET_PATTERN = re.compile(r'g-recaptcha|h-captcha|cf-turnstile|cf-chl-', re.IGNORECASE)
+
+class CircuitOpenError(Exception):
+    """Raised when a host's breaker stays open longer than the caller is willing to wait."""
+
+    def __init__(self, host, retry_at=None):
+        self.host = host
+        self.retry_at = retry_at
+        super().__init__(f"Circuit open for {host}; requests are paused")
+
+class ChallengeError(Exception):
+    """Raised when a host answers with a CAPTCHA or bot-check page instead of content."""
+
+    def __init__(self, url):
+        self.url = url
+        super().__init__(f"Challenge page served for {url}")
+
+def is_challenge_page(status_code, text):
+    """
+    Tell whether a response is a CAPTCHA or bot-check interstitial.
+
+    A page counts if its own title is an interstitial's title or it carries a
+    challenge form. Error responses also count if they merely embed a CAPTCHA
+    widget; 200 responses do not, since snapshots of articles often embed one
+    (and listing pages show snapshot titles, so only the page's own title is
+    looked at).
+
+    Args:
+        status_code (int): The HTTP status code.
+        text (str): The response body.
+
+    Returns:
+        bool: True if the page is a challenge.
+    """
+    if not text or status_code not in (200, 403, 429, 503):
+        return False
+    title = TITLE_PATTERN.search(text)
+    if title and CHALLENGE_TITLE_PATTERN.match(title.group(1)):
+        return True
+    if CHALLENGE_FORM_PATTERN.search(text):
+        return True
+    return status_code != 200 and bool(CHALLENGE_WIDGET_PATTERN.search(text))
+
+def classify_response(status_code, text=''):
+    """
+    Classify an HTTP response for circuit breaking.
+
+    Args:
+        status_code (int): The HTTP status code.
+        text (str): The response body.
+
+    Returns:
+        str: RESPONSE_OK, RESPONSE_CHALLENGE, RESPONSE_RATE_LIMITED or RESPONSE_ERROR.
+    """
+    if is_challenge_page(status_code, text):
+        return RESPONSE_CHALLENGE
+    if status_code == 429:
+        return RESPONSE_RATE_LIMITED
+    if status_code >= 500:
+        return RESPONSE_ERROR
+    return RESPONSE_OK
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one host."""
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=60, max_reset_timeout=900):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            host (str): The host the breaker guards.
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a probe is allowed.
+            max_reset_timeout (float): Upper bound of the timeout, which doubles after each failed probe.
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._cond = threading.Condition()
+
+    @property
+    def retry_at(self):
+        """Monotonic time at which the next probe is allowed, or None if the breaker is closed."""
+        if self.opened_at is None:
+            return None
+        return self.opened_at + self.reset_timeout
+
+    def allow(self):
+        """
+        Check whether a request may be sent now, without waiting.
+
+        In the half-open state only one probe request is allowed at a time.
+
+        Returns:
+            bool: True if the request may be sent.
+        """
+        with self._cond:
+            return self._allow()
+
+    def _allow(self):
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() >= self.retry_at:
+            logger.info("Probing %s after %.0f seconds.", self.host, self.reset_timeout)
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def acquire(self, timeout=None):
+        """
+        Wait until a request may be sent (parking the caller while the breaker is open).
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            bool: True if the request may be sent, False if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._allow():
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    return False
+                wait = None
+                if self.state == OPEN:
+                    wait = max(0.0, self.retry_at - now)
+                if deadline is not None:
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self._cond.wait(wait)
+            return True
+
+    def cancel(self):
+        """Give up a request allowed by acquire() without sending it."""
+        with self._cond:
+            self._probing = False
+            self._cond.notify_all()
+
+    def record_success(self):
+        """Record a successful request, closing the breaker."""
+        with self._cond:
+            if self.state != CLOSED:
+                logger.info("%s is responding again; resuming requests.", self.host)
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.reset_timeout = self.base_reset_timeout
+            self._probing = False
+            self._cond.notify_all()
+
+    def record_failure(self, trip=False):
+        """
+        Record a failed request.
+
+        Args:
+            trip (bool): Open the breaker immediately (e.g. for a challenge page).
+        """
+        with self._cond:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and (trip or self.failures >= self.failure_threshold):
+                self._open()
+            self._probing = False
+            self._cond.notify_all()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        logger.warning("Pausing requests to %s for %.0f seconds after %d failures.",
+                       self.host, self.reset_timeout, self.failures)
+
+class BreakerRegistry:
+    """Breakers keyed by host, created on first use with shared settings."""
+
+    def __init__(self, **settings):
+        """
+        Initialize the registry.
+
+        Args:
+            **settings: failure_threshold, reset_timeout and max_reset_timeout for new
+                        breakers, and max_park_seconds, the longest a caller waits for a host.
+        """
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self.max_park_seconds = None
+        self.settings = {}
+        self.configure(**settings)
+
+    def configure(self, failure_threshold=5, reset_timeout=60, max_reset_timeout=900, max_park_seconds=1800):
+        """Change the breaker settings, for existing breakers and those created from now on."""
+        with self._lock:
+            self.settings = {
+                'failure_threshold': failure_threshold,
+                'reset_timeout': reset_timeout,
+                'max_reset_timeout': max_reset_timeout,
+            }
+            self.max_park_seconds = max_park_seconds
+            for breaker in self._breakers.values():
+                breaker.failure_threshold = failure_threshold
+                breaker.base_reset_timeout = reset_timeout
+                breaker.max_reset_timeout = max_reset_timeout
+
+    def get(self, url):
+        """
+        Get the breaker of a URL's host.
+
+        Args:
+            url (str): Any URL on the host.
+
+        Returns:
+            CircuitBreaker: The host's breaker.
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, **self.settings)
+            return breaker
+
+    def reset(self):
+        """Forget all breakers."""
+        with self._lock:
+            self._breakers = {}
+
+# Breakers shared by all blocking requests in the process
+breakers = BreakerRegistry()
+
+def guarded_get(url, **kwargs):
+    """
+    Send a GET request through the breaker and concurrency limiter of the URL's host.
+
+    See guarded_request.
+    """
+    return guarded_request('GET', url, **kwargs)
+
+def guarded_request(method, url, park=True, **kwargs):
+    """
+    Send a request through the breaker and concurrency limiter of the URL's host.
+
+    The caller is parked while the breaker is open. Challenge pages trip the
+    breaker at once; rate limiting and server errors count as failures.
+
+    Args:
+        method (str): HTTP method.
+        url (str): The URL.
+        park (bool): Wait while the breaker is open. If False, raise CircuitOpenError at once.
+        **kwargs: Keyword arguments for requests.request.
+
+    Returns:
+        The response (including 429 and 5xx responses, which callers may retry).
+
+    Raises:
+        CircuitOpenError: If the host stayed blocked for longer than max_park_seconds.
+        ChallengeError: If the host answered with a challenge page.
+        DeadlineExceeded: If the deadline passed while the caller was parked or waiting for a slot.
+    """
+    breaker = breakers.get(url)
+    park_timeout = breakers.max_park_seconds if park else 0
+    left = remaining()
+    if left is not None:
+        park_timeout = left if park_timeout is None else min(park_timeout, left)
+    if not breaker.acquire(park_timeout):
+        check_deadline()
+        raise CircuitOpenError(breaker.host, breaker.retry_at)
+
+    try:
+        response = limited_request(method, url, **kwargs)
+    except DeadlineExceeded:
+        breaker.cancel()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    kind = classify_response(response.status_code, response.text)
+    if kind == RESPONSE_CHALLENGE:
+        breaker.record_failure(trip=True)
+        raise ChallengeError(url)
+    if kind == RESPONSE_OK:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    return response
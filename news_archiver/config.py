@@ -3,49 +3,378 @@ Configuration module for the news_archiver.
 """
 import os
 import json
+import copy
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
 
 # Default configuration values
 DEFAULT_CONFIG = {
     "readwise_token": None,
+    "readwise_targets": [],
     "output_directory": "data",
+    "archive": {
+        "base_url": "http://archive.today",
+        "reuse_snapshots": True,
+        "max_snapshot_age_days": None,
+        "circuit": {
+            "failure_threshold": 5,
+            "reset_timeout": 60,
+            "max_reset_timeout": 900,
+            "max_park_seconds": 1800
+        },
+        "capture": {
+            "first_interval": 5,
+            "backoff": 2.0,
+            "max_interval": 60,
+            "max_wait": 600
+        },
+        "verify": {
+            "enabled": True,
+            "retries": 1,
+            "min_bytes": 512,
+            "max_workers": 8,
+            "timeout": 15
+        }
+    },
+    "scheduler": {
+        "max_workers": 4,
+        "newest_first": True
+    },
+    "timeouts": {
+        "connect": 10,
+        "read": 30,
+        "article_budget": 300,
+        "run_deadline": None
+    },
+    "concurrency": {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 8,
+        "backoff": 0.5,
+        "latency_tolerance": 2.0
+    },
+    "prefetch": {
+        "issues": 3,
+        "warm_up": True
+    },
+    "extraction_cache": {
+        "enabled": True,
+        "path": None,
+        "max_entries": 256
+    },
+    "queue": {
+        "path": None,
+        "visibility_timeout": 600,
+        "max_attempts": 3,
+        "poll_interval": 5
+    },
     "sources": {
         "atlantic": {
             "enabled": True,
             "output_path": "data/atlantic",
-            "tags": ["the atlantic"]
+            "tags": ["the atlantic"],
+            "weight": 1,
+            "concurrency": 1,
+            "priority_sections": []
         }
     }
 }
 
+# Environment variables overriding configuration keys, e.g. NEWS_ARCHIVER_READWISE_TOKEN.
+# Nested keys are separated by a double underscore: NEWS_ARCHIVER_ARCHIVE__BASE_URL.
+ENV_PREFIX = "NEWS_ARCHIVER_"
+
 def create_directory(dir_path):
     """Create directory if it doesn't exist."""
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
+def deep_merge(base, override):
+    """
+    Recursively merge override into a copy of base.
+    
+    Args:
+        base (dict): Lower-priority values.
+        override (dict): Higher-priority values.
+    
+    Returns:
+        dict: The merged configuration.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def parse_override_value(value):
+    """Parse an override value as JSON (numbers, booleans, null, lists), falling back to a plain string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def set_path(config, dotted_key, value):
+    """Set a nested key such as "archive.base_url" in a configuration dict."""
+    keys = dotted_key.split('.')
+    target = config
+    for key in keys[:-1]:
+        if not isinstance(target.get(key), dict):
+            target[key] = {}
+        target = target[key]
+    target[keys[-1]] = value
+
+def env_overrides(environ=None):
+    """
+    Collect configuration overrides from NEWS_ARCHIVER_* environment variables.
+    
+    Args:
+        environ (dict, optional): Environment to read. Defaults to os.environ.
+    
+    Returns:
+        dict: Nested overrides.
+    """
+    environ = os.environ if environ is None else environ
+    overrides = {}
+    for name, value in environ.items():
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX):
+            dotted_key = name[len(ENV_PREFIX):].lower().replace('__', '.')
+            set_path(overrides, dotted_key, parse_override_value(value))
+    return overrides
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive inter-process lock on a lock file.
+    
+    Args:
+        lock_path (str): Path of the lock file (created if needed).
+    """
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write_json(data, path):
+    """
+    Write JSON to a file so readers never see a partially written file.
+    
+    Args:
+        data: JSON-serializable data.
+        path (str): Destination path.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ConfigService:
+    """
+    Layered, cached access to a configuration file.
+    
+    The effective configuration merges, from lowest to highest priority: the
+    defaults, the JSON file, NEWS_ARCHIVER_* environment variables and explicit
+    overrides (e.g. from the command line). The merged result is cached and only
+    rebuilt when the file's modification time or size changes. Writes go to the
+    file layer only, atomically and under an exclusive file lock, so concurrent
+    processes and threads can share one config file safely.
+    """
+    
+    def __init__(self, config_path="config.json", overrides=None, environ=None):
+        """
+        Initialize the service.
+        
+        Args:
+            config_path (str): Path to the configuration file.
+            overrides (dict, optional): Highest-priority overrides.
+            environ (dict, optional): Environment to read overrides from. Defaults to os.environ.
+        """
+        self.config_path = config_path
+        self.lock_path = f"{config_path}.lock"
+        self.overrides = overrides or {}
+        self.environ = environ
+        self._lock = threading.RLock()
+        self._file_config = None
+        self._file_stamp = None
+        self._merged = None
+    
+    def _stamp(self):
+        """Return the (mtime, size) of the config file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_file(self):
+        """Return the file layer, re-reading the file only if it changed."""
+        stamp = self._stamp()
+        if self._file_config is not None and stamp == self._file_stamp:
+            return self._file_config
+        
+        self._merged = None
+        self._file_stamp = stamp
+        if stamp is None:
+            self._file_config = {}
+            return self._file_config
+        
+        try:
+            with open(self.config_path, 'r') as f:
+                self._file_config = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Error parsing config file %s. Using default configuration.", self.config_path)
+            self._file_config = {}
+        except FileNotFoundError:
+            self._file_config = {}
+        return self._file_config
+    
+    def exists(self):
+        """Return True if the config file exists."""
+        return self._stamp() is not None
+    
+    def file_config(self):
+        """
+        Get a copy of the configuration stored in the file, without defaults or overrides.
+        
+        Returns:
+            dict: The file layer.
+        """
+        with self._lock:
+            return copy.deepcopy(self._read_file())
+    
+    def get(self):
+        """
+        Get the effective configuration.
+        
+        Returns:
+            dict: A copy of the merged configuration, safe to modify.
+        """
+        with self._lock:
+            file_config = self._read_file()
+            if self._merged is None:
+                defaults = copy.deepcopy(DEFAULT_CONFIG)
+                # Sources listed in the file replace the default source list
+                if 'sources' in file_config:
+                    defaults['sources'] = {}
+                merged = deep_merge(defaults, file_config)
+                merged = deep_merge(merged, env_overrides(self.environ))
+                self._merged = deep_merge(merged, self.overrides)
+            return copy.deepcopy(self._merged)
+    
+    def set_overrides(self, overrides):
+        """
+        Replace the highest-priority override layer.
+        
+        Args:
+            overrides (dict): Nested overrides.
+        """
+        with self._lock:
+            self.overrides = overrides or {}
+            self._merged = None
+    
+    def save(self, config):
+        """
+        Replace the file layer with the given configuration.
+        
+        Args:
+            config (dict): Configuration to store in the file.
+        """
+        self.update(lambda file_config: config)
+    
+    def update(self, changes):
+        """
+        Apply changes to the file layer under the file lock and write it atomically.
+        
+        Args:
+            changes (dict or callable): Nested values to merge into the file, or a
+                function taking the current file config and returning the new one.
+        
+        Returns:
+            dict: The new file layer.
+        """
+        with self._lock, file_lock(self.lock_path):
+            # Re-read under the lock so concurrent writers don't lose each other's changes
+            self._file_config = None
+            current = copy.deepcopy(self._read_file())
+            if callable(changes):
+                new_config = changes(current)
+                if new_config is None:
+                    new_config = current
+            else:
+                new_config = deep_merge(current, changes)
+            
+            atomic_write_json(new_config, self.config_path)
+            self._file_config = new_config
+            self._file_stamp = self._stamp()
+            self._merged = None
+            return copy.deepcopy(new_config)
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_config_service(config_path="config.json"):
+    """
+    Get the shared configuration service for a config file.
+    
+    Args:
+        config_path (str): Path to the configuration file.
+    
+    Returns:
+        ConfigService: The service, shared by every caller using the same path.
+    """
+    key = os.path.abspath(config_path)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = ConfigService(config_path)
+        return _services[key]
+
 def load_config(config_path="config.json"):
     """
     Load configuration from a JSON file, or create a default one if not exists.
     
+    The result merges defaults, the file and NEWS_ARCHIVER_* environment variables,
+    and is cached until the file changes.
+    
     Args:
         config_path (str): Path to the configuration file.
     
     Returns:
         dict: Configuration settings.
     """
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            # Merge with default config for any missing keys
-            merged_config = DEFAULT_CONFIG.copy()
-            merged_config.update(config)
-            return merged_config
-    except FileNotFoundError:
-        print(f"Config file {config_path} not found. Creating default configuration.")
+    service = get_config_service(config_path)
+    if not service.exists():
+        logger.info("Config file %s not found. Creating default configuration.", config_path)
         save_config(DEFAULT_CONFIG, config_path)
-        return DEFAULT_CONFIG
-    except json.JSONDecodeError:
-        print(f"Error parsing config file {config_path}. Using default configuration.")
-        return DEFAULT_CONFIG
+    return service.get()
 
 def save_config(config, config_path="config.json"):
     """
@@ -56,11 +385,10 @@ def save_config(config, config_path="config.json"):
         config_path (str): Path to save the configuration file.
     """
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
-        print(f"Configuration saved to {config_path}")
+        get_config_service(config_path).save(config)
+        logger.info("Configuration saved to %s", config_path)
     except Exception as e:
-        print(f"Error saving configuration: {e}")
+        logger.error("Error saving configuration: %s", e)
 
 def set_readwise_token(token, config_path="config.json"):
     """
@@ -70,9 +398,11 @@ def set_readwise_token(token, config_path="config.json"):
         token (str): The Readwise API token.
         config_path (str): Path to the configuration file.
     """
-    config = load_config(config_path)
-    config['readwise_token'] = token
-    save_config(config, config_path)
+    service = get_config_service(config_path)
+    if not service.exists():
+        service.save(DEFAULT_CONFIG)
+    service.update({'readwise_token': token})
+    logger.info("Configuration saved to %s", config_path)
 
 def add_news_source(source_name, enabled=True, output_path=None, tags=None, config_path="config.json"):
     """
@@ -85,21 +415,23 @@ def add_news_source(source_name, enabled=True, output_path=None, tags=None, conf
         tags (list, optional): Tags for articles from this source.
         config_path (str): Path to the configuration file.
     """
-    config = load_config(config_path)
-    
-    if 'sources' not in config:
-        config['sources'] = {}
+    service = get_config_service(config_path)
+    if not service.exists():
+        service.save(DEFAULT_CONFIG)
     
     if not output_path:
-        output_path = os.path.join(config.get('output_directory', 'data'), source_name)
+        output_path = os.path.join(service.get().get('output_directory', 'data'), source_name)
     
     if not tags:
         tags = [source_name]
     
-    config['sources'][source_name] = {
-        'enabled': enabled,
-        'output_path': output_path,
-        'tags': tags
-    }
+    def add_source(config):
+        config.setdefault('sources', {})[source_name] = {
+            'enabled': enabled,
+            'output_path': output_path,
+            'tags': tags
+        }
+        return config
     
-    save_config(config, config_path) 
\ No newline at end of file
+    service.update(add_source)
+    logger.info("Configuration saved to %s", config_path)
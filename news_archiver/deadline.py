@@ -0,0 +1,152 @@
+"""
+Module for request timeouts and deadlines.
+
+Every HTTP request gets a connect and a read timeout, so a stuck connection
+fails instead of hanging the run. On top of that, work can be bounded by
+deadlines: a global run deadline, and budgets for smaller units of work
+(e.g. one article including all its retries) that apply to the thread
+running them. Requests, retry sleeps and waits for a free slot never extend
+past the nearest deadline; once it has passed they raise DeadlineExceeded.
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Seconds allowed to establish a connection and between bytes received
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30
+
+_settings = {'connect': DEFAULT_CONNECT_TIMEOUT, 'read': DEFAULT_READ_TIMEOUT}
+
+# Monotonic time by which the whole run must finish, or None
+_run_deadline = None
+
+# Per-thread stack of budget deadlines
+_local = threading.local()
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when work is attempted after its deadline has passed."""
+
+def configure_timeouts(connect=DEFAULT_CONNECT_TIMEOUT, read=DEFAULT_READ_TIMEOUT):
+    """
+    Set the timeouts used for every request.
+
+    Args:
+        connect (float): Seconds allowed to establish a connection.
+        read (float): Seconds allowed between bytes received.
+    """
+    _settings['connect'] = connect
+    _settings['read'] = read
+
+def set_run_deadline(seconds):
+    """
+    Set the global run deadline.
+
+    Args:
+        seconds (float, optional): Seconds from now by which all work must finish. If None, no deadline.
+    """
+    global _run_deadline
+    _run_deadline = None if seconds is None else time.monotonic() + seconds
+    if seconds is not None:
+        logger.debug("Run deadline set to %.0f seconds from now", seconds)
+
+def _current_deadline():
+    """Return the nearest deadline for the current thread, or None."""
+    deadlines = getattr(_local, 'deadlines', None)
+    nearest = deadlines[-1] if deadlines else None
+    if _run_deadline is not None and (nearest is None or _run_deadline < nearest):
+        return _run_deadline
+    return nearest
+
+def remaining():
+    """
+    Return the seconds left until the nearest deadline.
+
+    Returns:
+        float: Seconds left (0 once it has passed), or None if there is no deadline.
+    """
+    deadline = _current_deadline()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def run_expired():
+    """Return True once the global run deadline has passed."""
+    return _run_deadline is not None and time.monotonic() >= _run_deadline
+
+def check_deadline():
+    """
+    Raise if the nearest deadline has passed.
+
+    Raises:
+        DeadlineExceeded: If it has.
+    """
+    if remaining() == 0:
+        raise _exceeded()
+
+def _exceeded():
+    """Build the exception for the deadline that has passed."""
+    return DeadlineExceeded("Run deadline exceeded" if run_expired() else "Time budget exceeded")
+
+@contextmanager
+def budget(seconds):
+    """
+    Limit the work done in this thread inside the block to a time budget.
+
+    Budgets nest; the nearest deadline (including the run deadline) applies.
+
+    Args:
+        seconds (float, optional): The budget. If None, the block gets no budget of its own.
+    """
+    if seconds is None:
+        yield
+        return
+    deadlines = getattr(_local, 'deadlines', None)
+    if deadlines is None:
+        deadlines = _local.deadlines = []
+    deadline = time.monotonic() + seconds
+    deadlines.append(min(deadline, deadlines[-1]) if deadlines else deadline)
+    try:
+        yield
+    finally:
+        deadlines.pop()
+
+def request_timeout():
+    """
+    Return the timeout for a request starting now.
+
+    The read timeout is shortened so the request cannot outlive the nearest deadline.
+
+    Returns:
+        tuple: (connect timeout, read timeout) for requests.
+
+    Raises:
+        DeadlineExceeded: If the nearest deadline has already passed.
+    """
+    check_deadline()
+    left = remaining()
+    connect, read = _settings['connect'], _settings['read']
+    if left is not None:
+        connect = min(connect, left)
+        read = min(read, left)
+    return (connect, read)
+
+def sleep(seconds):
+    """
+    Sleep, but not past the nearest deadline.
+
+    Args:
+        seconds (float): Seconds to sleep.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the sleep would end.
+    """
+    left = remaining()
+    if left is not None and left < seconds:
+        time.sleep(left)
+        raise _exceeded()
+    time.sleep(seconds)
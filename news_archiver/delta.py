@@ -0,0 +1,225 @@
+"""
+Module for detecting which articles of an issue changed since the last run.
+
+Issue pages are not frozen: an Economist weekly edition gains and swaps
+articles during the week. The articles processed for each issue are kept
+per source and issue, and each run compares the fresh article set against
+them, so only added articles are processed and removed ones are reported. An article
+only enters the recorded set once it has been processed successfully, so
+articles that failed are offered again by the next run. Together with the
+extraction cache, re-polling an unchanged issue costs one page fetch.
+"""
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from news_archiver.config import file_lock
+
+logger = logging.getLogger(__name__)
+
+# File name of the issue history inside the output directory
+ISSUE_HISTORY_FILE = "issue_history.json"
+
+class IssueDelta:
+    """How an issue's article set changed since it was last processed."""
+
+    __slots__ = ('source', 'issue', 'added', 'removed', 'unchanged', 'first_run')
+
+    def __init__(self, source, issue, added, removed, unchanged, first_run=False):
+        """
+        Args:
+            source (str): Source name.
+            issue (str): Issue name.
+            added (list): Article URLs new to the issue, in page order.
+            removed (list): Article URLs no longer in the issue, in their earlier order.
+            unchanged (list): Article URLs in both, in page order.
+            first_run (bool): Whether the issue had not been processed before.
+        """
+        self.source = source
+        self.issue = issue
+        self.added = added
+        self.removed = removed
+        self.unchanged = unchanged
+        self.first_run = first_run
+
+    @property
+    def changed(self):
+        """True if articles were added or removed."""
+        return bool(self.added or self.removed)
+
+    def __repr__(self):
+        return (f"IssueDelta({self.source!r}, {self.issue!r}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, unchanged={len(self.unchanged)})")
+
+class IssueHistory:
+    """
+    Persistent record of the articles processed for each issue.
+
+    The history is a JSON file with two maps keyed by "source/issue": the
+    articles processed for each issue, and the article set its page listed
+    when it was last diffed. Diffing an issue only updates its listing.
+    Finished articles are buffered with add and written by flush, which
+    also drops articles the latest listing no longer has. Every write
+    re-reads the file under an inter-process lock, so scrapers and queue
+    workers in several processes may share it.
+    """
+
+    def __init__(self, history_path, ignore_existing=False):
+        """
+        Initialize the history, loading the article sets recorded by earlier runs.
+
+        Args:
+            history_path (str): Path of the history file.
+            ignore_existing (bool): Treat every issue as not processed before for this
+                                    run (finished articles are still recorded).
+        """
+        self.history_path = history_path
+        self.lock_path = f"{history_path}.lock"
+        self.ignore_existing = ignore_existing
+        self._lock = threading.Lock()
+        self._processed, self._listed = self._load()
+        # Finished articles not yet written, keyed like _processed
+        self._pending = {}
+
+    def _load(self):
+        """Read the history file, returning its processed and listed maps (empty if there is none)."""
+        if not os.path.exists(self.history_path):
+            return {}, {}
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read issue history %s: %s", self.history_path, e)
+            return {}, {}
+        if isinstance(data.get('processed'), dict):
+            return data['processed'], data.get('listed') or {}
+        # Files written before listings were kept map each issue straight to its articles
+        return data, {}
+
+    @contextmanager
+    def _locked(self):
+        """Hold the history's thread and file locks and refresh it from disk."""
+        directory = os.path.dirname(self.history_path) or '.'
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._lock, file_lock(self.lock_path):
+            self._processed, self._listed = self._load()
+            yield
+
+    @staticmethod
+    def _key(source, issue):
+        return f"{source}/{issue}"
+
+    def articles(self, source, issue):
+        """
+        Return the article URLs recorded as processed for an issue.
+
+        Args:
+            source (str): Source name.
+            issue (str): Issue name.
+
+        Returns:
+            list: The article URLs, or None if the issue has not been recorded.
+        """
+        with self._lock:
+            links = self._processed.get(self._key(source, issue))
+            return list(links) if links is not None else None
+
+    def diff(self, source, issue, links):
+        """
+        Compare an issue's fresh article set with the articles recorded for it.
+
+        The fresh set is kept as the issue's listing; the processed articles
+        are not changed until finished ones are added and flushed.
+
+        Args:
+            source (str): Source name.
+            issue (str): Issue name.
+            links (list): The article URLs now in the issue, in page order.
+
+        Returns:
+            IssueDelta: The articles added, removed and unchanged since the last run.
+        """
+        links = list(dict.fromkeys(link for link in links if link))
+        key = self._key(source, issue)
+        with self._locked():
+            previous = None if self.ignore_existing else self._processed.get(key)
+            self._listed[key] = links
+            self._save()
+
+        if previous is None:
+            return IssueDelta(source, issue, links, [], [], first_run=True)
+        current = set(links)
+        earlier = set(previous)
+        return IssueDelta(
+            source,
+            issue,
+            [link for link in links if link not in earlier],
+            [link for link in previous if link not in current],
+            [link for link in links if link in earlier]
+        )
+
+    def add(self, source, issue, links):
+        """
+        Buffer finished articles of an issue until the next flush.
+
+        Args:
+            source (str): Source name.
+            issue (str): Issue name.
+            links (list): Article URLs that were processed successfully.
+        """
+        with self._lock:
+            pending = self._pending.setdefault(self._key(source, issue), [])
+            pending.extend(link for link in links if link)
+
+    def record(self, source, issue, links):
+        """
+        Add finished articles of an issue and write the history at once.
+
+        Args:
+            source (str): Source name.
+            issue (str): Issue name.
+            links (list): Article URLs that were processed successfully (may be empty
+                          to only drop articles the issue no longer lists).
+        """
+        self.add(source, issue, links)
+        self.flush()
+
+    def flush(self):
+        """
+        Write the buffered finished articles in one locked read-modify-write.
+
+        Articles that an issue's latest listing no longer has are dropped, so
+        their removal is only reported once.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+        with self._locked():
+            for key, links in pending.items():
+                recorded = list(self._processed.get(key) or [])
+                recorded.extend(link for link in dict.fromkeys(links) if link not in recorded)
+                listing = self._listed.get(key)
+                if listing is not None:
+                    finished = set(recorded)
+                    recorded = [link for link in listing if link in finished]
+                self._processed[key] = recorded
+            self._save()
+
+    def _save(self):
+        """Write the history atomically."""
+        directory = os.path.dirname(self.history_path) or '.'
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.issue_history', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'processed': self._processed, 'listed': self._listed}, f, indent=1)
+            os.replace(temp_path, self.history_path)
+        except OSError as e:
+            logger.warning("Could not write issue history %s: %s", self.history_path, e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -0,0 +1,257 @@
+"""
+Module for the durable job queue shared by worker processes.
+
+A coordinator enqueues scraped articles; any number of worker processes, on
+one host or on several hosts sharing a filesystem, lease jobs from the queue,
+archive them and add them to Readwise. A lease expires after the visibility
+timeout, so jobs held by a crashed worker become available again. Workers
+extend their leases while a job is still running.
+
+The queue is a SQLite database using the rollback journal rather than WAL,
+because WAL requires shared memory and does not work on network filesystems.
+"""
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# File name of the queue database inside the output directory
+QUEUE_DB_FILE = "queue.db"
+
+# Job states
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    lane INTEGER NOT NULL DEFAULT 1,
+    article TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, lane, available_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs (source, status);
+"""
+
+# Adds a job, or queues a failed job for the same article again
+ENQUEUE_JOB = """
+INSERT INTO jobs (url, source, lane, article, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    source = excluded.source, lane = excluded.lane, article = excluded.article, status = 'queued',
+    attempts = 0, available_at = 0, lease_owner = NULL, lease_expires = NULL, result = NULL, error = NULL,
+    updated_at = excluded.updated_at
+WHERE jobs.status = 'failed'
+"""
+
+def default_worker_id():
+    """Return an identifier for this process that is unique across hosts."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class Job:
+    """A leased job."""
+
+    __slots__ = ('id', 'source', 'article', 'attempts')
+
+    def __init__(self, id, source, article, attempts):
+        self.id = id
+        self.source = source
+        self.article = article
+        self.attempts = attempts
+
+class JobQueue:
+    """SQLite-backed queue of article jobs with leases and visibility timeouts."""
+
+    def __init__(self, db_path, visibility_timeout=600, max_attempts=3):
+        """
+        Open (and if needed create) the queue.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+            visibility_timeout (float): Seconds a lease lasts unless it is extended.
+            max_attempts (int): Attempts after which a failing job is marked failed.
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit mode, so BEGIN IMMEDIATE below controls the transactions
+        self._conn = sqlite3.connect(db_path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA busy_timeout = 60000")
+        with self._transaction() as conn:
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction that locks out writers in other processes."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, source, articles, lane=None):
+        """
+        Add article jobs, skipping articles that are already queued, leased or done.
+
+        Articles whose job failed for good are queued again with fresh attempts.
+
+        Args:
+            source (str): Source name.
+            articles (list): ArticleRecord objects.
+            lane (callable, optional): Function returning a record's priority lane (lower runs first).
+
+        Returns:
+            int: Number of jobs added or queued again.
+        """
+        now = time.time()
+        rows = [
+            (record.url, source, lane(record) if lane else 1, json.dumps(record.to_dict()), now)
+            for record in articles
+        ]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(ENQUEUE_JOB, rows)
+            return conn.total_changes - before
+
+    def lease(self, worker_id, limit=1):
+        """
+        Lease ready jobs: queued jobs and jobs whose lease has expired.
+
+        Args:
+            worker_id (str): Identifier of the leasing worker.
+            limit (int): Maximum number of jobs.
+
+        Returns:
+            list: Leased Job objects, highest priority first.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs whose workers keep dying with them are given up on
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Lease expired after the last attempt', lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT id, source, article, attempts FROM jobs "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?) "
+                "ORDER BY lane, id LIMIT ?",
+                (QUEUED, now, LEASED, now, limit)
+            ).fetchall()
+            for job_id, _, _, _ in rows:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (LEASED, worker_id, now + self.visibility_timeout, now, job_id)
+                )
+        return [Job(job_id, source, json.loads(article), attempts + 1) for job_id, source, article, attempts in rows]
+
+    def extend(self, job, worker_id):
+        """
+        Extend the lease of a job that is still being worked on.
+
+        Returns:
+            bool: False if the lease was lost (it expired and another worker took the job).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + self.visibility_timeout, now, job.id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job, worker_id, result=None):
+        """
+        Mark a leased job as done.
+
+        Args:
+            job (Job): The job.
+            worker_id (str): Identifier of the worker holding the lease.
+            result (dict, optional): JSON-serializable outcome.
+
+        Returns:
+            bool: False if the worker no longer held the lease.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (DONE, json.dumps(result), time.time(), job.id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job, worker_id, error, retry_delay=0):
+        """
+        Release a leased job after a failed attempt.
+
+        The job is queued again after retry_delay seconds, or marked failed once
+        it has used max_attempts attempts.
+
+        Args:
+            job (Job): The job.
+            worker_id (str): Identifier of the worker holding the lease.
+            error (str): Why the attempt failed.
+            retry_delay (float): Seconds before the job may be leased again.
+
+        Returns:
+            bool: False if the worker no longer held the lease.
+        """
+        now = time.time()
+        status = FAILED if job.attempts >= self.max_attempts else QUEUED
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (status, error, now + retry_delay, now, job.id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def counts(self):
+        """
+        Count jobs by state.
+
+        Returns:
+            dict: Mapping of state to number of jobs.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys((QUEUED, LEASED, DONE, FAILED), 0)
+        counts.update(rows)
+        return counts
+
+    def pending(self):
+        """Return the number of jobs that are queued or leased."""
+        counts = self.counts()
+        return counts[QUEUED] + counts[LEASED]
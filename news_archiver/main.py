@@ -2,11 +2,54 @@
 Main module for the news_archiver package.
 """
 import os
+import time
+import logging
 import argparse
-from news_archiver.config import load_config, set_readwise_token, create_directory
+import threading
+from news_archiver.config import load_config, set_readwise_token, create_directory, get_config_service, parse_override_value, set_path
 from news_archiver.scrapers import SCRAPERS
-from news_archiver.archiver import archive_articles
-from news_archiver.readwise_integration import add_articles_to_readwise
+from news_archiver.archiver import archive_article_result, verify_archive_result, archive_link_for, save_links, poll_capture, ARCHIVE_BASE_URL
+from news_archiver.capture import CapturePoller, configure_capture
+from news_archiver.verify import verifier
+# readwise_date is re-exported for backward compatibility
+from news_archiver.readwise_integration import submit_to_targets, readwise_targets, readwise_date, READWISE_SAVE_URL
+from news_archiver.urls import SeenUrlIndex
+from news_archiver.delta import IssueHistory, ISSUE_HISTORY_FILE
+from news_archiver.metadata import ArticleMetadataIndex, METADATA_FILE
+from news_archiver.records import ArticleRecord, ArchiveResult, ReadwiseResult
+from news_archiver.store import ResultsStore, RESULTS_DB_FILE
+from news_archiver.scheduler import FairScheduler, LANE_PRIORITY, LANE_NORMAL
+from news_archiver.circuit import breakers
+from news_archiver.throttle import limiters
+from news_archiver import deadline
+from news_archiver.jobqueue import JobQueue, QUEUE_DB_FILE, default_worker_id
+from news_archiver.profiling import profiled, enable_profiling, disable_profiling
+from news_archiver.memo import extraction_cache, EXTRACTION_CACHE_DIR
+from news_archiver.prefetch import prefetcher
+from news_archiver.cassette import enable_cassette, disable_cassette, RECORD, REPLAY
+
+logger = logging.getLogger(__name__)
+
+# File (under the output directory) recording every article URL already processed
+SEEN_URLS_FILE = 'seen_urls.txt'
+
+def configure_logging(quiet=False, verbose=False):
+    """
+    Configure console logging for the command line interface.
+    
+    Args:
+        quiet (bool): Only show warnings and errors.
+        verbose (bool): Also show per-article progress messages.
+    """
+    if quiet:
+        level = logging.WARNING
+    elif verbose:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+    logging.basicConfig(format='%(message)s')
+    # Only the package's own loggers follow the chosen level; libraries stay at warnings
+    logging.getLogger('news_archiver').setLevel(level)
 
 def setup_directories(config):
     """
@@ -25,50 +68,185 @@ def setup_directories(config):
         if source_config.get('enabled', False):
             create_directory(source_config.get('output_path'))
 
-def scrape_articles(config, source=None, selected_issue=None):
+def configure_extraction_cache(config):
+    """
+    Configure the cache of extracted issue pages from the extraction_cache section.
+    
+    Args:
+        config (dict): The configuration dictionary.
+    """
+    cache_config = config.get('extraction_cache', {})
+    if not cache_config.get('enabled', True):
+        extraction_cache.configure(None)
+        return
+    path = cache_config.get('path') or os.path.join(config.get('output_directory', 'data'), EXTRACTION_CACHE_DIR)
+    extraction_cache.configure(path, cache_config.get('max_entries', 256))
+
+def configure_prefetch(config):
+    """
+    Set up prefetching during interactive issue selection from the prefetch section.
+    
+    Args:
+        config (dict): The configuration dictionary.
+    """
+    prefetch_config = config.get('prefetch', {})
+    warm_up_urls = []
+    if prefetch_config.get('warm_up', True):
+        warm_up_urls.append(config.get('archive', {}).get('base_url', ARCHIVE_BASE_URL))
+        if config.get('readwise_targets') or config.get('readwise_token'):
+            warm_up_urls.append(READWISE_SAVE_URL)
+    prefetcher.configure(prefetch_config.get('issues', 3), warm_up_urls)
+
+def scrape_articles(config, source=None, selected_issue=None, include_seen=False, store=None):
     """
     Scrape articles from all enabled sources or a specific source.
     
+    Article URLs are canonicalized and checked against a persistent index, so
+    articles already processed by an earlier run (or scheduled by this one) are
+    not archived again.
+    Each issue's article set is also compared with the articles processed for
+    it before: only added articles are returned, and removed ones are reported.
+    
     Args:
         config (dict): The configuration dictionary.
         source (str, optional): Specific source to scrape (if None, scrape all enabled sources).
         selected_issue (str, optional): Specific issue to scrape.
+        include_seen (bool): Also return articles that earlier runs already processed.
+        store (ResultsStore, optional): Results store the scraped articles are recorded in.
     
     Returns:
-        dict: Dictionary mapping source names to lists of article URLs.
+        dict: Dictionary mapping source names to lists of ArticleRecord objects.
     """
     results = {}
     sources = config.get('sources', {})
+    configure_extraction_cache(config)
+    configure_prefetch(config)
+    seen_index = open_seen_index(config, include_seen)
+    issue_history = open_issue_history(config, include_seen)
     
     # If a specific source is provided, only scrape that source
     if source and source in sources and source in SCRAPERS:
         if sources[source].get('enabled', False):
-            print(f"Scraping articles from {source.capitalize()}...")
+            logger.info("Scraping articles from %s...", source.capitalize())
             output_path = sources[source].get('output_path')
             scraper_class = SCRAPERS[source]
-            scraper = scraper_class(output_path, selected_issue)
+            scraper = scraper_class(output_path, selected_issue, seen_index=seen_index, issue_history=issue_history)
             urls = scraper.scrape()
             if urls:
-                results[source] = urls
+                results[source] = scraper.article_records(urls)
+                if store:
+                    store.record_articles(results[source])
+            elif scraper.issue_delta is not None and not scraper.issue_delta.first_run:
+                logger.info("No new articles from %s.", source.capitalize())
             else:
-                print(f"No articles were found from {source.capitalize()} or the process was cancelled.")
+                logger.warning("No articles were found from %s or the process was cancelled.", source.capitalize())
         return results
     
     # Otherwise, scrape all enabled sources
     for source_name, source_config in sources.items():
         if source_name in SCRAPERS and source_config.get('enabled', False):
-            print(f"Scraping articles from {source_name.capitalize()}...")
+            logger.info("Scraping articles from %s...", source_name.capitalize())
             output_path = source_config.get('output_path')
             scraper_class = SCRAPERS[source_name]
-            scraper = scraper_class(output_path, selected_issue)
+            scraper = scraper_class(output_path, selected_issue, seen_index=seen_index, issue_history=issue_history)
             urls = scraper.scrape()
             if urls:
-                results[source_name] = urls
+                results[source_name] = scraper.article_records(urls)
+                if store:
+                    store.record_articles(results[source_name])
+            elif scraper.issue_delta is not None and not scraper.issue_delta.first_run:
+                logger.info("No new articles from %s.", source_name.capitalize())
             else:
-                print(f"No articles were found from {source_name.capitalize()} or the process was cancelled.")
+                logger.warning("No articles were found from %s or the process was cancelled.", source_name.capitalize())
     
     return results
 
+def open_seen_index(config, include_seen=False):
+    """
+    Open the index of article URLs already processed.
+    
+    Args:
+        config (dict): The configuration dictionary.
+        include_seen (bool): Treat the URLs recorded by earlier runs as unseen.
+    
+    Returns:
+        SeenUrlIndex: The index.
+    """
+    return SeenUrlIndex(os.path.join(config.get('output_directory', 'data'), SEEN_URLS_FILE),
+                        ignore_existing=include_seen)
+
+def open_issue_history(config, include_seen=False):
+    """
+    Open the history of the articles processed for each issue.
+    
+    Args:
+        config (dict): The configuration dictionary.
+        include_seen (bool): Treat every issue as not processed before.
+    
+    Returns:
+        IssueHistory: The history.
+    """
+    return IssueHistory(os.path.join(config.get('output_directory', 'data'), ISSUE_HISTORY_FILE),
+                        ignore_existing=include_seen)
+
+def record_finished(record, seen_index=None, issue_history=None):
+    """
+    Record a finished article so later runs skip it.
+    
+    Args:
+        record (ArticleRecord): The article.
+        seen_index (SeenUrlIndex, optional): Index of the article URLs already processed.
+        issue_history (IssueHistory, optional): History of the articles processed for each issue;
+                                                the article is written by its next flush.
+    """
+    if seen_index is not None:
+        seen_index.record([record.url])
+    scraper_class = SCRAPERS.get(record.source)
+    if issue_history is not None and scraper_class is not None and record.issue:
+        issue_history.add(record.source, scraper_class.normalize_issue(record.issue), [record.url])
+
+def article_finished(result, targets):
+    """
+    Tell whether an article needs no more work.
+    
+    Args:
+        result (ArchiveResult): The article's outcome.
+        targets (list): ReadwiseTarget objects the article is submitted to.
+    
+    Returns:
+        bool: True if the article was archived and every Readwise target added it or already had it.
+    """
+    if not result.ok:
+        return False
+    if not targets:
+        return True
+    outcomes = result.readwise_targets or {}
+    return all(
+        target.name in outcomes and outcomes[target.name].status in (ReadwiseResult.ADDED, ReadwiseResult.DUPLICATE)
+        for target in targets
+    )
+
+def readwise_failure(result, targets):
+    """
+    Describe why an archived article was not added to every Readwise target.
+    
+    Args:
+        result (ArchiveResult): The article's outcome.
+        targets (list): ReadwiseTarget objects the article is submitted to.
+    
+    Returns:
+        str: The failed targets and their errors.
+    """
+    outcomes = result.readwise_targets or {}
+    failures = []
+    for target in targets:
+        outcome = outcomes.get(target.name)
+        if outcome is None:
+            failures.append(f"{target.name}: not submitted")
+        elif outcome.status == ReadwiseResult.FAILED:
+            failures.append(f"{target.name}: {outcome.error}")
+    return "Not added to Readwise (" + "; ".join(failures) + ")"
+
 def list_available_issues(config, source=None):
     """
     List available issues for a specific source or all sources.
@@ -82,6 +260,7 @@ def list_available_issues(config, source=None):
     """
     sources = config.get('sources', {})
     results = {}
+    configure_extraction_cache(config)
     
     # If a specific source is provided, only list issues for that source
     if source and source in sources and source in SCRAPERS:
@@ -118,57 +297,429 @@ def list_available_issues(config, source=None):
     
     return results
 
-def process_articles(config, article_urls_by_source):
+def prepare_records(config, source_name, articles):
+    """
+    Turn a source's articles into unique records in processing order.
+    
+    Plain URLs get the metadata captured while scraping from the sidecar index.
+    With scheduler.newest_first the most recent articles come first.
+    
+    Args:
+        config (dict): The configuration dictionary.
+        source_name (str): The source name.
+        articles (list): Article URLs or ArticleRecord objects.
+    
+    Returns:
+        list: ArticleRecord objects.
+    """
+    output_path = config.get('sources', {}).get(source_name, {}).get('output_path')
+    metadata_index = None
+    records = {}
+    for article in articles:
+        if isinstance(article, str):
+            if metadata_index is None:
+                metadata_index = ArticleMetadataIndex(os.path.join(output_path, METADATA_FILE))
+            article = metadata_index.get(article) or article
+        record = ArticleRecord.coerce(article, source_name)
+        records.setdefault(record.url, record)
+    records = list(records.values())
+    if config.get('scheduler', {}).get('newest_first', True):
+        # Stable sort: undated articles keep their order after the dated ones
+        records.sort(key=lambda record: record.date or '', reverse=True)
+    return records
+
+def article_lane(record, source_config):
+    """
+    Pick the priority lane of an article.
+    
+    Args:
+        record (ArticleRecord): The article.
+        source_config (dict): The source's configuration; articles in one of its
+                              priority_sections (e.g. cover stories) get the priority lane.
+    
+    Returns:
+        int: The scheduler lane.
+    """
+    priority_sections = {section.lower() for section in source_config.get('priority_sections', [])}
+    if record.section and record.section.lower() in priority_sections:
+        return LANE_PRIORITY
+    return LANE_NORMAL
+
+def process_article(record, archive_config, tags=None, targets=None, submitted=None, store=None,
+                    article_budget=None, capture_poller=None, seen_index=None, issue_history=None):
+    """
+    Archive one article and add it to every Readwise target.
+    
+    All requests for the article, including retries, share one time budget;
+    if it (or the run deadline) runs out, the article is recorded as timed out.
+    The snapshot is verified before it is added to Readwise, and the article
+    is captured again if the snapshot is broken. If archive.today is still capturing the article and a capture poller is
+    given, the article is parked and added to Readwise once its snapshot appears.
+    
+    Args:
+        record (ArticleRecord): The article.
+        archive_config (dict): The archive section of the configuration.
+        tags (list, optional): Readwise tags for the article.
+        targets (list, optional): ReadwiseTarget objects; Readwise is skipped without any.
+        submitted (dict, optional): Readwise outcomes of the source's earlier articles, keyed by
+                                    target name and archive URL.
+        store (ResultsStore, optional): Results store the outcomes are recorded in.
+        article_budget (float, optional): Seconds the article may take. If None, only the run deadline applies.
+        capture_poller (CapturePoller, optional): Poller captures in progress are parked with.
+        seen_index (SeenUrlIndex, optional): Index the article is recorded in once it is finished,
+                                             so later runs skip it.
+        issue_history (IssueHistory, optional): History the article is added to once it is finished.
+    
+    Returns:
+        ArchiveResult: The outcome, with its Readwise outcome set (later, for a parked article).
+    """
+    archive_base_url = archive_config.get('base_url', ARCHIVE_BASE_URL)
+    
+    def promote(result):
+        if verify_archive_result(result, archive_base_url, store) and targets:
+            submit_to_targets(result, targets, tags, submitted, store)
+        if article_finished(result, targets):
+            record_finished(record, seen_index, issue_history)
+    
+    with deadline.budget(article_budget):
+        result = archive_article_result(
+            record,
+            reuse_snapshots=archive_config.get('reuse_snapshots', True),
+            max_snapshot_age_days=archive_config.get('max_snapshot_age_days'),
+            archive_base_url=archive_base_url,
+            store=store,
+            capture_poller=capture_poller,
+            on_captured=promote
+        )
+        promote(result)
+    return result
+
+@profiled('process_articles')
+def process_articles(config, articles_by_source, store=None):
     """
     Process articles by archiving them and adding to Readwise.
     
+    Article jobs from all sources are interleaved by a weighted fair scheduler.
+    Each source's weight, concurrency and priority_sections, and the scheduler's
+    max_workers and newest_first settings, come from the configuration.
+    Articles whose capture is still in progress are polled in the background
+    and added to Readwise as soon as their snapshot appears.
+    
     Args:
         config (dict): The configuration dictionary.
-        article_urls_by_source (dict): Dictionary mapping source names to lists of article URLs.
+        articles_by_source (dict): Dictionary mapping source names to lists of article URLs
+                                   or ArticleRecord objects.
+        store (ResultsStore, optional): Results store archive and Readwise outcomes are recorded in.
     
     Returns:
-        dict: Dictionary mapping source names to lists of processed archive URLs.
+        dict: Dictionary mapping source names to lists of ArchiveResult objects for the
+              successfully archived articles, each carrying its Readwise outcome.
     """
-    results = {}
     sources = config.get('sources', {})
+    archive_config = config.get('archive', {})
+    scheduler_config = config.get('scheduler', {})
+    targets = readwise_targets(config)
+    article_budget = config.get('timeouts', {}).get('article_budget')
+    breakers.configure(**archive_config.get('circuit', {}))
+    limiters.configure(**config.get('concurrency', {}))
+    configure_capture(**archive_config.get('capture', {}))
+    verifier.configure(**archive_config.get('verify', {}))
+    scheduler = FairScheduler(scheduler_config.get('max_workers', 4))
+    capture_poller = CapturePoller(poll_capture)
+    seen_index = open_seen_index(config)
+    issue_history = open_issue_history(config)
+    jobs = {}
     
-    for source_name, article_urls in article_urls_by_source.items():
-        if not article_urls:
-            print(f"No articles found for {source_name}.")
+    for source_name, articles in articles_by_source.items():
+        if not articles:
+            logger.warning("No articles found for %s.", source_name)
             continue
         
         source_config = sources.get(source_name, {})
-        output_path = source_config.get('output_path')
+        records = prepare_records(config, source_name, articles)
         
-        # Archive the articles
-        print(f"Archiving {len(article_urls)} articles from {source_name}...")
-        archive_output_path = os.path.join(output_path, 'archives')
-        archive_urls = archive_articles(article_urls, archive_output_path)
+        logger.info("Archiving %d articles from %s...", len(records), source_name)
+        scheduler.add_source(
+            source_name,
+            weight=source_config.get('weight', 1),
+            concurrency=source_config.get('concurrency', 1)
+        )
+        tags = source_config.get('tags', [source_name])
+        submitted = {}
+        jobs[source_name] = [
+            scheduler.submit(
+                source_name, process_article, record, archive_config, tags, targets, submitted, store,
+                article_budget, capture_poller, seen_index, issue_history, lane=article_lane(record, source_config)
+            )
+            for record in records
+        ]
+    
+    if jobs and not targets:
+        logger.warning("Readwise token not configured. Skipping Readwise integration.")
+        logger.warning("You can set your Readwise token using: news-archiver --token YOUR_TOKEN")
+    
+    try:
+        outcomes = scheduler.run()
+        if capture_poller.pending:
+            logger.info("Waiting for %d captures still in progress...", capture_poller.pending)
+            capture_poller.wait()
+    finally:
+        capture_poller.close()
+        issue_history.flush()
+        if store:
+            store.flush()
+    
+    results = {}
+    for source_name, job_ids in jobs.items():
+        source_results = [outcomes[job_id] for job_id in job_ids]
+        # Keep writing the per-source link files of earlier versions
+        archive_output_path = os.path.join(sources.get(source_name, {}).get('output_path'), 'archives')
+        create_directory(archive_output_path)
+        save_links(
+            [archive_link_for(result.article_url, archive_config.get('base_url', ARCHIVE_BASE_URL))
+             for result in source_results if result.status != ArchiveResult.REUSED],
+            os.path.join(archive_output_path, "archive_links.txt")
+        )
+        final_links_path = os.path.join(archive_output_path, "final_archive_links.txt")
+        save_links(dict.fromkeys(result.archive_url for result in source_results if result.ok), final_links_path)
+        logger.info("Final archive links saved to %s", final_links_path)
+        
+        blocked = sum(1 for result in source_results if result.status == ArchiveResult.BLOCKED)
+        if blocked:
+            logger.warning("%d articles from %s were not archived because archive.today kept blocking requests. "
+                           "Run again to retry them.", blocked, source_name)
+        timed_out = sum(1 for result in source_results if result.status == ArchiveResult.TIMED_OUT)
+        if timed_out:
+            logger.warning("%d articles from %s ran out of time. Run again to retry them.",
+                           timed_out, source_name)
+        invalid = sum(1 for result in source_results if result.status == ArchiveResult.INVALID)
+        if invalid:
+            logger.warning("%d articles from %s have no working snapshot. Run again to retry them.",
+                           invalid, source_name)
         
-        if not archive_urls:
-            print(f"No articles were successfully archived for {source_name}.")
+        archived = [result for result in source_results if result.ok]
+        if not archived:
+            logger.warning("No articles were successfully archived for %s.", source_name)
             continue
         
-        # Add to Readwise if token is available
-        readwise_token = config.get('readwise_token')
-        if readwise_token:
-            print(f"Adding {len(archive_urls)} archived articles to Readwise...")
-            tags = source_config.get('tags', [source_name])
-            successful_additions = add_articles_to_readwise(
-                archive_urls,
-                tags=tags,
-                access_token=readwise_token
-            )
-            print(f"Successfully added {len(successful_additions)} articles to Readwise.")
-        else:
-            print("Readwise token not configured. Skipping Readwise integration.")
-            print("You can set your Readwise token using: news-archiver --token YOUR_TOKEN")
+        if len(targets) > 1:
+            for target in targets:
+                added = sum(1 for result in archived if result.readwise_targets
+                            and result.readwise_targets[target.name].ok)
+                logger.info("Successfully added %d articles from %s to Readwise (%s).", added, source_name, target.name)
+        elif targets:
+            added = sum(1 for result in archived if result.readwise and result.readwise.ok)
+            logger.info("Successfully added %d articles from %s to Readwise.", added, source_name)
         
-        results[source_name] = archive_urls
+        results[source_name] = archived
     
     return results
 
-def run(config_path="config.json", source=None, selected_issue=None, list_issues_only=False):
+def results_db_path(config):
+    """Return the path of the results database for a configuration."""
+    return os.path.join(config.get('output_directory', 'data'), RESULTS_DB_FILE)
+
+def export_results(config_path="config.json", output_path="data/export", source=None, issue=None):
+    """
+    Export recorded results in the plain text formats of earlier versions.
+    
+    Args:
+        config_path (str): Path to the configuration file.
+        output_path (str): Directory to write articles.txt, archive_links.txt and final_archive_links.txt to.
+        source (str, optional): Only export this source.
+        issue (str, optional): Only export this issue.
+    
+    Returns:
+        dict: Mapping of file name to the number of lines written.
+    """
+    config = load_config(config_path)
+    with ResultsStore(results_db_path(config)) as store:
+        return store.export_text(output_path, source, issue)
+
+def open_queue(config):
+    """
+    Open the job queue shared by the coordinator and the workers.
+    
+    Args:
+        config (dict): The configuration dictionary; the queue section sets the
+                       path, visibility_timeout and max_attempts.
+    
+    Returns:
+        JobQueue: The queue.
+    """
+    queue_config = config.get('queue', {})
+    path = queue_config.get('path') or os.path.join(config.get('output_directory', 'data'), QUEUE_DB_FILE)
+    return JobQueue(
+        path,
+        visibility_timeout=queue_config.get('visibility_timeout', 600),
+        max_attempts=queue_config.get('max_attempts', 3)
+    )
+
+def enqueue_articles(config, articles_by_source, queue):
+    """
+    Add scraped articles to the job queue for workers to archive.
+    
+    Args:
+        config (dict): The configuration dictionary.
+        articles_by_source (dict): Dictionary mapping source names to lists of article URLs
+                                   or ArticleRecord objects.
+        queue (JobQueue): The job queue.
+    
+    Returns:
+        dict: Dictionary mapping source names to the number of jobs added.
+    """
+    sources = config.get('sources', {})
+    counts = {}
+    for source_name, articles in articles_by_source.items():
+        source_config = sources.get(source_name, {})
+        records = prepare_records(config, source_name, articles)
+        counts[source_name] = queue.enqueue(
+            source_name, records, lane=lambda record: article_lane(record, source_config)
+        )
+        logger.info("Enqueued %d of %d articles from %s.", counts[source_name], len(records), source_name)
+    return counts
+
+@profiled('work_queue')
+def work_queue(config, queue, worker_id=None, threads=1, exit_when_idle=True, store=None):
+    """
+    Archive queued articles and add them to Readwise until the queue is drained.
+    
+    Each thread leases one job at a time and extends the lease while the job
+    runs. Failed, blocked and timed out articles, and articles that some
+    Readwise target did not accept, are released for another attempt. Once the run deadline has passed, no further jobs are leased.
+    
+    Args:
+        config (dict): The configuration dictionary.
+        queue (JobQueue): The job queue.
+        worker_id (str, optional): Identifier of this worker. Defaults to host name and process ID.
+        threads (int): Number of jobs processed at once.
+        exit_when_idle (bool): Return once no jobs are queued or leased; otherwise poll forever.
+        store (ResultsStore, optional): Results store the outcomes are recorded in.
+    
+    Returns:
+        dict: Dictionary mapping source names to lists of ArchiveResult objects for the
+              articles this worker archived.
+    """
+    sources = config.get('sources', {})
+    archive_config = config.get('archive', {})
+    queue_config = config.get('queue', {})
+    poll_interval = queue_config.get('poll_interval', 5)
+    retry_delay = archive_config.get('circuit', {}).get('reset_timeout', 60)
+    targets = readwise_targets(config)
+    worker_id = worker_id or default_worker_id()
+    article_budget = config.get('timeouts', {}).get('article_budget')
+    breakers.configure(**archive_config.get('circuit', {}))
+    limiters.configure(**config.get('concurrency', {}))
+    configure_capture(**archive_config.get('capture', {}))
+    verifier.configure(**archive_config.get('verify', {}))
+    seen_index = open_seen_index(config)
+    issue_history = open_issue_history(config)
+    results = {}
+    results_lock = threading.Lock()
+    submitted = {}
+    
+    def work(owner):
+        while not deadline.run_expired():
+            jobs = queue.lease(owner)
+            if not jobs:
+                # Write the issue history while idle rather than once per article
+                issue_history.flush()
+                if exit_when_idle and not queue.pending():
+                    return
+                left = deadline.remaining()
+                time.sleep(poll_interval if left is None else min(poll_interval, left))
+                continue
+            
+            job = jobs[0]
+            record = ArticleRecord.coerce(job.article, job.source)
+            tags = sources.get(job.source, {}).get('tags', [job.source])
+            
+            # Keep the lease alive while the article is being processed
+            finished = threading.Event()
+            def heartbeat():
+                while not finished.wait(queue.visibility_timeout / 3):
+                    if not queue.extend(job, owner):
+                        logger.warning("Lost the lease on %s.", record.url)
+                        return
+            heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+            heartbeat_thread.start()
+            
+            try:
+                result = process_article(
+                    record, archive_config, tags, targets, submitted.setdefault(job.source, {}), store,
+                    article_budget, seen_index=seen_index, issue_history=issue_history
+                )
+            except Exception as e:
+                logger.error("Error processing %s: %s", record.url, e)
+                queue.fail(job, owner, str(e), retry_delay)
+                continue
+            finally:
+                finished.set()
+                heartbeat_thread.join()
+            
+            if result.ok:
+                with results_lock:
+                    results.setdefault(job.source, []).append(result)
+            if article_finished(result, targets):
+                queue.complete(job, owner, {
+                    'archive_url': result.archive_url,
+                    'status': result.status,
+                    'readwise': result.readwise.status if result.readwise else None
+                })
+            elif result.ok:
+                # Archived but not added to every Readwise target; release it for another attempt
+                queue.fail(job, owner, readwise_failure(result, targets), retry_delay)
+            else:
+                queue.fail(job, owner, result.error, retry_delay)
+    
+    owners = [f"{worker_id}/{i}" for i in range(max(1, threads))]
+    worker_threads = [threading.Thread(target=work, args=(owner,)) for owner in owners[1:]]
+    for thread in worker_threads:
+        thread.start()
+    try:
+        work(owners[0])
+    finally:
+        for thread in worker_threads:
+            thread.join()
+        issue_history.flush()
+        if store:
+            store.flush()
+    return results
+
+def configure_deadlines(config):
+    """
+    Apply the request timeouts and start the run deadline from the timeouts section.
+    
+    Args:
+        config (dict): The configuration dictionary.
+    """
+    timeouts = config.get('timeouts', {})
+    deadline.configure_timeouts(
+        timeouts.get('connect', deadline.DEFAULT_CONNECT_TIMEOUT),
+        timeouts.get('read', deadline.DEFAULT_READ_TIMEOUT)
+    )
+    deadline.set_run_deadline(timeouts.get('run_deadline'))
+
+def parse_overrides(assignments):
+    """
+    Parse KEY=VALUE command line assignments into nested configuration overrides.
+    
+    Args:
+        assignments (list): Strings such as "archive.max_snapshot_age_days=30".
+    
+    Returns:
+        dict: Nested overrides.
+    """
+    overrides = {}
+    for assignment in assignments or []:
+        key, separator, value = assignment.partition('=')
+        if not separator or not key.strip():
+            raise ValueError(f"Invalid setting '{assignment}', expected KEY=VALUE")
+        set_path(overrides, key.strip(), parse_override_value(value))
+    return overrides
+
+def run(config_path="config.json", source=None, selected_issue=None, list_issues_only=False, include_seen=False,
+        overrides=None):
     """
     Run the full news archiving process.
     
@@ -177,12 +728,18 @@ def run(config_path="config.json", source=None, selected_issue=None, list_issues
         source (str, optional): Specific source to use (if None, use all sources).
         selected_issue (str, optional): Specific issue to scrape.
         list_issues_only (bool): If True, only list available issues and exit.
+        include_seen (bool): Re-archive articles that earlier runs already processed.
+        overrides (dict, optional): Configuration values taking precedence over the file
+                                    and environment, e.g. {"archive": {"base_url": ...}}.
     
     Returns:
-        dict: Results of the archiving process.
+        dict: Dictionary mapping source names to lists of ArchiveResult objects.
     """
     # Load configuration
+    if overrides:
+        get_config_service(config_path).set_overrides(overrides)
     config = load_config(config_path)
+    configure_deadlines(config)
     
     # Set up directories
     setup_directories(config)
@@ -192,14 +749,74 @@ def run(config_path="config.json", source=None, selected_issue=None, list_issues
         list_available_issues(config, source)
         return {}
     
-    # Scrape articles
-    article_urls_by_source = scrape_articles(config, source, selected_issue)
-    
-    # Process articles
-    results = process_articles(config, article_urls_by_source)
+    # Record every stage in the results database
+    with ResultsStore(results_db_path(config)) as store:
+        # Scrape articles
+        articles_by_source = scrape_articles(config, source, selected_issue, include_seen, store)
+        
+        # Process articles
+        results = process_articles(config, articles_by_source, store)
     
     return results
 
+def enqueue(config_path="config.json", source=None, selected_issue=None, include_seen=False, overrides=None):
+    """
+    Scrape articles and add them to the job queue instead of archiving them (coordinator mode).
+    
+    Args:
+        config_path (str): Path to the configuration file.
+        source (str, optional): Specific source to use (if None, use all sources).
+        selected_issue (str, optional): Specific issue to scrape.
+        include_seen (bool): Enqueue articles that earlier runs already processed.
+        overrides (dict, optional): Configuration values taking precedence over the file and environment.
+    
+    Returns:
+        dict: Dictionary mapping source names to the number of jobs added.
+    """
+    if overrides:
+        get_config_service(config_path).set_overrides(overrides)
+    config = load_config(config_path)
+    configure_deadlines(config)
+    setup_directories(config)
+    
+    with ResultsStore(results_db_path(config)) as store:
+        articles_by_source = scrape_articles(config, source, selected_issue, include_seen, store)
+    queue = open_queue(config)
+    try:
+        return enqueue_articles(config, articles_by_source, queue)
+    finally:
+        queue.close()
+
+def run_worker(config_path="config.json", worker_id=None, threads=1, exit_when_idle=True, overrides=None):
+    """
+    Archive articles from the job queue (worker mode).
+    
+    Several worker processes, on one host or on hosts sharing the output
+    directory, can work on the same queue at once.
+    
+    Args:
+        config_path (str): Path to the configuration file.
+        worker_id (str, optional): Identifier of this worker.
+        threads (int): Number of jobs processed at once.
+        exit_when_idle (bool): Return once the queue is drained; otherwise keep polling.
+        overrides (dict, optional): Configuration values taking precedence over the file and environment.
+    
+    Returns:
+        dict: Dictionary mapping source names to lists of ArchiveResult objects.
+    """
+    if overrides:
+        get_config_service(config_path).set_overrides(overrides)
+    config = load_config(config_path)
+    configure_deadlines(config)
+    setup_directories(config)
+    
+    queue = open_queue(config)
+    try:
+        with ResultsStore(results_db_path(config)) as store:
+            return work_queue(config, queue, worker_id, threads, exit_when_idle, store)
+    finally:
+        queue.close()
+
 def main():
     """Entry point for the command line interface."""
     parser = argparse.ArgumentParser(description="Archive news articles and add them to Readwise.")
@@ -208,13 +825,37 @@ def main():
     parser.add_argument('--list-issues', action='store_true', help='List available issues and exit')
     parser.add_argument('--issue', help='Specify issue to archive (e.g., "April 2025")')
     parser.add_argument('--source', choices=['atlantic', 'economist'], help='Specify which news source to use')
+    parser.add_argument('--include-seen', action='store_true', help='Re-archive articles that earlier runs already processed')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Override a configuration value for this run (e.g. archive.max_snapshot_age_days=30)')
+    parser.add_argument('--export-results', metavar='DIR',
+                        help='Export recorded results (filtered by --source and --issue) as text files to DIR and exit')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--enqueue', action='store_true',
+                      help='Scrape articles and add them to the shared job queue instead of archiving them')
+    mode.add_argument('--worker', action='store_true', help='Archive articles from the shared job queue until it is drained')
+    mode.add_argument('--queue-status', action='store_true', help='Show the number of jobs in each state and exit')
+    parser.add_argument('--worker-threads', type=int, default=1, help='Number of jobs a worker processes at once')
+    parser.add_argument('--profile', nargs='?', const='profile', metavar='DIR',
+                        help='Profile each pipeline stage and write .prof and flame graph (.collapsed) files to DIR '
+                             '(default: profile)')
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument('--record', metavar='FILE', help='Record every HTTP exchange of the run to a cassette file')
+    recording.add_argument('--replay', metavar='FILE', help='Answer HTTP requests from a recorded cassette instead of the network')
+    parser.add_argument('--replay-latency', nargs='?', type=float, const=1.0, metavar='FACTOR',
+                        help='With --replay, take as long as the recorded exchanges did, scaled by FACTOR (default: 1.0)')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('--quiet', '-q', action='store_true', help='Only show warnings, errors and the final summary')
+    verbosity.add_argument('--verbose', '-v', action='store_true', help='Show progress for every article')
     
     args = parser.parse_args()
+    configure_logging(args.quiet, args.verbose)
     
     # Show banner
-    print("\n=============================================")
-    print("     News Magazine Archiver")
-    print("=============================================\n")
+    if not args.quiet:
+        print("\n=============================================")
+        print("     News Magazine Archiver")
+        print("=============================================\n")
     
     # Set Readwise token if provided
     if args.token:
@@ -222,13 +863,76 @@ def main():
         print(f"Readwise token set in {args.config}")
         return
     
+    try:
+        overrides = parse_overrides(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.export_results:
+        if overrides:
+            get_config_service(args.config).set_overrides(overrides)
+        counts = export_results(args.config, args.export_results, args.source, args.issue)
+        for file_name, count in counts.items():
+            print(f"{file_name}: {count} lines")
+        return
+    
+    if args.replay_latency is not None and not args.replay:
+        parser.error("--replay-latency requires --replay")
+    
+    if args.record:
+        enable_cassette(args.record, RECORD)
+    elif args.replay:
+        try:
+            enable_cassette(args.replay, REPLAY, args.replay_latency)
+        except (OSError, ValueError) as e:
+            parser.error(f"Cannot read cassette {args.replay}: {e}")
+    if args.profile:
+        enable_profiling(args.profile)
+    try:
+        run_command(args, overrides)
+    finally:
+        if args.profile:
+            paths = disable_profiling()
+            print(f"\nProfile written to {args.profile} ({len(paths)} files)")
+        cassette = disable_cassette()
+        if cassette is not None and cassette.mode == RECORD:
+            print(f"HTTP exchanges recorded to {cassette.path}")
+
+def run_command(args, overrides):
+    """
+    Run the command selected on the command line.
+    
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        overrides (dict): Configuration overrides from --set.
+    """
+    if args.queue_status:
+        if overrides:
+            get_config_service(args.config).set_overrides(overrides)
+        queue = open_queue(load_config(args.config))
+        for status, count in queue.counts().items():
+            print(f"{status}: {count}")
+        queue.close()
+        return
+    
+    if args.enqueue:
+        counts = enqueue(args.config, args.source, args.issue, args.include_seen, overrides)
+        for source_name, count in counts.items():
+            print(f"{source_name}: {count} articles enqueued")
+        return
+    
     # Run the main process
-    results = run(
-        args.config,
-        source=args.source,
-        selected_issue=args.issue, 
-        list_issues_only=args.list_issues
-    )
+    if args.worker:
+        results = run_worker(args.config, threads=args.worker_threads, overrides=overrides)
+    else:
+        results = run(
+            args.config,
+            source=args.source,
+            selected_issue=args.issue, 
+            list_issues_only=args.list_issues,
+            include_seen=args.include_seen,
+            overrides=overrides
+        )
     
     # Don't print summary if just listing issues
     if args.list_issues:
@@ -237,8 +941,15 @@ def main():
     # Print summary
     if results:
         print("\nSummary:")
-        for source_name, archive_urls in results.items():
-            print(f"{source_name}: {len(archive_urls)} articles archived")
+        for source_name, archived in results.items():
+            print(f"{source_name}: {len(archived)} articles archived")
+        
+        limits = limiters.snapshot()
+        if limits:
+            print("\nConcurrency limits:")
+            for host, state in limits.items():
+                print(f"{host}: {state['limit']} (peak {state['peak_limit']}, "
+                      f"lowered {state['decreases']} times in {state['requests']} requests)")
         
         print("\nProcess completed successfully!")
         print("The archived articles will be available in your Readwise Reader account.")
@@ -0,0 +1,199 @@
+"""
+Module for memoizing page extraction by content hash.
+
+Re-running an issue, or polling an edition that has not changed, fetches
+byte-identical HTML. Extraction results are therefore cached on disk under a
+hash of the page content and the extractor's name and version, so an
+unchanged page skips parsing entirely. Bumping a scraper's extractor_version
+invalidates its cached results.
+
+The cache is a directory of JSON files bounded to max_entries; each hit
+refreshes an entry's modification time and the least recently used entries
+are evicted first. Writes are atomic, so the directory may be shared by
+concurrent processes.
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Directory of the extraction cache inside the output directory
+EXTRACTION_CACHE_DIR = "extraction_cache"
+
+# Bytes read at a time when hashing a saved page
+FILE_CHUNK_SIZE = 64 * 1024
+
+class ExtractionCache:
+    """Bounded on-disk LRU cache of extraction results keyed by content hash."""
+
+    def __init__(self, cache_dir=None, max_entries=256):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Directory of the cache files. If None, caching is off.
+            max_entries (int): Maximum number of cached results.
+        """
+        self._lock = threading.Lock()
+        self.cache_dir = None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.configure(cache_dir, max_entries)
+
+    def configure(self, cache_dir=None, max_entries=256):
+        """
+        Change the cache directory and size limit.
+
+        Args:
+            cache_dir (str, optional): Directory of the cache files. If None, caching is off.
+            max_entries (int): Maximum number of cached results.
+        """
+        with self._lock:
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            self.cache_dir = cache_dir
+            self.max_entries = max(1, max_entries)
+
+    @property
+    def enabled(self):
+        """Whether results are cached."""
+        return self.cache_dir is not None
+
+    def _path(self, namespace, content):
+        """Return the cache file of a namespace and page content."""
+        digest = hashlib.sha256(namespace.encode('utf-8') + b'\0')
+        digest.update(content.encode('utf-8') if isinstance(content, str) else content)
+        return os.path.join(self.cache_dir, digest.hexdigest() + '.json')
+
+    def _file_path(self, namespace, file_path):
+        """Return the cache file of a namespace and a saved page, hashing the page in chunks."""
+        digest = hashlib.sha256(namespace.encode('utf-8') + b'\0')
+        with open(file_path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(FILE_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return os.path.join(self.cache_dir, digest.hexdigest() + '.json')
+
+    def get(self, namespace, content):
+        """
+        Look up the cached result of extracting content.
+
+        Args:
+            namespace (str): Extractor name and version, e.g. "economist.issue_page.v1".
+            content (str or bytes): The page content.
+
+        Returns:
+            The cached result, or None if there is none.
+        """
+        if not self.enabled:
+            return None
+        return self._load(namespace, self._path(namespace, content))
+
+    def _load(self, namespace, path):
+        """Read a cache file, or return None if there is none."""
+        try:
+            with open(path, 'r', encoding='utf-8') as infile:
+                value = json.load(infile)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        logger.debug("Reusing cached %s extraction", namespace)
+        return value
+
+    def put(self, namespace, content, value):
+        """
+        Cache the result of extracting content, evicting the least recently used results.
+
+        Args:
+            namespace (str): Extractor name and version.
+            content (str or bytes): The page content.
+            value: JSON-serializable extraction result.
+        """
+        if not self.enabled:
+            return
+        self._store(self._path(namespace, content), value)
+
+    def _store(self, path, value):
+        """Write a cache file atomically, evicting the least recently used results."""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as outfile:
+                json.dump(value, outfile)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning("Could not write extraction cache entry %s: %s", path, e)
+            return
+        self._evict()
+
+    def memoize(self, namespace, content, extract):
+        """
+        Return the cached result for content, or compute and cache it.
+
+        Args:
+            namespace (str): Extractor name and version.
+            content (str or bytes): The page content.
+            extract (callable): Function computing the JSON-serializable result from content.
+
+        Returns:
+            The extraction result.
+        """
+        value = self.get(namespace, content)
+        if value is None:
+            value = extract(content)
+            self.put(namespace, content, value)
+        return value
+
+    def memoize_file(self, namespace, file_path, extract):
+        """
+        Return the cached result for a saved page, or compute and cache it.
+
+        The page is hashed in chunks rather than read whole, so a cache hit
+        never holds the page in memory.
+
+        Args:
+            namespace (str): Extractor name and version.
+            file_path (str): Path to the saved page.
+            extract (callable): Function computing the JSON-serializable result from the file path.
+
+        Returns:
+            The extraction result.
+        """
+        if not self.enabled:
+            return extract(file_path)
+        path = self._file_path(namespace, file_path)
+        value = self._load(namespace, path)
+        if value is None:
+            value = extract(file_path)
+            self._store(path, value)
+        return value
+
+    def _evict(self):
+        """Remove the least recently used entries beyond max_entries."""
+        with self._lock:
+            try:
+                entries = []
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith('.json'):
+                        entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                return
+            excess = len(entries) - self.max_entries
+            if excess <= 0:
+                return
+            entries.sort()
+            for _, path in entries[:excess]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            logger.debug("Evicted %d extraction cache entries", excess)
+
+# Extraction cache shared by all scrapers in the process (off until configured)
+extraction_cache = ExtractionCache()
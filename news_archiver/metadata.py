@@ -0,0 +1,127 @@
+"""
+Module for the article metadata sidecar index.
+
+Scrapers record each article's title, author, section and publication date
+while they parse an issue page. The index is stored next to the scraper's
+other output files so later stages and reports can use it without fetching
+or parsing any HTML again.
+"""
+import os
+import json
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# File name of the sidecar index inside a source's output directory
+METADATA_FILE = "article_metadata.json"
+
+# Fields kept for each article
+METADATA_FIELDS = ('url', 'title', 'author', 'section', 'date', 'source', 'issue')
+
+class ArticleMetadataIndex:
+    """JSON-backed index of article metadata keyed by canonical article URL."""
+
+    def __init__(self, index_path):
+        """
+        Initialize the index, loading any existing entries.
+
+        Args:
+            index_path (str): Path of the JSON index file.
+        """
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._articles = {}
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._articles = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            logger.warning("Error parsing metadata index %s. Starting a new one.", index_path)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._articles)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._articles
+
+    def get(self, url):
+        """
+        Get the metadata recorded for an article.
+
+        Args:
+            url (str): Canonical article URL.
+
+        Returns:
+            dict: The article's metadata or None if it is not indexed.
+        """
+        with self._lock:
+            article = self._articles.get(url)
+            return dict(article) if article else None
+
+    def update(self, articles, **common):
+        """
+        Add or update article entries and save the index.
+
+        Fields that are empty in the new entry keep their previously recorded values.
+
+        Args:
+            articles (iterable): Article metadata dicts, each with at least a url key.
+            **common: Fields applied to every entry (e.g. source, issue).
+        """
+        with self._lock:
+            for article in articles:
+                url = article.get('url')
+                if not url:
+                    continue
+                entry = self._articles.setdefault(url, {'url': url})
+                for field in METADATA_FIELDS:
+                    value = common.get(field) or article.get(field)
+                    if value:
+                        entry[field] = value
+            self._save()
+
+    def query(self, source=None, issue=None, section=None, date_from=None, date_to=None):
+        """
+        Find indexed articles matching all given filters.
+
+        Args:
+            source (str, optional): Source name.
+            issue (str, optional): Issue name.
+            section (str, optional): Section name (case-insensitive).
+            date_from (str, optional): Earliest publication date (ISO format, inclusive).
+            date_to (str, optional): Latest publication date (ISO format, inclusive).
+
+        Returns:
+            list: Matching article metadata dicts.
+        """
+        results = []
+        with self._lock:
+            for article in self._articles.values():
+                if source and article.get('source') != source:
+                    continue
+                if issue and article.get('issue') != issue:
+                    continue
+                if section and (article.get('section') or '').lower() != section.lower():
+                    continue
+                article_date = article.get('date') or ''
+                if date_from and article_date < date_from:
+                    continue
+                if date_to and article_date[:len(date_to)] > date_to:
+                    continue
+                results.append(dict(article))
+        return results
+
+    def _save(self):
+        """Write the index to disk, replacing the previous file in one step."""
+        directory = os.path.dirname(self.index_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._articles, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,111 @@
+"""
+Module for putting the time spent at the issue prompt to use.
+
+While the user picks an issue, the most likely choices (the newest issues)
+are downloaded into memory in the background, and keep-alive connections to
+archive.today and Readwise are opened. When the user picks one of the
+prefetched issues, its page is already there (or on its way), and the first
+archive and Readwise requests skip the connection handshakes.
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from news_archiver.throttle import pooled_session, warm_up
+from news_archiver.deadline import request_timeout
+
+logger = logging.getLogger(__name__)
+
+class IssuePrefetcher:
+    """Background downloads of likely issue pages and connection warm-up."""
+
+    def __init__(self, max_issues=3, warm_up_urls=None):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            max_issues (int): Number of issue pages to prefetch. 0 turns prefetching off.
+            warm_up_urls (list, optional): URLs whose hosts get a connection opened ahead of time.
+        """
+        self._lock = threading.Lock()
+        self._pages = {}
+        self.max_issues = max_issues
+        self.warm_up_urls = []
+        self.configure(max_issues, warm_up_urls)
+
+    def configure(self, max_issues=3, warm_up_urls=None):
+        """
+        Change the number of prefetched issues and the hosts warmed up.
+
+        Args:
+            max_issues (int): Number of issue pages to prefetch. 0 turns prefetching off.
+            warm_up_urls (list, optional): URLs whose hosts get a connection opened ahead of time.
+        """
+        with self._lock:
+            self.max_issues = max(0, max_issues)
+            self.warm_up_urls = list(warm_up_urls or [])
+
+    def start(self, issue_urls, headers=None):
+        """
+        Start prefetching issue pages and warming up connections in the background.
+
+        Call this just before waiting for the user's choice; it returns at once.
+
+        Args:
+            issue_urls (list): Issue page URLs, most likely choice first.
+            headers (dict, optional): Headers for the issue page requests.
+        """
+        with self._lock:
+            self._pages = {}
+            tasks = [(warm_up, url) for url in self.warm_up_urls]
+            for url in list(dict.fromkeys(issue_urls))[:self.max_issues]:
+                future = self._pages[url] = Future()
+                tasks.append((self._fetch, url, headers, future))
+        if tasks:
+            logger.debug("Prefetching %d issue pages and warming up %d hosts",
+                         len(self._pages), len(self.warm_up_urls))
+        # Daemon threads, so quitting at the prompt does not wait for them
+        for task in tasks:
+            threading.Thread(target=task[0], args=task[1:], daemon=True).start()
+
+    def _fetch(self, url, headers, future):
+        """Download one issue page into its future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            response = pooled_session().get(url, headers=headers, timeout=request_timeout())
+            response.raise_for_status()
+            content = response.content
+        except Exception as e:
+            logger.debug("Could not prefetch %s: %s", url, e)
+            future.set_exception(e)
+            return
+        future.set_result(content)
+
+    def take(self, url):
+        """
+        Get a prefetched issue page and drop the others.
+
+        If the page is still downloading, this waits for it rather than starting over.
+
+        Args:
+            url (str): The chosen issue's URL.
+
+        Returns:
+            bytes: The page content, or None if it was not prefetched or the download failed.
+        """
+        with self._lock:
+            future = self._pages.pop(url, None)
+            for other in self._pages.values():
+                other.cancel()
+            self._pages = {}
+        if future is None:
+            return None
+        try:
+            content = future.result()
+        except Exception:
+            return None
+        logger.debug("Using the prefetched page of %s", url)
+        return content
+
+# Prefetcher used by the interactive issue selection
+prefetcher = IssuePrefetcher()
@@ -0,0 +1,196 @@
+"""
+Module for profiling the pipeline stage by stage.
+
+Stage functions are decorated with profiled(name). While profiling is off the
+decorator only checks a module global before calling the function. While it
+is on, each stage is run under cProfile (one accumulated profile per stage,
+written as <stage>.prof for pstats or snakeviz), and a sampling thread
+records the stacks of all threads, including worker threads cProfile does
+not see, as collapsed stacks (<stage>.collapsed and profile.collapsed) that
+flamegraph.pl, speedscope or inferno can render.
+"""
+import os
+import sys
+import time
+import cProfile
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# The active profiler, or None while profiling is off
+_profiler = None
+
+class StageProfiler:
+    """Per-stage cProfile profiles and sampled collapsed stacks."""
+
+    def __init__(self, output_dir, interval=0.005):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir (str): Directory the profile files are written to.
+            interval (float): Seconds between stack samples.
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles = {}
+        self._timings = {}
+        self._samples = {}
+        self._active = []
+        self._sampler = None
+        self._stop = threading.Event()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Profile a block as a pipeline stage.
+
+        Stages nested in another stage of the same thread are counted as part of the outer one.
+
+        Args:
+            name (str): Stage name.
+        """
+        if getattr(self._local, 'stage', None) is not None:
+            yield
+            return
+
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = cProfile.Profile()
+            self._active.append(name)
+            if self._sampler is None:
+                self._stop.clear()
+                self._sampler = threading.Thread(target=self._sample, name='stage-profiler', daemon=True)
+                self._sampler.start()
+
+        self._local.stage = name
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            self._local.stage = None
+            with self._lock:
+                calls, total = self._timings.get(name, (0, 0.0))
+                self._timings[name] = (calls + 1, total + elapsed)
+                self._active.remove(name)
+
+    def _sample(self):
+        """Record the stacks of all other threads until profiling stops."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                stage = self._active[-1]
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = (stage, ';'.join(reversed(stack)))
+                with self._lock:
+                    self._samples[key] = self._samples.get(key, 0) + 1
+
+    def finish(self):
+        """
+        Stop sampling and write the profile files.
+
+        Returns:
+            list: Paths of the files written.
+        """
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+        paths = []
+        with self._lock:
+            for name, profile in self._profiles.items():
+                path = os.path.join(self.output_dir, f"{name}.prof")
+                profile.dump_stats(path)
+                paths.append(path)
+
+            stages = {}
+            for (stage, stack), count in self._samples.items():
+                stages.setdefault(stage, []).append((stack, count))
+            combined = []
+            for stage, stacks in stages.items():
+                path = os.path.join(self.output_dir, f"{stage}.collapsed")
+                with open(path, 'w') as outfile:
+                    for stack, count in sorted(stacks):
+                        outfile.write(f"{stack} {count}\n")
+                        combined.append(f"{stage};{stack} {count}\n")
+                paths.append(path)
+
+            path = os.path.join(self.output_dir, "profile.collapsed")
+            with open(path, 'w') as outfile:
+                outfile.writelines(sorted(combined))
+            paths.append(path)
+
+            for name, (calls, total) in self._timings.items():
+                logger.info("Stage %s: %d call(s), %.3f s", name, calls, total)
+        return paths
+
+def enable_profiling(output_dir="profile", interval=0.005):
+    """
+    Start profiling every stage run from now on.
+
+    Args:
+        output_dir (str): Directory the profile files are written to.
+        interval (float): Seconds between stack samples.
+
+    Returns:
+        StageProfiler: The active profiler.
+    """
+    global _profiler
+    _profiler = StageProfiler(output_dir, interval)
+    return _profiler
+
+def disable_profiling():
+    """
+    Stop profiling and write the profile files.
+
+    Returns:
+        list: Paths of the files written (empty if profiling was off).
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler.finish() if profiler else []
+
+def profiled(name):
+    """
+    Decorate a function as a pipeline stage.
+
+    Args:
+        name (str): Stage name used for the profile files.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -1,47 +1,162 @@
 """
 Module for integrating with Readwise Reader API.
+
+Archived articles can be saved to several Readwise accounts ("targets"), each
+with its own token and tags. Every article is archived once and then
+submitted to all targets at the same time; each target has its own
+concurrency limit, since Readwise rate limits each token separately.
 """
 import requests
 import os
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-import json
+# save_config and set_readwise_token are re-exported for backward compatibility
+from news_archiver.config import get_config_service, save_config, set_readwise_token
+from news_archiver.singleflight import SingleFlight
+from news_archiver.records import ReadwiseResult
+from news_archiver.throttle import limited_request
+from news_archiver import deadline
+
+logger = logging.getLogger(__name__)
+
+# Readwise Reader endpoint for saving documents
+READWISE_SAVE_URL = 'https://readwise.io/api/v3/save/'
+
+# Name of the target built from the top-level readwise_token setting
+DEFAULT_TARGET_NAME = "default"
+
+# Coalesces concurrent submissions of the same document to the same account
+_readwise_flight = SingleFlight()
+
+class ReadwiseTarget:
+    """A Readwise account archived articles are saved to."""
+
+    def __init__(self, name, token, tags=None):
+        """
+        Args:
+            name (str): Name of the target, used in logs, summaries and the results store.
+            token (str): The account's Readwise access token.
+            tags (list, optional): Tags added to every document saved to this account.
+        """
+        self.name = name
+        self.token = token
+        self.tags = list(tags or [])
+
+    def document_tags(self, tags=None):
+        """
+        Return the tags for a document: the source's tags followed by the target's own.
+
+        Args:
+            tags (list, optional): The source's tags.
+
+        Returns:
+            list: The combined tags without repeats.
+        """
+        return list(dict.fromkeys(list(tags or []) + self.tags))
+
+    def __repr__(self):
+        return f"ReadwiseTarget({self.name!r})"
+
+def readwise_targets(config):
+    """
+    Build the Readwise targets of a configuration.
+    
+    The readwise_targets list takes precedence; without it, the readwise_token
+    setting gives a single target named "default". Targets without a token are
+    skipped, as are targets repeating another target's token.
+    
+    Args:
+        config (dict): The configuration dictionary.
+    
+    Returns:
+        list: ReadwiseTarget objects (empty if Readwise is not configured).
+    """
+    entries = config.get('readwise_targets') or []
+    if not entries:
+        token = config.get('readwise_token')
+        return [ReadwiseTarget(DEFAULT_TARGET_NAME, token)] if token else []
+    
+    targets = []
+    tokens = {}
+    for index, entry in enumerate(entries):
+        name = entry.get('name') or f"target{index + 1}"
+        token = entry.get('token')
+        if not token:
+            logger.warning("Readwise target %s has no token; skipping it.", name)
+            continue
+        if token in tokens:
+            logger.warning("Readwise target %s uses the same token as %s; skipping it.", name, tokens[token])
+            continue
+        tokens[token] = name
+        targets.append(ReadwiseTarget(name, token, entry.get('tags')))
+    return targets
 
 def load_config(config_path="config.json"):
     """
-    Load configuration from a JSON file.
+    Load configuration through the shared configuration service.
+    
+    The merged configuration is cached, so repeated calls only check the
+    file's modification time instead of re-reading it.
     
     Args:
         config_path (str): Path to the configuration file.
     
     Returns:
-        dict: Configuration settings or empty dict if failed.
+        dict: Configuration settings (defaults if the file is missing).
     """
+    service = get_config_service(config_path)
+    if not service.exists():
+        logger.info("Config file %s not found. Using default settings.", config_path)
+    return service.get()
+
+def readwise_date(value):
+    """Return a metadata date if it is a full ISO date Readwise accepts, otherwise None."""
+    # strptime also accepts unpadded fields such as "2025-3-9", which the length check rules out
+    if not isinstance(value, str) or len(value) != 10:
+        return None
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Config file {config_path} not found. Using default settings.")
-        return {}
-    except json.JSONDecodeError:
-        print(f"Error parsing config file {config_path}. Using default settings.")
-        return {}
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return value
 
-def save_config(config, config_path="config.json"):
+def build_readwise_payload(url, title=None, author=None, tags=None, published_date=None):
     """
-    Save configuration to a JSON file.
+    Build the request body for the Readwise Reader save endpoint.
     
     Args:
-        config (dict): Configuration settings.
-        config_path (str): Path to save the configuration file.
+        url (str): The document's unique URL.
+        title (str, optional): The document's title.
+        author (str, optional): The document's author.
+        tags (list of str, optional): Tags for the document; derived from the domain if empty.
+        published_date (str, optional): The document's publication date (ISO 8601).
+    
+    Returns:
+        dict: The JSON payload.
     """
-    try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=4)
-        print(f"Configuration saved to {config_path}")
-    except Exception as e:
-        print(f"Error saving configuration: {e}")
+    # Extract domain for auto-tagging if no tags provided
+    if not tags:
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc
+        if domain:
+            tags = [domain.split('.')[-2]] if len(domain.split('.')) > 1 else []
+
+    # Payload with required and optional fields
+    payload = {'url': url}
+    if title:
+        payload['title'] = title
+    if author:
+        payload['author'] = author
+    if tags:
+        payload['tags'] = tags
+    if published_date:
+        payload['published_date'] = published_date
+    return payload
 
-def add_document_to_readwise(url, title=None, author=None, tags=None, access_token=None):
+def add_document_to_readwise(url, title=None, author=None, tags=None, access_token=None, published_date=None,
+                             target=None):
     """
     Adds a document to Readwise Reader.
 
@@ -51,6 +166,8 @@ def add_document_to_readwise(url, title=None, author=None, tags=None, access_tok
         author (str, optional): The document's author.
         tags (list of str, optional): A list of tags for the document.
         access_token (str, optional): Readwise access token. If None, loads from config.
+        published_date (str, optional): The document's publication date (ISO 8601).
+        target (str, optional): Name of the account's target; requests for each target are limited separately.
 
     Returns:
         dict: The response from the Readwise API or None if failed.
@@ -61,11 +178,17 @@ def add_document_to_readwise(url, title=None, author=None, tags=None, access_tok
         access_token = config.get('readwise_token')
         
     if not access_token:
-        print("No Readwise access token provided or found in config.")
+        logger.error("No Readwise access token provided or found in config.")
         return None
 
-    # Endpoint URL
-    api_url = 'https://readwise.io/api/v3/save/'
+    # Concurrent saves of the same URL to the same account share one request
+    return _readwise_flight.do(
+        (access_token, url), _save_document, url, title, author, tags, access_token, published_date, target
+    )
+
+def _save_document(url, title, author, tags, access_token, published_date=None, target=None):
+    """POST a single document to the Readwise Reader save endpoint."""
+    api_url = READWISE_SAVE_URL
 
     # Headers for authentication
     headers = {
@@ -73,25 +196,11 @@ def add_document_to_readwise(url, title=None, author=None, tags=None, access_tok
         'Content-Type': 'application/json'
     }
 
-    # Extract domain for auto-tagging if no tags provided
-    if not tags:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        if domain:
-            tags = [domain.split('.')[-2]] if len(domain.split('.')) > 1 else []
-
-    # Payload with required and optional fields
-    payload = {'url': url}
-    if title:
-        payload['title'] = title
-    if author:
-        payload['author'] = author
-    if tags:
-        payload['tags'] = tags
+    payload = build_readwise_payload(url, title, author, tags, published_date)
 
     try:
         # Make the POST request to add the document
-        response = requests.post(api_url, headers=headers, json=payload)
+        response = limited_request('POST', api_url, limiter_scope=target, headers=headers, json=payload)
 
         # Check for successful request
         if response.status_code in [200, 201]:
@@ -99,13 +208,14 @@ def add_document_to_readwise(url, title=None, author=None, tags=None, access_tok
         else:
             response.raise_for_status()
     except requests.exceptions.HTTPError as err:
-        print(f"HTTP Error adding document to Readwise: {err}")
+        logger.warning("HTTP Error adding document to Readwise: %s", err)
         return None
     except requests.exceptions.RequestException as err:
-        print(f"Error adding document to Readwise: {err}")
+        logger.warning("Error adding document to Readwise: %s", err)
         return None
 
-def add_articles_to_readwise(archive_urls, titles=None, author=None, tags=None, access_token=None):
+def add_articles_to_readwise(archive_urls, titles=None, author=None, tags=None, access_token=None,
+                             authors=None, published_dates=None):
     """
     Add multiple articles to Readwise Reader.
     
@@ -115,34 +225,166 @@ def add_articles_to_readwise(archive_urls, titles=None, author=None, tags=None,
         author (str, optional): Author name to use for all articles.
         tags (list, optional): List of tags to apply to all articles.
         access_token (str, optional): Readwise access token.
+        authors (list, optional): List of per-article authors corresponding to the URLs;
+                                  entries that are None fall back to author.
+        published_dates (list, optional): List of publication dates (ISO 8601) corresponding to the URLs.
     
     Returns:
         list: List of successful additions (responses from the Readwise API).
     """
     successful_additions = []
+    submitted = set()
     
     for i, url in enumerate(archive_urls):
         title = titles[i] if titles and i < len(titles) else None
+        article_author = (authors[i] if authors and i < len(authors) else None) or author
+        published_date = published_dates[i] if published_dates and i < len(published_dates) else None
         
-        print(f"Adding to Readwise: {url}")
-        response = add_document_to_readwise(url, title, author, tags, access_token)
+        if url in submitted:
+            logger.debug("Skipping duplicate: %s", url)
+            continue
+        submitted.add(url)
+        
+        logger.debug("Adding to Readwise: %s", url)
+        response = add_document_to_readwise(url, title, article_author, tags, access_token, published_date)
         
         if response:
-            print(f"Successfully added to Readwise: {url}")
+            logger.debug("Successfully added to Readwise: %s", url)
             successful_additions.append(response)
         else:
-            print(f"Failed to add to Readwise: {url}")
+            logger.warning("Failed to add to Readwise: %s", url)
     
     return successful_additions
 
-def set_readwise_token(token, config_path="config.json"):
+def submit_archive_result(result, tags=None, access_token=None, submitted=None, store=None):
     """
-    Set the Readwise API token in the configuration.
+    Add one successfully archived article to Readwise Reader.
+    
+    The title, author and publication date come from the result's article record,
+    and the result's readwise attribute is set to the outcome.
     
     Args:
-        token (str): The Readwise API token.
-        config_path (str): Path to the configuration file.
+        result (ArchiveResult): The archive result; failed results are skipped.
+        tags (list, optional): List of tags to apply to the article.
+        access_token (str, optional): Readwise access token.
+        submitted (dict, optional): Outcomes of earlier submissions in the same batch, keyed
+                                    by archive URL; URLs already added are reported as duplicates.
+        store (ResultsStore, optional): Results store the outcome is recorded in.
+    
+    Returns:
+        ReadwiseResult: The outcome, or None if the article was not archived.
+    """
+    if not result.ok:
+        return None
+    
+    result.readwise = _submit_document(result, tags, access_token, submitted)
+    if store:
+        store.add_readwise_result(result)
+    return result.readwise
+
+def _submit_document(result, tags, access_token, submitted=None, target=None):
+    """Submit an archived article to one account, skipping URLs submitted already added."""
+    url = result.archive_url
+    # Only a save that succeeded makes a repeat a duplicate; a failed one is tried again
+    if submitted is not None and url in submitted and submitted[url].status == ReadwiseResult.ADDED:
+        logger.debug("Skipping duplicate: %s", url)
+        return ReadwiseResult(url, ReadwiseResult.DUPLICATE, submitted[url].response, target=target)
+    
+    article = result.article
+    logger.debug("Adding to Readwise: %s", url)
+    response = add_document_to_readwise(
+        url, article.title, article.author, tags, access_token, readwise_date(article.date), target
+    )
+    
+    if response:
+        logger.debug("Successfully added to Readwise: %s", url)
+        outcome = ReadwiseResult(url, ReadwiseResult.ADDED, response, target=target)
+    else:
+        where = f" ({target})" if target and target != DEFAULT_TARGET_NAME else ""
+        logger.warning("Failed to add to Readwise%s: %s", where, url)
+        outcome = ReadwiseResult(url, ReadwiseResult.FAILED, error="Readwise request failed", target=target)
+    if submitted is not None:
+        submitted[url] = outcome
+    return outcome
+
+def submit_to_targets(result, targets, tags=None, submitted=None, store=None):
+    """
+    Add one successfully archived article to every Readwise target at once.
+    
+    The result's readwise_targets attribute is set to the outcome for each target,
+    and its readwise attribute to the combined outcome: failed if any target
+    failed, added if any target added it, and otherwise duplicate.
+    
+    Args:
+        result (ArchiveResult): The archive result; failed results are skipped.
+        targets (list): ReadwiseTarget objects.
+        tags (list, optional): The source's tags; each target adds its own.
+        submitted (dict, optional): Outcomes of earlier submissions in the same batch, keyed by
+                                    target name and then archive URL; URLs already added
+                                    are reported as duplicates.
+        store (ResultsStore, optional): Results store the outcomes are recorded in.
+    
+    Returns:
+        dict: ReadwiseResult for each target name, or None if the article was not archived.
+    """
+    if not result.ok or not targets:
+        return None
+    
+    # Submissions run on other threads, so they get the caller's remaining time explicitly
+    left = deadline.remaining()
+    def submit(target):
+        with deadline.budget(left):
+            target_submitted = submitted.setdefault(target.name, {}) if submitted is not None else None
+            return _submit_document(result, target.document_tags(tags), target.token, target_submitted, target.name)
+    
+    if len(targets) == 1:
+        outcomes = [submit(targets[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            outcomes = list(executor.map(submit, targets))
+    
+    result.readwise_targets = {target.name: outcome for target, outcome in zip(targets, outcomes)}
+    result.readwise = _combined_outcome(result.archive_url, outcomes)
+    if store:
+        store.add_readwise_result(result)
+    return result.readwise_targets
+
+def _combined_outcome(url, outcomes):
+    """Combine the outcomes of submitting one document to several targets."""
+    if len(outcomes) == 1:
+        return outcomes[0]
+    failed = [outcome.target for outcome in outcomes if outcome.status == ReadwiseResult.FAILED]
+    if failed:
+        return ReadwiseResult(url, ReadwiseResult.FAILED, error=f"Readwise request failed for {', '.join(failed)}")
+    added = [outcome for outcome in outcomes if outcome.ok]
+    if added:
+        return ReadwiseResult(url, ReadwiseResult.ADDED, added[0].response)
+    return ReadwiseResult(url, ReadwiseResult.DUPLICATE, outcomes[0].response)
+
+def submit_to_readwise(archive_results, tags=None, access_token=None, store=None):
+    """
+    Add successfully archived articles to Readwise Reader.
+    
+    Titles, authors and publication dates come from each result's article record.
+    Each result's readwise attribute is set to the outcome of its submission.
+    
+    Args:
+        archive_results (list): ArchiveResult objects; failed results are skipped.
+        tags (list, optional): List of tags to apply to all articles.
+        access_token (str, optional): Readwise access token.
+        store (ResultsStore, optional): Results store each outcome is recorded in.
+    
+    Returns:
+        list: One ReadwiseResult per archived article, in order.
     """
-    config = load_config(config_path)
-    config['readwise_token'] = token
-    save_config(config, config_path) 
\ No newline at end of file
+    readwise_results = []
+    submitted = {}
+    
+    for result in archive_results:
+        readwise_result = submit_archive_result(result, tags, access_token, submitted, store)
+        if readwise_result:
+            readwise_results.append(readwise_result)
+    
+    if store:
+        store.flush()
+    return readwise_results
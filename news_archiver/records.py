@@ -0,0 +1,135 @@
+"""
+Compact record types describing articles and the outcome of each pipeline stage.
+
+The records use __slots__ so large runs (tens of thousands of articles) keep a
+small memory footprint, and they are what the library API returns instead of
+bare lists of strings.
+"""
+
+class _Record:
+    """Base class giving slotted records keyword construction, equality and dict conversion."""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the record's fields as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class ArticleRecord(_Record):
+    """An article found in an issue, with the metadata captured while scraping."""
+
+    __slots__ = ('url', 'title', 'author', 'section', 'date', 'source', 'issue')
+
+    def __init__(self, url, title=None, author=None, section=None, date=None, source=None, issue=None):
+        self.url = url
+        self.title = title
+        self.author = author
+        self.section = section
+        self.date = date
+        self.source = source
+        self.issue = issue
+
+    @classmethod
+    def coerce(cls, value, source=None):
+        """
+        Build a record from a URL string, a metadata dict or an existing record.
+
+        Args:
+            value (str, dict or ArticleRecord): The article.
+            source (str, optional): Source name used when the value does not carry one.
+
+        Returns:
+            ArticleRecord: The article record.
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            fields = {name: value.get(name) for name in cls.__slots__}
+            fields['source'] = fields['source'] or source
+            return cls(**fields)
+        return cls(value, source=source)
+
+class ArchiveResult(_Record):
+    """The outcome of archiving one article."""
+
+    __slots__ = ('article', 'archive_url', 'status', 'error', 'readwise', 'readwise_targets')
+
+    # Status values
+    CAPTURED = 'captured'
+    REUSED = 'reused'
+    FAILED = 'failed'
+    # archive.today kept blocking requests (challenge pages or rate limits) for too long
+    BLOCKED = 'blocked'
+    # The article's time budget or the run deadline ran out
+    TIMED_OUT = 'timed_out'
+    # archive.today is still capturing the article; the result is updated once it finishes
+    PENDING = 'pending'
+    # Every snapshot found failed verification
+    INVALID = 'invalid'
+
+    def __init__(self, article, archive_url=None, status=None, error=None, readwise=None, readwise_targets=None):
+        """
+        Args:
+            article (ArticleRecord): The archived article.
+            archive_url (str, optional): The final archive URL.
+            status (str, optional): One of CAPTURED, REUSED, FAILED, BLOCKED, TIMED_OUT, PENDING
+                                    or INVALID.
+                                    Derived from archive_url when omitted.
+            error (str, optional): Why archiving failed.
+            readwise (ReadwiseResult, optional): Outcome of the Readwise submission (combined over all
+                                                 targets when there are several).
+            readwise_targets (dict, optional): Outcome of the submission to each Readwise target, by target name.
+        """
+        self.article = article
+        self.archive_url = archive_url
+        self.status = status or (self.CAPTURED if archive_url else self.FAILED)
+        self.error = error
+        self.readwise = readwise
+        self.readwise_targets = readwise_targets
+
+    @property
+    def ok(self):
+        """True if the article has an archive URL."""
+        return self.archive_url is not None
+
+    @property
+    def article_url(self):
+        """URL of the original article."""
+        return self.article.url
+
+class ReadwiseResult(_Record):
+    """The outcome of submitting one document to Readwise Reader."""
+
+    __slots__ = ('url', 'status', 'response', 'error', 'target')
+
+    # Status values
+    ADDED = 'added'
+    DUPLICATE = 'duplicate'
+    FAILED = 'failed'
+
+    def __init__(self, url, status, response=None, error=None, target=None):
+        """
+        Args:
+            url (str): The submitted document URL.
+            status (str): One of ADDED, DUPLICATE or FAILED.
+            response (dict, optional): The Readwise API response.
+            error (str, optional): Why the submission failed.
+            target (str, optional): Name of the Readwise target the document was submitted to.
+        """
+        self.url = url
+        self.status = status
+        self.response = response
+        self.error = error
+        self.target = target
+
+    @property
+    def ok(self):
+        """True if Readwise accepted the document."""
+        return self.status == self.ADDED
@@ -0,0 +1,168 @@
+"""
+Module for scheduling article jobs fairly across news sources.
+
+Jobs from every source share one worker pool. Each source has a weight and a
+concurrency limit; the scheduler interleaves sources by weighted fair
+queueing, so a slow or throttled source only ever occupies its own slots
+instead of stalling the sources queued behind it. Within the pool, jobs in a
+higher-priority lane (e.g. cover stories) are always dispatched first.
+"""
+import heapq
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, dispatched in this order
+LANE_PRIORITY = 0
+LANE_NORMAL = 1
+LANE_BACKGROUND = 2
+
+class _Job:
+    """A queued call and, once it has run, its outcome."""
+
+    __slots__ = ('source', 'lane', 'seq', 'fn', 'args', 'kwargs', 'result')
+
+    def __init__(self, source, lane, seq, fn, args, kwargs):
+        self.source = source
+        self.lane = lane
+        self.seq = seq
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+
+    def __lt__(self, other):
+        return (self.lane, self.seq) < (other.lane, other.seq)
+
+class _SourceQueue:
+    """Pending jobs and scheduling state of one source."""
+
+    def __init__(self, name, weight, concurrency):
+        self.name = name
+        self.weight = weight
+        self.concurrency = concurrency
+        self.jobs = []
+        self.running = 0
+        self.virtual_time = 0.0
+
+class FairScheduler:
+    """
+    Run jobs from several sources on a shared thread pool with weighted fair queueing.
+
+    Each dispatch advances the source's virtual time by 1/weight; the next job
+    comes from the highest-priority lane, and within that lane from the
+    eligible source with the smallest virtual time. A source is eligible while
+    it has fewer than its concurrency limit of jobs running.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers (int): Maximum number of jobs running at once across all sources.
+        """
+        self.max_workers = max(1, max_workers)
+        self._sources = {}
+        self._jobs = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+
+    def add_source(self, name, weight=1, concurrency=1):
+        """
+        Register a source, or update its weight and concurrency limit.
+
+        Args:
+            name (str): Source name.
+            weight (float): Relative share of dispatches the source receives when others are busy too.
+            concurrency (int): Maximum number of the source's jobs running at once.
+        """
+        queue = self._sources.get(name)
+        if queue is None:
+            queue = self._sources[name] = _SourceQueue(name, weight, concurrency)
+        queue.weight = weight if weight and weight > 0 else 1
+        queue.concurrency = max(1, concurrency or 1)
+
+    def submit(self, source, fn, *args, lane=LANE_NORMAL, **kwargs):
+        """
+        Queue fn(*args, **kwargs) as a job of a source.
+
+        Jobs of one source in the same lane run in submission order.
+
+        Args:
+            source (str): Source name (registered with default settings if unknown).
+            fn (callable): The job.
+            *args: Positional arguments for fn.
+            lane (int): Priority lane, e.g. LANE_PRIORITY or LANE_NORMAL.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            int: Index of the job in the list returned by run().
+        """
+        if source not in self._sources:
+            self.add_source(source)
+        job = _Job(source, lane, next(self._seq), fn, args, kwargs)
+        heapq.heappush(self._sources[source].jobs, job)
+        self._jobs.append(job)
+        return len(self._jobs) - 1
+
+    def _next_job(self):
+        """Pop the next job to dispatch, or return None if no source may run one now."""
+        best = None
+        for queue in self._sources.values():
+            if not queue.jobs or queue.running >= queue.concurrency:
+                continue
+            key = (queue.jobs[0].lane, max(queue.virtual_time, self._virtual_time))
+            if best is None or key < best[0]:
+                best = (key, queue)
+        if best is None:
+            return None
+
+        (_, start), queue = best
+        self._virtual_time = start
+        queue.virtual_time = start + 1.0 / queue.weight
+        queue.running += 1
+        return heapq.heappop(queue.jobs)
+
+    def run(self):
+        """
+        Run every queued job and wait for all of them.
+
+        If a job raises, no further jobs are started and the exception is
+        re-raised once the running jobs have finished.
+
+        Returns:
+            list: The jobs' return values, in submission order.
+        """
+        jobs = self._jobs
+        self._jobs = []
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while True:
+                while error is None and len(running) < self.max_workers:
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    running[executor.submit(job.fn, *job.args, **job.kwargs)] = job
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self._sources[job.source].running -= 1
+                    try:
+                        job.result = future.result()
+                    except Exception as e:
+                        logger.error("Job for %s failed: %s", job.source, e)
+                        error = error or e
+
+        if error is not None:
+            for queue in self._sources.values():
+                queue.jobs = []
+            raise error
+        return [job.result for job in jobs]
@@ -2,19 +2,244 @@
 Package for news source scrapers.
 """
 
+import os
+import logging
 from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+import requests
+from news_archiver.metadata import ArticleMetadataIndex, METADATA_FILE
+from news_archiver.records import ArticleRecord
+from news_archiver.memo import extraction_cache
+from news_archiver.throttle import pooled_session
+from news_archiver.deadline import request_timeout
+
+logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
     """Base class for news source scrapers."""
     
-    def __init__(self, output_path=None):
+    # Name of the source, as used in the configuration
+    source_name = None
+    # Version of the page extractors; bump it whenever parsing changes to invalidate cached results
+    extractor_version = 1
+    # Headers sent when checking whether an issue page exists
+    request_headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    
+    def __init__(self, output_path=None, seen_index=None, issue_history=None):
         """
         Initialize the scraper.
         
         Args:
             output_path (str, optional): Directory to save output files.
+            seen_index (SeenUrlIndex, optional): Index of article URLs already processed
+                                                 by earlier runs or scheduled by another source.
+            issue_history (IssueHistory, optional): Article sets of the issues processed before,
+                                                    used to only schedule articles added since.
         """
         self.output_path = output_path
+        self.seen_index = seen_index
+        self.issue_history = issue_history
+        # How the selected issue changed since it was last processed
+        self.issue_delta = None
+        self.selected_issue = None
+        # Issue names mapped to their page URLs
+        self.issue_urls = {}
+        # Metadata (title, author, section, date) of the extracted articles, keyed by URL
+        self.article_metadata = {}
+    
+    def save_article_metadata(self):
+        """
+        Record the metadata captured while extracting links in the sidecar index.
+        
+        Returns:
+            str: Path of the metadata index or None if there was nothing to save.
+        """
+        if not self.article_metadata or not self.output_path:
+            return None
+        
+        index_path = os.path.join(self.output_path, METADATA_FILE)
+        ArticleMetadataIndex(index_path).update(
+            self.article_metadata.values(),
+            source=self.source_name,
+            issue=self.selected_issue
+        )
+        return index_path
+    
+    @classmethod
+    def normalize_issue(cls, issue):
+        """
+        Return a stable identifier of an issue, however it was named.
+        
+        Args:
+            issue (str): The issue name.
+        
+        Returns:
+            str: The identifier the issue history is keyed by.
+        """
+        return issue
+    
+    def issue_key(self):
+        """Return a stable identifier of the selected issue, however it was named."""
+        return self.normalize_issue(self.selected_issue)
+    
+    def issue_from_template(self, issue):
+        """
+        Map an issue name or date straight to its page URL, if the source's URLs follow a pattern.
+        
+        Args:
+            issue (str): The issue as given by the user (e.g. "April 2025" or "2025-03-29").
+        
+        Returns:
+            tuple: (issue name, URL), or None if the issue cannot be mapped.
+        """
+        return None
+    
+    def resolve_issue(self, issue):
+        """
+        Find an issue's page URL without downloading the issue listing.
+        
+        The URL built from the source's pattern is checked with a HEAD request;
+        if the page does not exist (or redirects elsewhere), the caller falls back
+        to the listing.
+        
+        Args:
+            issue (str): The issue as given by the user.
+        
+        Returns:
+            str: The issue's URL, or None if it could not be resolved this way.
+        """
+        candidate = self.issue_from_template(issue)
+        if not candidate:
+            return None
+        issue_name, url = candidate
+        if not self.issue_page_exists(url):
+            logger.info("No issue page at %s; looking %s up in the issue list.", url, issue)
+            return None
+        logger.info("Resolved %s to %s", issue_name, url)
+        self.selected_issue = issue_name
+        self.issue_urls.setdefault(issue_name, url)
+        return url
+    
+    def issue_page_exists(self, url):
+        """
+        Check cheaply whether a page exists at a URL.
+        
+        Sends a HEAD request (or, where HEAD is not allowed, a GET whose body is
+        not read) and requires a successful response that was not redirected to
+        a different page.
+        
+        Args:
+            url (str): The page URL.
+        
+        Returns:
+            bool: True if the page exists.
+        """
+        session = pooled_session()
+        try:
+            response = session.head(url, headers=self.request_headers, allow_redirects=True, timeout=request_timeout())
+            if response.status_code in (405, 501):
+                response = session.get(url, headers=self.request_headers, stream=True, timeout=request_timeout())
+            response.close()
+        except requests.exceptions.RequestException as e:
+            logger.debug("Could not check %s: %s", url, e)
+            return False
+        if not response.ok:
+            return False
+        return urlsplit(response.url).path.rstrip('/') == urlsplit(url).path.rstrip('/')
+    
+    def filter_new_links(self, links):
+        """
+        Drop duplicate and already-seen article links before they are archived.
+        
+        With an issue history, only the articles added to the issue since it was
+        last processed are kept, and articles removed from it are reported.
+        
+        Args:
+            links (list): Canonical article URLs.
+        
+        Returns:
+            list: Article URLs that have not been seen before, in order.
+        """
+        unique_links = list(dict.fromkeys(link for link in links if link))
+        if self.issue_history is not None and self.issue_key() and unique_links:
+            unique_links = self._issue_changes(unique_links)
+        if self.seen_index is None:
+            return unique_links
+        
+        new_links = self.seen_index.filter_new(unique_links)
+        skipped = len(unique_links) - len(new_links)
+        if skipped:
+            logger.info("Skipping %s articles that were already archived.", skipped)
+        return new_links
+    
+    def _issue_changes(self, links):
+        """Diff the issue's articles against its history, report the changes and return the added links."""
+        delta = self.issue_history.diff(self.source_name, self.issue_key(), links)
+        self.issue_delta = delta
+        if delta.first_run:
+            return delta.added
+        if delta.removed and not delta.added:
+            # Nothing is left to process, so drop the removed articles from the history now
+            self.issue_history.record(self.source_name, self.issue_key(), [])
+        if not delta.changed:
+            logger.info("No articles were added to or removed from %s since the last run.", self.selected_issue)
+        else:
+            logger.info("%s changed since the last run: %d articles added, %d removed, %d unchanged.",
+                        self.selected_issue, len(delta.added), len(delta.removed), len(delta.unchanged))
+        for link in delta.removed:
+            logger.warning("Article removed from %s: %s", self.selected_issue, link)
+        return delta.added
+    
+    def memoized_extraction(self, kind, html, extract):
+        """
+        Extract data from a page, reusing the cached result for identical HTML.
+        
+        Args:
+            kind (str): Name of the extraction (e.g. "issue_page").
+            html (str): The page HTML.
+            extract (callable): Function computing a JSON-serializable result from the HTML.
+        
+        Returns:
+            The extraction result.
+        """
+        namespace = f"{self.source_name}.{kind}.v{self.extractor_version}"
+        return extraction_cache.memoize(namespace, html, extract)
+    
+    def memoized_file_extraction(self, kind, html_path, extract):
+        """
+        Extract data from a saved page, reusing the cached result for identical content.
+        
+        The page is hashed in chunks, so extract only reads it on a cache miss.
+        
+        Args:
+            kind (str): Name of the extraction (e.g. "issue_page").
+            html_path (str): Path to the saved page.
+            extract (callable): Function computing a JSON-serializable result from the file path.
+        
+        Returns:
+            The extraction result.
+        """
+        namespace = f"{self.source_name}.{kind}.v{self.extractor_version}"
+        return extraction_cache.memoize_file(namespace, html_path, extract)
+    
+    def article_records(self, links):
+        """
+        Build article records for extracted links from the metadata captured while scraping.
+        
+        Args:
+            links (list): Canonical article URLs.
+        
+        Returns:
+            list: ArticleRecord objects, in the order of the links.
+        """
+        records = []
+        for link in links:
+            record = ArticleRecord.coerce(self.article_metadata.get(link) or link, self.source_name)
+            record.issue = record.issue or self.selected_issue
+            records.append(record)
+        return records
     
     @abstractmethod
     def scrape(self):
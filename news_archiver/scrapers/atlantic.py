@@ -3,10 +3,29 @@ Module for scraping articles from The Atlantic magazine.
 """
 import os
 import re
+import json
 import requests
 from bs4 import BeautifulSoup
 import time
+import logging
 from news_archiver.scrapers import BaseScraper
+from news_archiver.scrapers.links import iter_anchors, iter_file_chunks, CHUNK_SIZE
+from news_archiver.scrapers.structured_data import (
+    extract_next_data, extract_json_ld, json_ld_articles, article_metadata, embedded_scripts
+)
+from news_archiver.urls import canonicalize_url
+from news_archiver.profiling import profiled
+from news_archiver.deadline import request_timeout
+from news_archiver.prefetch import prefetcher
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+# Issue names such as "April 2025" or "Apr 2025", and dates such as "2025-04"
+ISSUE_NAME_PATTERN = re.compile(r'^([A-Za-z]{3,9})\.?\s+(\d{4})$')
+ISSUE_DATE_PATTERN = re.compile(r'^(\d{4})-(\d{1,2})(?:-\d{1,2})?$')
+
+logger = logging.getLogger(__name__)
 
 def create_directory(dir_path):
     """Create directory if it doesn't exist."""
@@ -16,7 +35,11 @@ def create_directory(dir_path):
 class AtlanticScraper(BaseScraper):
     """Scraper for The Atlantic magazine."""
     
-    def __init__(self, output_path="data/atlantic", selected_issue=None):
+    source_name = "atlantic"
+    # File the downloaded issue page is saved to, inside output_path
+    issue_file = "atlantic_issue.html"
+    
+    def __init__(self, output_path="data/atlantic", selected_issue=None, seen_index=None, issue_history=None):
         """
         Initialize the Atlantic scraper.
         
@@ -24,13 +47,16 @@ class AtlanticScraper(BaseScraper):
             output_path (str): Directory to save output files.
             selected_issue (str, optional): Specific issue to scrape (e.g., "April 2025").
                                            If None, will prompt for selection.
+            seen_index (SeenUrlIndex, optional): Index used to skip articles already processed.
+            issue_history (IssueHistory, optional): History used to only schedule articles added to the issue.
         """
-        super().__init__(output_path)
+        super().__init__(output_path, seen_index, issue_history)
         create_directory(self.output_path)
         self.backissues_url = "https://www.theatlantic.com/magazine/backissues/"
         self.selected_issue = selected_issue
         self.issue_urls = {}
     
+    @profiled('get_available_issues')
     def get_available_issues(self):
         """
         Get a list of available magazine issues from the backissues page.
@@ -43,108 +69,160 @@ class AtlanticScraper(BaseScraper):
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
             
-            print(f"Fetching magazine issues from {self.backissues_url}...")
-            response = requests.get(self.backissues_url, headers=headers)
+            logger.info("Fetching magazine issues from %s...", self.backissues_url)
+            response = requests.get(self.backissues_url, headers=headers, timeout=request_timeout())
             response.raise_for_status()
             
             # Save the HTML content for debugging
             debug_path = os.path.join(self.output_path, "backissues_debug.html")
             with open(debug_path, "w", encoding="utf-8") as file:
                 file.write(response.text)
-            print(f"Saved debug HTML to {debug_path}")
+            logger.debug("Saved debug HTML to %s", debug_path)
             
-            soup = BeautifulSoup(response.content, "html.parser")
+            issue_links = self.parse_issue_links(response.text)
             
-            # The backissues page has each issue in the layout
-            issue_links = {}
+            self.issue_urls = issue_links
             
-            # Try to find the issue links based on what we know about the page structure
-            # Look for links containing month names which are likely to be issue links
-            month_patterns = ['January', 'February', 'March', 'April', 'May', 'June', 
-                             'July', 'August', 'September', 'October', 'November', 'December',
-                             'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+            if issue_links:
+                logger.info("Found %s issues.", len(issue_links))
+            else:
+                logger.warning("No issues found. The website structure may have changed.")
+                
+            return issue_links
             
-            # First, try to find all issues the standard way
+        except requests.exceptions.RequestException as e:
+            logger.error("An error occurred while fetching backissues: %s", e)
+            return {}
+        except Exception as e:
+            logger.exception("An unexpected error occurred: %s", e)
+            return {}
+    
+    def issue_from_template(self, issue):
+        """
+        Map an issue name such as "April 2025" (or a date such as "2025-04") to its table of contents URL.
+        
+        Args:
+            issue (str): The issue name or date.
+        
+        Returns:
+            tuple: (issue name, URL), or None if the issue is not a single month.
+        """
+        issue = (issue or '').strip()
+        match = ISSUE_NAME_PATTERN.match(issue)
+        if match:
+            prefix = match.group(1).lower()
+            months = [number for number, name in enumerate(MONTH_NAMES, 1)
+                      if len(prefix) >= 3 and name.lower().startswith(prefix)]
+            if len(months) != 1:
+                return None
+            month, year = months[0], int(match.group(2))
+        else:
+            match = ISSUE_DATE_PATTERN.match(issue)
+            if not match:
+                return None
+            year, month = int(match.group(1)), int(match.group(2))
+            if not 1 <= month <= 12:
+                return None
+        return f"{MONTH_NAMES[month - 1]} {year}", f"https://www.theatlantic.com/magazine/toc/{year}/{month:02d}/"
+    
+    def parse_issue_links(self, html):
+        """
+        Parse the backissues page into issue links, reusing the cached result for an unchanged page.
+        
+        Args:
+            html (str): The backissues page HTML.
+        
+        Returns:
+            dict: Dictionary mapping issue names to their URLs.
+        """
+        return self.memoized_extraction('issue_list', html, self._parse_issue_links)
+    
+    def _parse_issue_links(self, html):
+        """
+        Parse the backissues page into issue links.
+        
+        Args:
+            html (str): The backissues page HTML.
+        
+        Returns:
+            dict: Dictionary mapping issue names to their URLs.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        
+        # The backissues page has each issue in the layout
+        issue_links = {}
+        
+        # Try to find the issue links based on what we know about the page structure
+        # Look for links containing month names which are likely to be issue links
+        month_patterns = ['January', 'February', 'March', 'April', 'May', 'June', 
+                         'July', 'August', 'September', 'October', 'November', 'December',
+                         'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        
+        # First, try to find all issues the standard way
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
+            text = link.text.strip()
+            
+            # Check if it's an issue link - either by URL pattern or by text content
+            if ('/magazine/archive/' in href or '/magazine/toc/' in href) and text:
+                # Check if the text contains a month name and a year (like "April 2023")
+                if any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
+                    issue_name = text.replace('Latest Issue', '').strip()
+                    full_url = href if href.startswith('http') else f"https://www.theatlantic.com{href}"
+                    issue_links[issue_name] = full_url
+        
+        # If no issues found, try a more aggressive approach by looking at all links
+        if not issue_links:
+            logger.info("No issues found with standard approach, trying alternative method...")
+            
+            # Find all links anywhere on the page that look like issue links
             for link in soup.find_all('a', href=True):
                 href = link.get('href', '')
                 text = link.text.strip()
                 
-                # Check if it's an issue link - either by URL pattern or by text content
-                if ('/magazine/archive/' in href or '/magazine/toc/' in href) and text:
-                    # Check if the text contains a month name and a year (like "April 2023")
-                    if any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
-                        issue_name = text.replace('Latest Issue', '').strip()
+                # Look for any link that mentions a month and year
+                if text and any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
+                    # Make sure it's an Atlantic URL
+                    if '/magazine/' in href:
+                        issue_name = text
                         full_url = href if href.startswith('http') else f"https://www.theatlantic.com{href}"
                         issue_links[issue_name] = full_url
+        
+        # If still no issues found, try an even more aggressive approach
+        if not issue_links:
+            logger.info("Still no issues found, trying pattern matching on text...")
             
-            # If no issues found, try a more aggressive approach by looking at all links
-            if not issue_links:
-                print("No issues found with standard approach, trying alternative method...")
-                
-                # Find all links anywhere on the page that look like issue links
-                for link in soup.find_all('a', href=True):
-                    href = link.get('href', '')
-                    text = link.text.strip()
-                    
-                    # Look for any link that mentions a month and year
-                    if text and any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
-                        # Make sure it's an Atlantic URL
-                        if '/magazine/' in href:
+            # Look for text nodes that match month/year patterns
+            for element in soup.find_all(text=True):
+                text = element.strip()
+                # Check if it looks like "Month Year"
+                if text and any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
+                    # Try to find a nearby link
+                    parent = element.parent
+                    if parent:
+                        nearby_link = parent.find('a', href=True)
+                        if nearby_link and '/magazine/' in nearby_link.get('href', ''):
+                            href = nearby_link.get('href', '')
                             issue_name = text
                             full_url = href if href.startswith('http') else f"https://www.theatlantic.com{href}"
                             issue_links[issue_name] = full_url
+        
+        # Manual fallback with known patterns if automatic detection fails
+        if not issue_links:
+            logger.info("Automatic detection failed, using manual fallback with known URLs...")
+            current_year = 2025  # Update this as needed
             
-            # If still no issues found, try an even more aggressive approach
-            if not issue_links:
-                print("Still no issues found, trying pattern matching on text...")
-                
-                # Look for text nodes that match month/year patterns
-                for element in soup.find_all(text=True):
-                    text = element.strip()
-                    # Check if it looks like "Month Year"
-                    if text and any(month in text for month in month_patterns) and any(str(year) in text for year in range(2000, 2030)):
-                        # Try to find a nearby link
-                        parent = element.parent
-                        if parent:
-                            nearby_link = parent.find('a', href=True)
-                            if nearby_link and '/magazine/' in nearby_link.get('href', ''):
-                                href = nearby_link.get('href', '')
-                                issue_name = text
-                                full_url = href if href.startswith('http') else f"https://www.theatlantic.com{href}"
-                                issue_links[issue_name] = full_url
-            
-            # Manual fallback with known patterns if automatic detection fails
-            if not issue_links:
-                print("Automatic detection failed, using manual fallback with known URLs...")
-                current_year = 2025  # Update this as needed
-                
-                # Generate URLs for the current and previous year's issues
-                for year in range(current_year-1, current_year+1):
-                    for month_num, month_name in enumerate(['January', 'February', 'March', 'April', 'May', 'June', 
-                                        'July', 'August', 'September', 'October', 'November', 'December'], 1):
-                        issue_name = f"{month_name} {year}"
-                        # Format month as 2 digits (01, 02, etc.)
-                        month_str = f"{month_num:02d}"
-                        url = f"https://www.theatlantic.com/magazine/toc/{year}/{month_str}/"
-                        issue_links[issue_name] = url
-            
-            self.issue_urls = issue_links
-            
-            if issue_links:
-                print(f"Found {len(issue_links)} issues.")
-            else:
-                print("No issues found. The website structure may have changed.")
-                
-            return issue_links
-            
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred while fetching backissues: {e}")
-            return {}
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            import traceback
-            traceback.print_exc()
-            return {}
+            # Generate URLs for the current and previous year's issues
+            for year in range(current_year-1, current_year+1):
+                for month_num, month_name in enumerate(['January', 'February', 'March', 'April', 'May', 'June', 
+                                    'July', 'August', 'September', 'October', 'November', 'December'], 1):
+                    issue_name = f"{month_name} {year}"
+                    # Format month as 2 digits (01, 02, etc.)
+                    month_str = f"{month_num:02d}"
+                    url = f"https://www.theatlantic.com/magazine/toc/{year}/{month_str}/"
+                    issue_links[issue_name] = url
+        
+        return issue_links
     
     def select_issue(self):
         """
@@ -153,11 +231,17 @@ class AtlanticScraper(BaseScraper):
         Returns:
             str: The URL of the selected issue.
         """
+        # A specific issue usually maps straight to its URL, without the listing
+        if self.selected_issue and not self.issue_urls:
+            issue_url = self.resolve_issue(self.selected_issue)
+            if issue_url:
+                return issue_url
+        
         if not self.issue_urls:
             self.get_available_issues()
         
         if not self.issue_urls:
-            print("No issues found to select from.")
+            logger.warning("No issues found to select from.")
             return None
             
         # If a specific issue was provided during initialization, use that
@@ -200,12 +284,17 @@ class AtlanticScraper(BaseScraper):
             
             issues_list.sort(key=get_sort_key)
         except Exception as e:
-            print(f"Error sorting issues: {e}")
+            logger.warning("Error sorting issues: %s", e)
             # If sorting fails, just continue with the unsorted list
         
         for i, issue in enumerate(issues_list):
             print(f"{i+1}. {issue}")
         
+        # Fetch the newest issues while the user decides
+        prefetcher.start([self.issue_urls[issue] for issue in issues_list], headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        })
+        
         while True:
             try:
                 selection = input("\nEnter the number of the issue to archive (or 'q' to quit): ")
@@ -223,6 +312,7 @@ class AtlanticScraper(BaseScraper):
             except ValueError:
                 print("Please enter a valid number.")
     
+    @profiled('download_issue_page')
     def download_issue_page(self, issue_url):
         """
         Download the HTML content from the selected issue's page.
@@ -233,83 +323,193 @@ class AtlanticScraper(BaseScraper):
         Returns:
             str: Path to the saved HTML file or None if failed.
         """
-        file_path = os.path.join(self.output_path, "atlantic_issue.html")
+        file_path = os.path.join(self.output_path, self.issue_file)
+        
+        # The page may already have been fetched while the user was choosing
+        content = prefetcher.take(issue_url)
+        if content is not None:
+            with open(file_path, "wb") as file:
+                file.write(content)
+            logger.info("Issue HTML content (prefetched) saved to %s", file_path)
+            return file_path
         
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
             
-            response = requests.get(issue_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write(str(soup))
+            # Stream the page to disk as served, without holding the body in memory;
+            # extraction reads it back from there
+            with requests.get(issue_url, headers=headers, stream=True, timeout=request_timeout()) as response:
+                response.raise_for_status()
+                with open(file_path, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
             
-            print(f"Issue HTML content downloaded and saved to {file_path}")
+            logger.info("Issue HTML content downloaded and saved to %s", file_path)
             return file_path
         
         except requests.exceptions.RequestException as e:
-            print(f"An error occurred while downloading issue: {e}")
+            logger.error("An error occurred while downloading issue: %s", e)
             return None
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            logger.error("An unexpected error occurred: %s", e)
             return None
     
-    def extract_article_tags(self, html_path):
+    def extract_embedded_articles(self, html):
         """
-        Extract article tags from the HTML file.
+        Read the issue's table of contents from the page's embedded data.
+        
+        The issue page is a Next.js app whose GraphQL cache (in __NEXT_DATA__)
+        holds the full table of contents; JSON-LD article lists are used if
+        that is missing.
         
         Args:
-            html_path (str): Path to the HTML file.
+            html (str): The issue page HTML.
         
         Returns:
-            str: Path to the saved article tags file or None if failed.
+            list: Article metadata dicts (url, title, author, section, date),
+                  or an empty list if the page carries no usable data.
         """
-        tags_path = os.path.join(self.output_path, "article_tags.txt")
+        articles = {}
         
+        data = extract_next_data(html)
         try:
-            with open(html_path, "r", encoding="utf-8") as file:
-                soup = BeautifulSoup(file.read(), "html.parser")
-            
-            # Try different approaches to find article content
-            article_tags = soup.find_all("article")
-            
-            # If no article tags found, try other common containers
-            if not article_tags:
-                # Look for divs with article-like classes
-                article_containers = soup.find_all(["div", "section"], class_=lambda c: c and any(
-                    term in c.lower() for term in ["article", "post", "content", "entry"]
-                ))
-                article_tags.extend(article_containers)
-            
-            # If still no article tags found, try with link elements that seem to be article links
-            if not article_tags:
-                article_links = soup.find_all("a", href=lambda h: h and "/magazine/archive/" in h)
-                article_tags.extend(article_links)
-            
-            with open(tags_path, "w", encoding="utf-8") as output_file:
-                for tag in article_tags:
-                    output_file.write(str(tag) + "\n")
+            cached_queries = data["props"]["pageProps"]["urqlState"].values()
+        except (KeyError, TypeError, AttributeError):
+            cached_queries = []
+        
+        for query in cached_queries:
+            try:
+                issue = json.loads(query["data"])["magazineIssue"]
+                sections = issue["toc"]["sections"]
+            except (KeyError, TypeError, ValueError):
+                continue
             
-            print(f"Article tags extracted and saved to {tags_path}")
-            return tags_path
+            for section in sections or []:
+                for item in section.get("items") or []:
+                    url = self._canonical_article_url(item.get("url"))
+                    if not url or url in articles:
+                        continue
+                    authors = [author.get("displayName") for author in item.get("authors") or [] if author.get("displayName")]
+                    articles[url] = article_metadata(
+                        url,
+                        item.get("title"),
+                        author=", ".join(authors),
+                        section=section.get("title"),
+                        date=self._issue_month(url)
+                    )
+        
+        # Fall back to any JSON-LD article list the page carries
+        if not articles:
+            for article in json_ld_articles(extract_json_ld(html)):
+                url = self._canonical_article_url(article['url'])
+                if url and url not in articles:
+                    article['url'] = url
+                    articles[url] = article
+        
+        return list(articles.values())
+    
+    def _canonical_article_url(self, href):
+        """
+        Canonicalize an href, keeping only magazine links.
         
+        Args:
+            href (str): Absolute or site-relative link.
+        
+        Returns:
+            str: The canonical article URL or None if it is not a magazine link.
+        """
+        url = canonicalize_url(href, base_url="https://www.theatlantic.com/", trailing_slash=True)
+        if url and url.startswith("https://www.theatlantic.com/magazine/"):
+            return url
+        return None
+    
+    def _issue_month(self, url):
+        """Return the issue month ("YYYY-MM") encoded in a magazine article URL."""
+        match = re.search(r'/magazine/archive/(\d{4})/(\d{2})/', url)
+        return f"{match.group(1)}-{match.group(2)}" if match else None
+    
+    def extract_embedded_article_links(self, html_path):
+        """
+        Extract article links from the issue page's embedded data.
+        
+        Args:
+            html_path (str): Path to the issue HTML file.
+        
+        Returns:
+            list: List of article links, or an empty list if the page has no usable data.
+        """
+        links_path = os.path.join(self.output_path, "articles.txt")
+        
+        try:
+            articles = self.memoized_file_extraction('embedded_articles', html_path, self._read_embedded_articles)
         except FileNotFoundError:
-            print(f"Error: HTML file {html_path} not found.")
-            return None
+            logger.error("Error: HTML file %s not found.", html_path)
+            return []
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            return None
+            logger.warning("Could not read embedded article data: %s", e)
+            return []
+        
+        if not articles:
+            return []
+        
+        self.article_metadata = {article['url']: article for article in articles}
+        article_links = list(self.article_metadata)
+        
+        with open(links_path, "w", encoding="utf-8") as output_file:
+            for link in article_links:
+                output_file.write(link + "\n")
+        
+        logger.info("Article links extracted from embedded data and saved to %s", links_path)
+        logger.info("Found %s article links.", len(article_links))
+        return article_links
     
-    def extract_article_links(self, tags_path):
+    def _read_embedded_articles(self, html_path):
+        """
+        Scan a saved issue page in chunks and extract the articles in its embedded data.
+        
+        Args:
+            html_path (str): Path to the issue HTML file.
+        
+        Returns:
+            list: Article metadata dicts, or an empty list if the page has none.
+        """
+        return self.extract_embedded_articles(embedded_scripts(iter_file_chunks(html_path)))
+    
+    def _stream_article_links(self, html_path):
+        """
+        Collect article links and their anchor text from a saved issue page.
+        
+        Args:
+            html_path (str): Path to the issue HTML file.
+        
+        Returns:
+            list: [link, title] pairs in page order.
+        """
+        in_articles, in_containers, elsewhere = {}, {}, {}
+        for anchor in iter_anchors(iter_file_chunks(html_path)):
+            link = self._canonical_article_url(anchor.href)
+            if not link:
+                continue
+            if anchor.in_article:
+                in_articles.setdefault(link, anchor.text)
+            elif anchor.in_container:
+                in_containers.setdefault(link, anchor.text)
+            elif "/magazine/archive/" in link:
+                elsewhere.setdefault(link, anchor.text)
+        return [[link, title] for link, title in (in_articles or in_containers or elsewhere).items()]
+    
+    def extract_streamed_article_links(self, html_path):
         """
-        Extract article links from the article tags file.
+        Extract article links by streaming the issue page's anchors.
+        
+        The page is read in chunks and tokenized without building a DOM. Links
+        inside <article> elements are preferred, then links inside article-like
+        containers, then any link to a magazine article.
         
         Args:
-            tags_path (str): Path to the article tags file.
+            html_path (str): Path to the issue HTML file.
         
         Returns:
             list: List of article links or empty list if failed.
@@ -317,49 +517,61 @@ class AtlanticScraper(BaseScraper):
         links_path = os.path.join(self.output_path, "articles.txt")
         
         try:
-            with open(tags_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Try different patterns to extract article links
-                links = re.findall(r'href=\"(https://www.theatlantic.com/magazine/archive/[^\'\" >]+)\"', content)
-                
-                # If no links found with the above pattern, try a more general one
-                if not links:
-                    links = re.findall(r'href=\"([^\'\" >]+?)\"', content)
-                    # Filter to only include Atlantic magazine links
-                    links = [link for link in links if 'theatlantic.com/magazine/' in link]
-                
-                # If links still empty, try once more with a very broad pattern
-                if not links:
-                    links = re.findall(r'(https://www.theatlantic.com/[^\'\" >]+)', content)
-                    # Filter to only include magazine links
-                    links = [link for link in links if '/magazine/' in link]
-            
-            # Ensure all links are properly formed
-            article_links = []
-            for link in set(links):
-                if not link.startswith('http'):
-                    link = f"https://www.theatlantic.com{link}" if link.startswith('/') else f"https://www.theatlantic.com/{link}"
-                article_links.append(link)
-            
-            with open(links_path, "w", encoding="utf-8") as output_file:
-                for link in article_links:
-                    output_file.write(link + "\n")
-            
-            print(f"Article links extracted and saved to {links_path}")
-            if not article_links:
-                print("No article links found. The website structure may have changed.")
-            else:
-                print(f"Found {len(article_links)} article links.")
-                
-            return article_links
-        
+            # An unchanged page reuses the links and titles streamed last time
+            titles = dict(self.memoized_file_extraction('streamed_links', html_path, self._stream_article_links))
         except FileNotFoundError:
-            print(f"Error: Tags file {tags_path} not found.")
+            logger.error("Error: HTML file %s not found.", html_path)
             return []
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            logger.error("An unexpected error occurred: %s", e)
             return []
+        
+        article_links = list(titles)
+        for link in article_links:
+            if link not in self.article_metadata:
+                self.article_metadata[link] = article_metadata(link, titles[link], date=self._issue_month(link))
+        
+        with open(links_path, "w", encoding="utf-8") as output_file:
+            for link in article_links:
+                output_file.write(link + "\n")
+        
+        logger.info("Article links extracted and saved to %s", links_path)
+        if not article_links:
+            logger.warning("No article links found. The website structure may have changed.")
+        else:
+            logger.info("Found %s article links.", len(article_links))
+        
+        return article_links
+    
+    def extract_article_tags(self, html_path):
+        """
+        Kept for callers of the earlier two-step extraction.
+        
+        The article tags are no longer written to a file; the saved page itself
+        is what extract_article_links streams.
+        
+        Args:
+            html_path (str): Path to the HTML file.
+        
+        Returns:
+            str: The path to pass to extract_article_links, or None if the file does not exist.
+        """
+        if not os.path.exists(html_path):
+            logger.error("Error: HTML file %s not found.", html_path)
+            return None
+        return html_path
+    
+    def extract_article_links(self, tags_path):
+        """
+        Kept for callers of the earlier two-step extraction; see extract_streamed_article_links.
+        
+        Args:
+            tags_path (str): Path returned by extract_article_tags (or any HTML file).
+        
+        Returns:
+            list: List of article links or empty list if failed.
+        """
+        return self.extract_streamed_article_links(tags_path)
     
     def scrape(self):
         """
@@ -371,7 +583,7 @@ class AtlanticScraper(BaseScraper):
         # Get available issues and let the user select one
         issue_url = self.select_issue()
         if not issue_url:
-            print("No issue selected. Exiting.")
+            logger.warning("No issue selected. Exiting.")
             return []
         
         # Download the selected issue page
@@ -379,11 +591,26 @@ class AtlanticScraper(BaseScraper):
         if not html_path:
             return []
         
-        tags_path = self.extract_article_tags(html_path)
-        if not tags_path:
-            return []
+        return self.extract_articles(html_path)
+    
+    @profiled('extract_articles')
+    def extract_articles(self, html_path):
+        """
+        Extract the new article links from a downloaded issue page.
+        
+        Args:
+            html_path (str): Path to the issue HTML file.
+        
+        Returns:
+            list: List of article links not seen before, or empty list if failed.
+        """
+        # Fast path: the table of contents embedded in the page
+        article_links = self.extract_embedded_article_links(html_path)
+        if not article_links:
+            article_links = self.extract_streamed_article_links(html_path)
         
-        return self.extract_article_links(tags_path)
+        self.save_article_metadata()
+        return self.filter_new_links(article_links)
 
 # For backward compatibility
 def run_full_scrape(output_path="data/atlantic", selected_issue=None):
@@ -3,20 +3,95 @@ Module for scraping articles from The Economist magazine.
 """
 import os
 import re
+import bisect
 import requests
 from bs4 import BeautifulSoup
 import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from news_archiver.scrapers import BaseScraper
+from news_archiver.scrapers.links import iter_anchors, iter_file_chunks, CHUNK_SIZE
+from news_archiver.scrapers.structured_data import (
+    extract_next_data, extract_json_ld, json_ld_articles, article_metadata, embedded_scripts
+)
+from news_archiver.urls import canonicalize_url
+from news_archiver.profiling import profiled
+from news_archiver.deadline import request_timeout
+from news_archiver.prefetch import prefetcher
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+# Edition dates as printed on the site, e.g. "Mar 29th 2025"
+EDITION_DATE_PATTERN = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d+)\w*\s+(\d{4})\b')
+# Article paths look like /section/YYYY/MM/DD/article-slug
+ARTICLE_PATH_PATTERN = re.compile(r"^/[^/]+/\d{4}/\d{2}/\d{2}/[^/]+/?$")
+# Year selector options and pagination links on the archive pages
+ARCHIVE_YEAR_PATTERN = re.compile(r'<option value="(\d{4})"')
+ARCHIVE_PAGE_PATTERN = re.compile(r'href="([^"]*/weeklyedition/archive\?[^"]*page=\d+[^"]*)"')
+# Number of most recent issues shown in the interactive selection list
+MAX_LISTED_ISSUES = 52
 
 def create_directory(dir_path):
     """Create directory if it doesn't exist."""
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
+def parse_issue_date(value):
+    """
+    Parse an edition date.
+    
+    Args:
+        value (date or str): A date, "YYYY-MM-DD" string or "Mar 29th 2025" text.
+    
+    Returns:
+        date: The parsed date or None if it could not be parsed.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    
+    value = value.strip()
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        pass
+    
+    match = EDITION_DATE_PATTERN.search(value)
+    if match:
+        try:
+            return date(int(match.group(3)), MONTHS[match.group(1)], int(match.group(2)))
+        except ValueError:
+            return None
+    return None
+
+def format_issue_date(issue_date):
+    """Format a date the way the site prints edition dates (e.g. "Mar 29th 2025")."""
+    day = issue_date.day
+    suffix = 'th' if 11 <= day <= 13 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
+    return f"{issue_date.strftime('%b')} {day}{suffix} {issue_date.year}"
+
+def edition_saturday(issue_date):
+    """Return the Saturday of the edition week containing the given date."""
+    return issue_date + timedelta(days=(5 - issue_date.weekday()) % 7)
+
 class EconomistScraper(BaseScraper):
     """Scraper for The Economist magazine."""
     
-    def __init__(self, output_path="data/economist", selected_issue=None):
+    source_name = "economist"
+    # File the downloaded issue page is saved to, inside output_path
+    issue_file = "economist_issue.html"
+    
+    def __init__(self, output_path="data/economist", selected_issue=None, seen_index=None, start_year=None, max_workers=8,
+                 issue_history=None):
         """
         Initialize the Economist scraper.
         
@@ -24,108 +99,347 @@ class EconomistScraper(BaseScraper):
             output_path (str): Directory to save output files.
             selected_issue (str, optional): Specific issue to scrape (e.g., "Mar 29th 2025").
                                            If None, will prompt for selection.
+            seen_index (SeenUrlIndex, optional): Index used to skip articles already processed.
+            start_year (int, optional): Earliest archive year to walk. If None, walks every year.
+            max_workers (int): Number of archive pages to fetch concurrently.
+            issue_history (IssueHistory, optional): History used to only schedule articles added to the issue.
         """
-        super().__init__(output_path)
+        super().__init__(output_path, seen_index, issue_history)
         create_directory(self.output_path)
         self.archive_url = "https://www.economist.com/weeklyedition/archive"
         self.selected_issue = selected_issue
+        self.start_year = start_year
+        self.max_workers = max_workers
         self.issue_urls = {}
+        self.issue_dates = {}
+        self._sorted_dates = []
     
+    @profiled('get_available_issues')
     def get_available_issues(self):
         """
-        Get a list of available magazine issues from the archive page.
+        Get the catalog of magazine issues by walking the weekly edition archive.
+        
+        The archive landing page lists the current year and links to every other
+        year (and, for long years, further pages). Those pages are fetched
+        concurrently and merged into a single catalog ordered newest first.
         
         Returns:
             dict: Dictionary mapping issue names to their URLs.
         """
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            print(f"Fetching magazine issues from {self.archive_url}...")
-            response = requests.get(self.archive_url, headers=headers)
-            response.raise_for_status()
+            logger.info("Fetching magazine issues from %s...", self.archive_url)
+            html = self._fetch_archive_page(self.archive_url, raise_errors=True)
             
             # Save the HTML content for debugging
             debug_path = os.path.join(self.output_path, "archive_debug.html")
             with open(debug_path, "w", encoding="utf-8") as file:
-                file.write(response.text)
-            print(f"Saved debug HTML to {debug_path}")
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            issue_links = {}
+                file.write(html)
+            logger.debug("Saved debug HTML to %s", debug_path)
             
-            # Find all issues on the page with date headers
-            date_pattern = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+\w+\s+\d{4}\b')
+            editions, years, page_urls = self._parse_archive_page(html)
+            catalog = {}
+            self._merge_editions(catalog, editions)
             
-            # Look for date elements
-            for date_elem in soup.find_all(text=date_pattern):
-                date_text = date_elem.strip()
-                parent = date_elem.parent
-                
-                # Find the nearest heading with a title
-                title_elem = None
-                current = parent
-                # Look up for title in parent elements
-                while current and not title_elem and current.name != 'body':
-                    title_elem = current.find(['h2', 'h3', 'h4'], recursive=False)
-                    if not title_elem:
-                        current = current.parent
-                
-                # If no title found looking up, try looking down
-                if not title_elem:
-                    title_elem = parent.find_next(['h2', 'h3', 'h4'])
-                
-                # Extract title text or use a default
-                title_text = title_elem.text.strip() if title_elem and title_elem != parent else "Weekly Edition"
-                
-                # Get the issue URL
-                # First, try to find a link in the parent element
-                issue_link = parent.find('a', href=True)
-                # If not found, look for nearby links
-                if not issue_link:
-                    issue_link = parent.find_next('a', href=True)
-                
-                if issue_link:
-                    href = issue_link.get('href', '')
-                    if '/weeklyedition/' in href or '/printedition/' in href:
-                        full_url = href if href.startswith('http') else f"https://www.economist.com{href}"
-                        issue_name = f"{date_text} - {title_text}"
-                        issue_links[issue_name] = full_url
+            # The landing page is the newest year, so only the other years need fetching
+            landing_year = max((issue_date.year for issue_date in catalog), default=None)
+            pending = set(page_urls)
+            for year in years:
+                if year == landing_year or (self.start_year and year < self.start_year):
+                    continue
+                pending.add(f"{self.archive_url}?year={year}")
             
-            # If no issues found, try a more general approach
-            if not issue_links:
-                # Find all links that seem to point to weekly editions
-                for link in soup.find_all('a', href=True):
-                    href = link.get('href', '')
-                    if '/weeklyedition/' in href:
-                        # Try to extract date from the URL or from the link text
-                        date_match = date_pattern.search(link.text)
-                        if date_match:
-                            date_text = date_match.group(0)
-                            issue_name = f"{date_text} - Weekly Edition"
-                            full_url = href if href.startswith('http') else f"https://www.economist.com{href}"
-                            issue_links[issue_name] = full_url
+            seen = {self.archive_url}
+            if pending:
+                logger.info("Walking %s archive pages...", len(pending))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while pending:
+                    urls = sorted(pending - seen)
+                    seen.update(pending)
+                    pending = set()
+                    for page_html in executor.map(self._fetch_archive_page, urls):
+                        if not page_html:
+                            continue
+                        editions, _, page_urls = self._parse_archive_page(page_html)
+                        self._merge_editions(catalog, editions)
+                        pending.update(page_urls)
+                    pending -= seen
             
-            self.issue_urls = issue_links
+            self._build_issue_index(catalog)
             
-            if issue_links:
-                print(f"Found {len(issue_links)} issues.")
+            if self.issue_urls:
+                logger.info("Found %s issues.", len(self.issue_urls))
             else:
-                print("No issues found. The website structure may have changed.")
+                logger.warning("No issues found. The website structure may have changed.")
                 
-            return issue_links
+            return self.issue_urls
             
         except requests.exceptions.RequestException as e:
-            print(f"An error occurred while fetching archive: {e}")
+            logger.error("An error occurred while fetching archive: %s", e)
             return {}
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("An unexpected error occurred: %s", e)
             return {}
     
+    def _fetch_archive_page(self, url, raise_errors=False):
+        """
+        Fetch a single archive page.
+        
+        Args:
+            url (str): URL of the archive page.
+            raise_errors (bool): Re-raise request errors instead of returning None.
+        
+        Returns:
+            str: The page HTML or None if the request failed.
+        """
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+        
+        try:
+            response = requests.get(url, headers=headers, timeout=request_timeout())
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
+            logger.warning("An error occurred while fetching %s: %s", url, e)
+            return None
+    
+    def _parse_archive_page(self, html):
+        """
+        Parse an archive page into editions and links to further archive pages.
+        
+        Args:
+            html (str): The archive page HTML.
+        
+        Returns:
+            tuple: (list of (date, issue name, URL) tuples, set of archive years,
+                   set of pagination URLs for the same year).
+        """
+        parsed = self.memoized_extraction('archive_page', html, self._scan_archive_page)
+        editions = [
+            (date.fromisoformat(issue_date), issue_name, url)
+            for issue_date, issue_name, url in parsed['editions']
+        ]
+        return editions, set(parsed['years']), set(parsed['page_urls'])
+    
+    def _scan_archive_page(self, html):
+        """
+        Parse an archive page into a JSON-serializable form for the extraction cache.
+        
+        Args:
+            html (str): The archive page HTML.
+        
+        Returns:
+            dict: Editions as [ISO date, issue name, URL] lists, archive years and pagination URLs.
+        """
+        years = {int(year) for year in ARCHIVE_YEAR_PATTERN.findall(html)}
+        page_urls = set()
+        for href in ARCHIVE_PAGE_PATTERN.findall(html):
+            href = href.replace("&amp;", "&")
+            page_urls.add(href if href.startswith("http") else f"https://www.economist.com{href}")
+        
+        editions = self._parse_archive_data(html)
+        if not editions:
+            editions = self._parse_archive_dom(html)
+        return {
+            'editions': [[issue_date.isoformat(), issue_name, url] for issue_date, issue_name, url in editions],
+            'years': sorted(years),
+            'page_urls': sorted(page_urls),
+        }
+    
+    def _parse_archive_data(self, html):
+        """
+        Read editions from the page's embedded Next.js data, if present.
+        
+        Args:
+            html (str): The archive page HTML.
+        
+        Returns:
+            list: List of (date, issue name, URL) tuples.
+        """
+        try:
+            raw_editions = extract_next_data(html)["props"]["pageProps"]["content"]["editions"]
+        except (KeyError, TypeError):
+            return []
+        
+        editions = []
+        for edition in raw_editions:
+            href = edition.get("url") or ""
+            issue_date = parse_issue_date((edition.get("issueDate") or "")[:10]) or parse_issue_date(href.rsplit("/", 1)[-1])
+            if not href or not issue_date:
+                continue
+            date_text = edition.get("formattedIssueDate") or format_issue_date(issue_date)
+            title_text = (edition.get("headline") or "").strip() or "Weekly Edition"
+            full_url = href if href.startswith("http") else f"https://www.economist.com{href}"
+            editions.append((issue_date, f"{date_text} - {title_text}", full_url))
+        return editions
+    
+    def _parse_archive_dom(self, html):
+        """
+        Read editions from the archive page markup.
+        
+        Args:
+            html (str): The archive page HTML.
+        
+        Returns:
+            list: List of (date, issue name, URL) tuples.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        editions = []
+        
+        # Look for date elements
+        for date_elem in soup.find_all(string=EDITION_DATE_PATTERN):
+            date_text = date_elem.strip()
+            parent = date_elem.parent
+            
+            # Find the nearest heading with a title
+            title_elem = None
+            current = parent
+            # Look up for title in parent elements
+            while current and not title_elem and current.name != 'body':
+                title_elem = current.find(['h2', 'h3', 'h4'], recursive=False)
+                if not title_elem:
+                    current = current.parent
+            
+            # If no title found looking up, try looking down
+            if not title_elem:
+                title_elem = parent.find_next(['h2', 'h3', 'h4'])
+            
+            # Extract title text or use a default
+            title_text = title_elem.text.strip() if title_elem and title_elem != parent else "Weekly Edition"
+            
+            # Get the issue URL
+            # First, try to find a link in the parent element
+            issue_link = parent.find('a', href=True)
+            # If not found, look for nearby links
+            if not issue_link:
+                issue_link = parent.find_next('a', href=True)
+            
+            issue_date = parse_issue_date(date_text)
+            if issue_link and issue_date:
+                href = issue_link.get('href', '')
+                if '/weeklyedition/' in href or '/printedition/' in href:
+                    full_url = href if href.startswith('http') else f"https://www.economist.com{href}"
+                    editions.append((issue_date, f"{date_text} - {title_text}", full_url))
+        
+        # If no issues found, try a more general approach
+        if not editions:
+            # Find all links that seem to point to weekly editions
+            for link in soup.find_all('a', href=True):
+                href = link.get('href', '')
+                if '/weeklyedition/' in href:
+                    # Try to extract date from the URL or from the link text
+                    date_match = EDITION_DATE_PATTERN.search(link.text)
+                    issue_date = parse_issue_date(date_match.group(0)) if date_match else None
+                    # Skip dates that do not exist, e.g. "Feb 30th 2025"
+                    if issue_date:
+                        date_text = date_match.group(0)
+                        full_url = href if href.startswith('http') else f"https://www.economist.com{href}"
+                        editions.append((issue_date, f"{date_text} - Weekly Edition", full_url))
+        
+        return editions
+    
+    def _merge_editions(self, catalog, editions):
+        """
+        Merge parsed editions into the catalog, keyed by edition date.
+        
+        Args:
+            catalog (dict): Dictionary mapping dates to (issue name, URL) tuples.
+            editions (list): List of (date, issue name, URL) tuples.
+        """
+        for issue_date, issue_name, url in editions:
+            if issue_date not in catalog:
+                catalog[issue_date] = (issue_name, url)
+    
+    def _build_issue_index(self, catalog):
+        """
+        Build the date-ordered issue catalog and its Saturday-based date index.
+        
+        Args:
+            catalog (dict): Dictionary mapping dates to (issue name, URL) tuples.
+        """
+        self.issue_urls = {}
+        self.issue_dates = {}
+        for issue_date in sorted(catalog, reverse=True):
+            issue_name, url = catalog[issue_date]
+            self.issue_urls[issue_name] = url
+            self.issue_dates[edition_saturday(issue_date)] = issue_name
+        self._sorted_dates = sorted(self.issue_dates)
+    
+    def find_issue_by_date(self, value):
+        """
+        Find the issue covering a given date.
+        
+        Any day of the week resolves to the edition dated that week's Saturday.
+        Weeks without their own edition (e.g. the Christmas double issue) fall
+        back to the most recent edition from the preceding week.
+        
+        Args:
+            value (date or str): A date, "YYYY-MM-DD" string or "Mar 29th 2025" text.
+        
+        Returns:
+            str: The issue name or None if no edition covers that date.
+        """
+        issue_date = parse_issue_date(value)
+        if not issue_date:
+            return None
+        if not self.issue_dates:
+            self.get_available_issues()
+        
+        saturday = edition_saturday(issue_date)
+        if saturday in self.issue_dates:
+            return self.issue_dates[saturday]
+        
+        index = bisect.bisect_right(self._sorted_dates, saturday) - 1
+        if index >= 0 and (saturday - self._sorted_dates[index]).days <= 7:
+            return self.issue_dates[self._sorted_dates[index]]
+        return None
+    
+    def find_issues_in_range(self, start, end):
+        """
+        Find all issues dated within a date range (inclusive).
+        
+        Args:
+            start (date or str): First date of the range.
+            end (date or str): Last date of the range.
+        
+        Returns:
+            list: Issue names, newest first.
+        """
+        start_date = parse_issue_date(start)
+        end_date = parse_issue_date(end)
+        if not start_date or not end_date:
+            return []
+        if not self.issue_dates:
+            self.get_available_issues()
+        
+        low = bisect.bisect_left(self._sorted_dates, edition_saturday(start_date))
+        high = bisect.bisect_right(self._sorted_dates, end_date)
+        return [self.issue_dates[issue_date] for issue_date in reversed(self._sorted_dates[low:high])]
+    
+    @classmethod
+    def normalize_issue(cls, issue):
+        """Return the edition's date, which does not depend on how the issue was named."""
+        issue_date = parse_issue_date(issue)
+        return issue_date.isoformat() if issue_date else issue
+    
+    def issue_from_template(self, issue):
+        """
+        Map an edition date (any day of its week) to the edition's /weeklyedition/YYYY-MM-DD URL.
+        
+        Args:
+            issue (str): A date such as "2025-03-29" or "Mar 29th 2025".
+        
+        Returns:
+            tuple: (issue name, URL), or None if the issue is not a date.
+        """
+        issue_date = parse_issue_date(issue)
+        if not issue_date:
+            return None
+        saturday = edition_saturday(issue_date)
+        return format_issue_date(saturday), f"https://www.economist.com/weeklyedition/{saturday.isoformat()}"
+    
     def select_issue(self):
         """
         Prompt the user to select an issue from the available issues.
@@ -133,69 +447,67 @@ class EconomistScraper(BaseScraper):
         Returns:
             str: The URL of the selected issue.
         """
+        # A specific issue usually maps straight to its URL, without walking the archive
+        if self.selected_issue and not self.issue_urls:
+            issue_url = self.resolve_issue(self.selected_issue)
+            if issue_url:
+                return issue_url
+        
         if not self.issue_urls:
             self.get_available_issues()
         
         if not self.issue_urls:
-            print("No issues found to select from.")
+            logger.warning("No issues found to select from.")
             return None
             
         # If a specific issue was provided during initialization, use that
-        if self.selected_issue and self.selected_issue in self.issue_urls:
-            return self.issue_urls[self.selected_issue]
+        if self.selected_issue:
+            if self.selected_issue in self.issue_urls:
+                return self.issue_urls[self.selected_issue]
+            # Otherwise treat it as a date, e.g. "Mar 29th 2025" or "2025-03-29"
+            issue_name = self.find_issue_by_date(self.selected_issue)
+            if issue_name:
+                self.selected_issue = issue_name
+                return self.issue_urls[issue_name]
         
         # Otherwise, prompt the user to select an issue
         print("\nAvailable issues:")
         
-        # Sort issues by date (newest first)
+        # The catalog is already ordered newest first; only list the most recent
+        # issues and let older ones be picked by date
         issues_list = list(self.issue_urls.keys())
-        
-        # Try to sort by most recent first
-        try:
-            # Extract dates and sort
-            def get_sort_key(issue_name):
-                # Try to extract the date part from the issue name
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+\w+\s+(\d{4})', issue_name)
-                if date_match:
-                    month_str = date_match.group(1)
-                    year_str = date_match.group(2)
-                    
-                    month_order = {
-                        'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                        'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                    }
-                    
-                    month = month_order.get(month_str, 0)
-                    year = int(year_str) if year_str.isdigit() else 0
-                    
-                    return (-year, -month)  # Negative to sort descending
-                return (0, 0)  # Default sort key
-            
-            issues_list.sort(key=get_sort_key)
-        except Exception as e:
-            print(f"Error sorting issues: {e}")
-            # If sorting fails, just continue with the unsorted list
-        
-        for i, issue in enumerate(issues_list):
+        for i, issue in enumerate(issues_list[:MAX_LISTED_ISSUES]):
             print(f"{i+1}. {issue}")
+        if len(issues_list) > MAX_LISTED_ISSUES:
+            print(f"... {len(issues_list) - MAX_LISTED_ISSUES} older issues, back to {issues_list[-1]}")
+        
+        # Fetch the newest issues while the user decides
+        prefetcher.start([self.issue_urls[issue] for issue in issues_list], headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        })
         
         while True:
-            try:
-                selection = input("\nEnter the number of the issue to archive (or 'q' to quit): ")
-                if selection.lower() == 'q':
-                    return None
-                
+            selection = input("\nEnter the number of the issue to archive, a date (YYYY-MM-DD), or 'q' to quit: ")
+            if selection.lower() == 'q':
+                return None
+            
+            if selection.isdigit():
                 index = int(selection) - 1
-                if 0 <= index < len(issues_list):
-                    selected_issue = issues_list[index]
-                    print(f"Selected issue: {selected_issue}")
-                    self.selected_issue = selected_issue
-                    return self.issue_urls[selected_issue]
-                else:
-                    print("Invalid selection. Please try again.")
-            except ValueError:
-                print("Please enter a valid number.")
+                selected_issue = issues_list[index] if 0 <= index < len(issues_list) else None
+            else:
+                if not parse_issue_date(selection):
+                    print("Please enter a valid number or date.")
+                    continue
+                selected_issue = self.find_issue_by_date(selection)
+            
+            if selected_issue:
+                print(f"Selected issue: {selected_issue}")
+                self.selected_issue = selected_issue
+                return self.issue_urls[selected_issue]
+            else:
+                print("Invalid selection. Please try again.")
     
+    @profiled('download_issue_page')
     def download_issue_page(self, issue_url):
         """
         Download the HTML content from the selected issue's page.
@@ -206,34 +518,46 @@ class EconomistScraper(BaseScraper):
         Returns:
             str: Path to the saved HTML file or None if failed.
         """
-        file_path = os.path.join(self.output_path, "economist_issue.html")
+        file_path = os.path.join(self.output_path, self.issue_file)
+        
+        # The page may already have been fetched while the user was choosing
+        content = prefetcher.take(issue_url)
+        if content is not None:
+            with open(file_path, "wb") as file:
+                file.write(content)
+            logger.info("Issue HTML content (prefetched) saved to %s", file_path)
+            return file_path
         
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
             
-            response = requests.get(issue_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
+            # Stream the page to disk as served, without holding the body in memory;
+            # extraction reads it back from there
+            with requests.get(issue_url, headers=headers, stream=True, timeout=request_timeout()) as response:
+                response.raise_for_status()
+                with open(file_path, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
             
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write(str(soup))
-            
-            print(f"Issue HTML content downloaded and saved to {file_path}")
+            logger.info("Issue HTML content downloaded and saved to %s", file_path)
             return file_path
         
         except requests.exceptions.RequestException as e:
-            print(f"An error occurred while downloading issue: {e}")
+            logger.error("An error occurred while downloading issue: %s", e)
             return None
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            logger.error("An unexpected error occurred: %s", e)
             return None
     
     def extract_article_links(self, html_path):
         """
-        Extract article links from the issue HTML file using the improved regex pattern.
+        Extract article links from the issue HTML file.
+        
+        The page's embedded Next.js data is read first, which also yields each
+        article's title, section and date. The DOM is only walked, using the
+        article URL pattern, when that data is missing.
         
         Args:
             html_path (str): Path to the HTML file.
@@ -244,53 +568,147 @@ class EconomistScraper(BaseScraper):
         links_path = os.path.join(self.output_path, "articles.txt")
         
         try:
-            with open(html_path, "r", encoding="utf-8") as file:
-                soup = BeautifulSoup(file.read(), "html.parser")
-            
-            # Using the regex pattern approach as suggested
-            article_links = set()
-            # Pattern matches paths like /section/YYYY/MM/DD/article-slug
-            article_pattern = re.compile(r"^/[^/]+/\d{4}/\d{2}/\d{2}/[^/]+/?$")
-            
-            for a_tag in soup.find_all("a", href=True):
-                href = a_tag["href"]
-                # Normalize the URL path
-                if href.startswith("http") and "economist.com" in href:
-                    path = "/" + "/".join(href.split("/")[3:])
-                elif href.startswith("/"):
-                    path = href
-                else:
-                    continue
-                
-                if article_pattern.match(path):
-                    full_url = "https://www.economist.com" + path
-                    article_links.add(full_url)
-            
-            # Convert to list and sort
-            article_links_list = sorted(article_links)
+            # An unchanged page reuses the links and metadata extracted last time
+            extracted = self.memoized_file_extraction('issue_page', html_path, self._extract_issue_page)
+            self.article_metadata = extracted['metadata']
+            article_links_list = extracted['links']
             
             # Save to file
             with open(links_path, "w", encoding="utf-8") as output_file:
                 for link in article_links_list:
                     output_file.write(link + "\n")
             
-            print(f"Article links extracted and saved to {links_path}")
+            logger.info("Article links extracted and saved to %s", links_path)
             if not article_links_list:
-                print("No article links found. The website structure may have changed.")
+                logger.warning("No article links found. The website structure may have changed.")
             else:
-                print(f"Found {len(article_links_list)} article links.")
+                logger.info("Found %s article links.", len(article_links_list))
                 
             return article_links_list
         
         except FileNotFoundError:
-            print(f"Error: HTML file {html_path} not found.")
+            logger.error("Error: HTML file %s not found.", html_path)
             return []
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("An unexpected error occurred: %s", e)
             return []
     
+    def _extract_issue_page(self, html_path):
+        """
+        Extract the article links and their metadata from an issue page.
+        
+        The page is scanned in chunks for its embedded data, keeping only those
+        <script> blocks; when the data is missing, the anchors are streamed from
+        the file instead.
+        
+        Args:
+            html_path (str): Path to the saved issue page.
+        
+        Returns:
+            dict: Sorted article links and the metadata dicts keyed by URL.
+        """
+        articles = self.extract_embedded_articles(embedded_scripts(iter_file_chunks(html_path)))
+        if articles:
+            metadata = {article['url']: article for article in articles}
+            article_links = set(metadata)
+        else:
+            self.article_metadata = {}
+            article_links = self._extract_links_from_anchors(iter_anchors(iter_file_chunks(html_path)))
+            metadata = self.article_metadata
+        return {'links': sorted(article_links), 'metadata': metadata}
+    
+    def _canonical_article_url(self, href):
+        """
+        Canonicalize an href and check it against the article URL pattern.
+        
+        Args:
+            href (str): Absolute or site-relative link.
+        
+        Returns:
+            str: The canonical article URL or None if it is not an article link.
+        """
+        # Normalize the URL (drops query strings, fragments and trailing slashes)
+        full_url = canonicalize_url(href, base_url="https://www.economist.com", trailing_slash=False)
+        if not full_url or not full_url.startswith("https://www.economist.com/"):
+            return None
+        
+        path = full_url[len("https://www.economist.com"):]
+        return full_url if ARTICLE_PATH_PATTERN.match(path) else None
+    
+    def extract_embedded_articles(self, html):
+        """
+        Read the issue's articles from the page's embedded Next.js data.
+        
+        Args:
+            html (str): The issue page HTML.
+        
+        Returns:
+            list: Article metadata dicts (url, title, author, section, date),
+                  or an empty list if the page carries no usable data.
+        """
+        data = extract_next_data(html)
+        try:
+            content = data["props"]["pageProps"]["content"]
+        except (KeyError, TypeError):
+            content = None
+        if not isinstance(content, dict):
+            return []
+        
+        issue_date = parse_issue_date((content.get("issueDate") or "")[:10])
+        articles = {}
+        for section in (content.get("headerSections") or []) + (content.get("sections") or []):
+            for item in section.get("articles") or []:
+                url = self._canonical_article_url(item.get("url") or "")
+                if not url or url in articles:
+                    continue
+                section_name = (item.get("section") or {}).get("name") or section.get("name")
+                published = parse_issue_date(item.get("formattedPublishedDate")) or issue_date
+                articles[url] = article_metadata(
+                    url,
+                    item.get("headline"),
+                    section=section_name,
+                    date=published.isoformat() if published else None
+                )
+        
+        # Fall back to any JSON-LD article list the page carries
+        if not articles:
+            for article in json_ld_articles(extract_json_ld(html)):
+                url = self._canonical_article_url(article['url'])
+                if url and url not in articles:
+                    article['url'] = url
+                    articles[url] = article
+        
+        return list(articles.values())
+    
+    def _extract_links_from_anchors(self, anchors):
+        """
+        Extract article links by matching a page's anchors against the article URL pattern.
+        
+        Args:
+            anchors (iterable): Anchor objects, e.g. streamed by iter_anchors.
+        
+        Returns:
+            set: Canonical article URLs.
+        """
+        article_links = set()
+        for anchor in anchors:
+            full_url = self._canonical_article_url(anchor.href)
+            if not full_url:
+                continue
+            article_links.add(full_url)
+            
+            # Capture what the link itself tells us: its text, section and date
+            title = anchor.text
+            if full_url not in self.article_metadata or (title and not self.article_metadata[full_url]['title']):
+                parts = full_url[len("https://www.economist.com/"):].split("/")
+                self.article_metadata[full_url] = article_metadata(
+                    full_url,
+                    title,
+                    section=parts[0].replace("-", " ").capitalize(),
+                    date="-".join(parts[1:4])
+                )
+        return article_links
+    
     def scrape(self):
         """
         Run the full scraping process for The Economist.
@@ -301,7 +719,7 @@ class EconomistScraper(BaseScraper):
         # Get available issues and let the user select one
         issue_url = self.select_issue()
         if not issue_url:
-            print("No issue selected. Exiting.")
+            logger.warning("No issue selected. Exiting.")
             return []
         
         # Download the selected issue page
@@ -309,8 +727,23 @@ class EconomistScraper(BaseScraper):
         if not html_path:
             return []
         
-        # Extract article links using the regex pattern approach
-        return self.extract_article_links(html_path)
+        return self.extract_articles(html_path)
+    
+    @profiled('extract_articles')
+    def extract_articles(self, html_path):
+        """
+        Extract the new article links from a downloaded issue page.
+        
+        Args:
+            html_path (str): Path to the issue HTML file.
+        
+        Returns:
+            list: List of article links not seen before, or empty list if failed.
+        """
+        # Extract article links (and their metadata) from the issue page
+        article_links = self.extract_article_links(html_path)
+        self.save_article_metadata()
+        return self.filter_new_links(article_links)
 
 # For backward compatibility
 def run_full_scrape(output_path="data/economist", selected_issue=None):
@@ -0,0 +1,146 @@
+"""
+Streaming extraction of links from HTML.
+
+Scrapers that fall back to scanning a page's anchors feed the page through an
+incremental tokenizer (html.parser) in chunks, straight from the saved
+response bytes, and receive each <a href> as an event. No DOM is built and
+only the open container elements and the text of the current anchor are
+held, so memory stays flat however large the page is.
+"""
+import codecs
+from html.parser import HTMLParser
+
+# Bytes read per chunk when streaming a file
+CHUNK_SIZE = 64 * 1024
+
+# Longest anchor text kept (link text beyond this is a page section, not a title)
+MAX_ANCHOR_TEXT = 500
+
+# Elements tracked as the context an anchor appears in
+CONTAINER_TAGS = {'article', 'div', 'section'}
+
+class Anchor:
+    """An <a href> found in a page."""
+
+    __slots__ = ('href', 'text', 'in_article', 'in_container')
+
+    def __init__(self, href, text, in_article, in_container):
+        self.href = href
+        self.text = text
+        # Inside an <article> element
+        self.in_article = in_article
+        # Inside a <div> or <section> whose class names an article-like container
+        self.in_container = in_container
+
+    def __repr__(self):
+        return f"Anchor({self.href!r}, {self.text!r})"
+
+def _is_article_container(tag, class_names):
+    """Whether a div/section's classes mark it as article content."""
+    if tag not in ('div', 'section') or not class_names:
+        return False
+    class_names = class_names.lower()
+    return any(term in class_names for term in ('article', 'post', 'content', 'entry'))
+
+class AnchorParser(HTMLParser):
+    """Incremental parser that collects anchors as the page is fed in."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # (tag, is article-like container) for each open container element
+        self._open = []
+        self._articles = 0
+        self._containers = 0
+        self._href = None
+        self._text = []
+        self._text_length = 0
+        self._anchors = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in CONTAINER_TAGS:
+            container = _is_article_container(tag, dict(attrs).get('class'))
+            self._open.append((tag, container))
+            self._articles += tag == 'article'
+            self._containers += container
+        elif tag == 'a':
+            self._finish_anchor()
+            href = dict(attrs).get('href')
+            if href:
+                self._href = href
+                self._text = []
+                self._text_length = 0
+
+    def handle_endtag(self, tag):
+        if tag in CONTAINER_TAGS:
+            # Close the innermost open element of this kind (and any left unclosed inside it)
+            for index in range(len(self._open) - 1, -1, -1):
+                if self._open[index][0] == tag:
+                    for closed, container in self._open[index:]:
+                        self._articles -= closed == 'article'
+                        self._containers -= container
+                    del self._open[index:]
+                    break
+        elif tag == 'a':
+            self._finish_anchor()
+
+    def handle_data(self, data):
+        if self._href is not None and self._text_length < MAX_ANCHOR_TEXT:
+            self._text.append(data)
+            self._text_length += len(data)
+
+    def _finish_anchor(self):
+        if self._href is None:
+            return
+        text = ' '.join(''.join(self._text).split())[:MAX_ANCHOR_TEXT]
+        self._anchors.append(Anchor(self._href, text, self._articles > 0, self._containers > 0))
+        self._href = None
+
+    def close(self):
+        super().close()
+        self._finish_anchor()
+
+    def drain(self):
+        """Return the anchors completed since the last call."""
+        anchors, self._anchors = self._anchors, []
+        return anchors
+
+def iter_anchors(chunks, encoding='utf-8'):
+    """
+    Stream the anchors of an HTML document.
+
+    Args:
+        chunks (iterable): The document as str or bytes chunks (e.g. a file read in
+                           blocks or a response's iter_content()).
+        encoding (str): Encoding of bytes chunks.
+
+    Yields:
+        Anchor: Each <a href> in document order.
+    """
+    parser = AnchorParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    yield from parser.drain()
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Read a file in binary chunks.
+
+    Args:
+        path (str): Path of the file.
+        chunk_size (int): Bytes per chunk.
+
+    Yields:
+        bytes: The file's contents, chunk by chunk.
+    """
+    with open(path, 'rb') as infile:
+        while True:
+            chunk = infile.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
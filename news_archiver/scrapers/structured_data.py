@@ -0,0 +1,193 @@
+"""
+Helpers for reading the structured data publishers embed in their pages.
+
+Locating a single <script> block with a regex and parsing it as JSON is far
+cheaper than building a DOM of the whole page, so scrapers try these first
+and only fall back to DOM scraping when the data is missing. Saved pages can
+be scanned in chunks with embedded_scripts, which keeps only these blocks.
+"""
+import re
+import json
+import codecs
+import html as html_lib
+
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+JSON_LD_PATTERN = re.compile(r'<script[^>]*\btype="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Attributes of the <script> start tags read by extract_next_data and extract_json_ld
+EMBEDDED_SCRIPT_PATTERN = re.compile(r'\bid="__NEXT_DATA__"|\btype="application/ld\+json"')
+SCRIPT_START = '<script'
+SCRIPT_END = '</script>'
+
+# JSON-LD types describing a single article
+ARTICLE_TYPES = {'Article', 'NewsArticle', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle', 'BlogPosting'}
+
+def embedded_scripts(chunks, encoding='utf-8'):
+    """
+    Collect a page's embedded-data <script> blocks while reading it in chunks.
+
+    Only the __NEXT_DATA__ and JSON-LD blocks are kept, so memory is bounded
+    by their size rather than the page's. The result can be passed to
+    extract_next_data and extract_json_ld in place of the page.
+
+    Args:
+        chunks (iterable): The page as str or bytes chunks (e.g. a file read in blocks).
+        encoding (str): Encoding of bytes chunks.
+
+    Returns:
+        str: The blocks, tags included, in page order.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    blocks = []
+    buffer = ''
+    # Inside a script: whether it is kept, and where to resume looking for its end
+    keep = None
+    search_from = 0
+
+    for chunk in chunks:
+        buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        while True:
+            if keep is None:
+                start = buffer.find(SCRIPT_START)
+                if start == -1:
+                    # Keep what could be the beginning of a start tag split across chunks
+                    buffer = buffer[-(len(SCRIPT_START) - 1):]
+                    break
+                tag_end = buffer.find('>', start)
+                if tag_end == -1:
+                    buffer = buffer[start:]
+                    break
+                keep = bool(EMBEDDED_SCRIPT_PATTERN.search(buffer, start, tag_end))
+                buffer = buffer[start:] if keep else buffer[tag_end + 1:]
+                search_from = tag_end + 1 - start if keep else 0
+            end = buffer.find(SCRIPT_END, search_from)
+            if end == -1:
+                if keep:
+                    search_from = max(search_from, len(buffer) - len(SCRIPT_END) + 1)
+                else:
+                    buffer = buffer[-(len(SCRIPT_END) - 1):]
+                break
+            end += len(SCRIPT_END)
+            if keep:
+                blocks.append(buffer[:end])
+            buffer = buffer[end:]
+            keep = None
+    return ''.join(blocks)
+
+def extract_next_data(page_html):
+    """
+    Parse the Next.js __NEXT_DATA__ payload of a page.
+
+    Args:
+        page_html (str): The page HTML.
+
+    Returns:
+        dict: The parsed payload or None if the page has none.
+    """
+    match = NEXT_DATA_PATTERN.search(page_html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+def extract_json_ld(page_html):
+    """
+    Parse every JSON-LD block of a page.
+
+    Args:
+        page_html (str): The page HTML.
+
+    Returns:
+        list: JSON-LD objects, with @graph containers and top-level lists flattened.
+    """
+    objects = []
+    for block in JSON_LD_PATTERN.findall(page_html):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if not isinstance(item, dict):
+                continue
+            if isinstance(item.get('@graph'), list):
+                pending.extend(item['@graph'])
+            objects.append(item)
+    return objects
+
+def json_ld_articles(objects):
+    """
+    Collect article entries from JSON-LD objects (articles and ItemList entries).
+
+    Args:
+        objects (list): JSON-LD objects as returned by extract_json_ld.
+
+    Returns:
+        list: Article metadata dicts with url, title, author, section and date keys.
+    """
+    articles = []
+    pending = list(objects)
+    while pending:
+        item = pending.pop(0)
+        if not isinstance(item, dict):
+            continue
+
+        item_types = item.get('@type')
+        item_types = set(item_types) if isinstance(item_types, list) else {item_types}
+
+        if 'ItemList' in item_types:
+            pending.extend(item.get('itemListElement') or [])
+        elif 'ListItem' in item_types:
+            inner = item.get('item')
+            if isinstance(inner, dict):
+                pending.append(inner)
+            elif item.get('url') or isinstance(inner, str):
+                articles.append(article_metadata(item.get('url') or inner, item.get('name')))
+        elif item_types & ARTICLE_TYPES and item.get('url'):
+            authors = item.get('author') or []
+            if not isinstance(authors, list):
+                authors = [authors]
+            author_names = [a.get('name') if isinstance(a, dict) else a for a in authors]
+            section = item.get('articleSection')
+            if isinstance(section, list):
+                section = section[0] if section else None
+            articles.append(article_metadata(
+                item['url'],
+                item.get('headline') or item.get('name'),
+                author=', '.join(name for name in author_names if name),
+                section=section,
+                date=item.get('datePublished')
+            ))
+    return articles
+
+def clean_text(value):
+    """Strip markup and entities from a text field of embedded data."""
+    if not value:
+        return None
+    return html_lib.unescape(TAG_PATTERN.sub('', value)).strip() or None
+
+def article_metadata(url, title=None, author=None, section=None, date=None):
+    """
+    Build an article metadata record.
+
+    Args:
+        url (str): Article URL.
+        title (str, optional): Article title.
+        author (str, optional): Author name(s).
+        section (str, optional): Section of the issue the article appears in.
+        date (str, optional): Publication date.
+
+    Returns:
+        dict: Metadata with url, title, author, section and date keys.
+    """
+    return {
+        'url': url,
+        'title': clean_text(title),
+        'author': clean_text(author),
+        'section': clean_text(section),
+        'date': date or None,
+    }
@@ -0,0 +1,125 @@
+"""
+Module for coalescing concurrent duplicate calls into a single operation.
+"""
+import asyncio
+import threading
+from news_archiver import deadline
+from news_archiver.deadline import DeadlineExceeded
+
+class _Call:
+    """An in-flight call shared by every caller asking for the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Merge concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait for it and receive the same result (or exception).
+    Once the call finishes the key is forgotten, so later calls run again.
+    Waiting callers keep their own deadlines: they stop waiting when it
+    passes, and if the first caller ran out of time instead, they run the
+    function themselves.
+    """
+
+    def __init__(self):
+        """Initialize an empty set of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Hashable key identifying the operation (e.g. a URL).
+            fn (callable): Function performing the operation.
+            *args: Positional arguments for fn.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            The result of the single shared call.
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline passed while it was waiting.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    break
+
+            if not call.done.wait(deadline.remaining()):
+                deadline.check_deadline()
+                continue
+            if isinstance(call.error, DeadlineExceeded):
+                # The leader's deadline is not this caller's; try again, possibly as the leader
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self, key):
+        """Return True if a call for key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of SingleFlight for coroutines on one event loop.
+
+    The first caller for a key starts the coroutine as a task; callers arriving
+    while it runs await the same task. Cancelling one waiter does not cancel
+    the shared operation for the others.
+    """
+
+    def __init__(self):
+        """Initialize an empty set of in-flight tasks."""
+        self._tasks = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        """
+        Await fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Hashable key identifying the operation (e.g. a URL).
+            fn (callable): Coroutine function performing the operation.
+            *args: Positional arguments for fn.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            The result of the single shared call.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        """Drop a finished task so later calls run again."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def in_flight(self, key):
+        """Return True if a call for key is currently running."""
+        return key in self._tasks
@@ -0,0 +1,352 @@
+"""
+Module for the SQLite results store.
+
+Every run records the articles it scraped, their archive results and their
+Readwise outcomes (overall, and per Readwise target) in one indexed database, so questions about the full
+history ("which March articles are archived but not in Readwise?") are
+answered with a query instead of another run. The database uses WAL
+journaling so readers never block a running pipeline.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# File name of the results database inside the output directory
+RESULTS_DB_FILE = "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    source TEXT,
+    issue TEXT,
+    title TEXT,
+    author TEXT,
+    section TEXT,
+    date TEXT,
+    archive_link TEXT,
+    archive_url TEXT,
+    archive_status TEXT,
+    readwise_status TEXT,
+    error TEXT,
+    scraped_at TEXT,
+    archived_at TEXT,
+    readwise_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_issue ON articles (source, issue);
+CREATE INDEX IF NOT EXISTS idx_articles_issue ON articles (issue);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+CREATE INDEX IF NOT EXISTS idx_articles_archive_status ON articles (archive_status);
+CREATE INDEX IF NOT EXISTS idx_articles_readwise_status ON articles (readwise_status);
+CREATE INDEX IF NOT EXISTS idx_articles_archive_url ON articles (archive_url);
+CREATE TABLE IF NOT EXISTS readwise_targets (
+    url TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT,
+    error TEXT,
+    readwise_at TEXT,
+    PRIMARY KEY (url, target)
+);
+CREATE INDEX IF NOT EXISTS idx_readwise_targets_status ON readwise_targets (target, status);
+"""
+
+# Fields are only overwritten by non-empty values, so a later stage never erases earlier metadata
+UPSERT_ARTICLE = """
+INSERT INTO articles (url, source, issue, title, author, section, date, scraped_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    source = COALESCE(excluded.source, source),
+    issue = COALESCE(excluded.issue, issue),
+    title = COALESCE(excluded.title, title),
+    author = COALESCE(excluded.author, author),
+    section = COALESCE(excluded.section, section),
+    date = COALESCE(excluded.date, date),
+    scraped_at = COALESCE(scraped_at, excluded.scraped_at)
+"""
+
+UPDATE_ARCHIVE = """
+UPDATE articles
+SET archive_link = COALESCE(?, archive_link), archive_url = ?, archive_status = ?, error = ?, archived_at = ?
+WHERE url = ?
+"""
+
+UPDATE_READWISE = """
+UPDATE articles
+SET readwise_status = ?, error = COALESCE(?, error), readwise_at = ?
+WHERE url = ?
+"""
+
+UPSERT_READWISE_TARGET = """
+INSERT INTO readwise_targets (url, target, status, error, readwise_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (url, target) DO UPDATE SET
+    status = excluded.status, error = excluded.error, readwise_at = excluded.readwise_at
+"""
+
+def _now():
+    """Return the current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+class ResultsStore:
+    """
+    SQLite-backed store of article, archive and Readwise results.
+
+    Writes are grouped into transactions: bulk methods write a whole list at
+    once, and the add_* methods buffer single results and flush them every
+    batch_size items (and on flush() or close()). The store may be shared by
+    several threads.
+    """
+
+    def __init__(self, db_path, batch_size=50):
+        """
+        Open (and if needed create) the results database.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+            batch_size (int): Number of buffered results written per transaction.
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending_archive = []
+        self._pending_readwise = []
+
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Flush buffered results and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def record_articles(self, articles):
+        """
+        Record scraped articles in one transaction.
+
+        Args:
+            articles (list): ArticleRecord objects.
+        """
+        now = _now()
+        rows = [
+            (a.url, a.source, a.issue, a.title, a.author, a.section, a.date, now)
+            for a in articles
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_ARTICLE, rows)
+
+    def record_archive_results(self, results):
+        """
+        Record archive results in one transaction.
+
+        Args:
+            results (list): ArchiveResult objects.
+        """
+        with self._lock:
+            self._pending_archive.extend(results)
+            self._flush_archive()
+
+    def add_archive_result(self, result, archive_link=None):
+        """
+        Buffer one archive result, writing the buffer once it holds batch_size results.
+
+        Args:
+            result (ArchiveResult): The result.
+            archive_link (str, optional): The archive.today link used to capture the article.
+        """
+        with self._lock:
+            self._pending_archive.append((result, archive_link))
+            if len(self._pending_archive) >= self.batch_size:
+                self._flush_archive()
+
+    def record_readwise_results(self, results):
+        """
+        Record the Readwise outcomes of archive results in one transaction.
+
+        Args:
+            results (list): ArchiveResult objects; those without a Readwise outcome are skipped.
+        """
+        with self._lock:
+            self._pending_readwise.extend(result for result in results if result.readwise)
+            self._flush_readwise()
+
+    def add_readwise_result(self, result):
+        """
+        Buffer the Readwise outcome of one archive result.
+
+        Args:
+            result (ArchiveResult): Result whose readwise attribute is set.
+        """
+        if not result.readwise:
+            return
+        with self._lock:
+            self._pending_readwise.append(result)
+            if len(self._pending_readwise) >= self.batch_size:
+                self._flush_readwise()
+
+    def flush(self):
+        """Write all buffered results."""
+        with self._lock:
+            self._flush_archive()
+            self._flush_readwise()
+
+    def _flush_archive(self):
+        """Write buffered archive results (and their articles) in one transaction."""
+        if not self._pending_archive:
+            return
+        now = _now()
+        entries = [item if isinstance(item, tuple) else (item, None) for item in self._pending_archive]
+        self._pending_archive = []
+        article_rows = []
+        archive_rows = []
+        for result, archive_link in entries:
+            a = result.article
+            article_rows.append((a.url, a.source, a.issue, a.title, a.author, a.section, a.date, now))
+            archive_rows.append((archive_link, result.archive_url, result.status, result.error, now, a.url))
+        with self._conn:
+            self._conn.executemany(UPSERT_ARTICLE, article_rows)
+            self._conn.executemany(UPDATE_ARCHIVE, archive_rows)
+
+    def _flush_readwise(self):
+        """Write buffered Readwise outcomes in one transaction."""
+        if not self._pending_readwise:
+            return
+        now = _now()
+        rows = [
+            (result.readwise.status, result.readwise.error, now, result.article_url)
+            for result in self._pending_readwise
+        ]
+        target_rows = [
+            (result.article_url, target, outcome.status, outcome.error, now)
+            for result in self._pending_readwise
+            for target, outcome in (result.readwise_targets or {}).items()
+        ]
+        self._pending_readwise = []
+        with self._conn:
+            self._conn.executemany(UPDATE_READWISE, rows)
+            self._conn.executemany(UPSERT_READWISE_TARGET, target_rows)
+
+    def query(self, source=None, issue=None, section=None, date_from=None, date_to=None,
+              archive_status=None, readwise_status=None, archived=None, in_readwise=None, limit=None):
+        """
+        Find recorded articles matching all given filters.
+
+        Args:
+            source (str, optional): Source name.
+            issue (str, optional): Issue name.
+            section (str, optional): Section name (case-insensitive).
+            date_from (str, optional): Earliest publication date (ISO format, inclusive).
+            date_to (str, optional): Latest publication date (ISO format, inclusive).
+            archive_status (str, optional): ArchiveResult status (captured, reused, failed, blocked,
+                                            timed_out, pending or invalid).
+            readwise_status (str, optional): ReadwiseResult status (added, duplicate or failed).
+            archived (bool, optional): Only articles that have (True) or lack (False) an archive URL.
+            in_readwise (bool, optional): Only articles that were (True) or were not (False) added to Readwise.
+            limit (int, optional): Maximum number of rows.
+
+        Returns:
+            list: Matching rows as dicts, in the order the articles were first recorded.
+        """
+        clauses = []
+        params = []
+        for column, value in (('source', source), ('issue', issue),
+                              ('archive_status', archive_status), ('readwise_status', readwise_status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if section:
+            clauses.append("section = ? COLLATE NOCASE")
+            params.append(section)
+        if date_from:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            # A partial upper bound such as "2025-03" includes the whole month
+            clauses.append("date < ?")
+            params.append(date_to + '\uffff')
+        if archived is not None:
+            clauses.append("archive_url IS NOT NULL" if archived else "archive_url IS NULL")
+        if in_readwise is not None:
+            clauses.append("readwise_status IN ('added', 'duplicate')" if in_readwise
+                           else "(readwise_status IS NULL OR readwise_status NOT IN ('added', 'duplicate'))")
+
+        sql = "SELECT * FROM articles"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            self.flush()
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def target_outcomes(self, url):
+        """
+        Look up the Readwise outcome of an article for each target.
+
+        Args:
+            url (str): The article URL.
+
+        Returns:
+            dict: Mapping of target name to a dict with status, error and readwise_at.
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT target, status, error, readwise_at FROM readwise_targets WHERE url = ? ORDER BY target", (url,)
+            )
+            return {row['target']: {key: row[key] for key in ('status', 'error', 'readwise_at')} for row in rows}
+
+    def export_text(self, output_path, source=None, issue=None):
+        """
+        Export results in the plain text formats of earlier versions.
+
+        Writes articles.txt (article URLs), archive_links.txt (archive.today links)
+        and final_archive_links.txt (final archive URLs), one URL per line.
+
+        Args:
+            output_path (str): Directory to write the files to.
+            source (str, optional): Only export this source.
+            issue (str, optional): Only export this issue.
+
+        Returns:
+            dict: Mapping of file name to the number of lines written.
+        """
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+
+        rows = self.query(source=source, issue=issue)
+        files = {
+            'articles.txt': [row['url'] for row in rows],
+            'archive_links.txt': [row['archive_link'] for row in rows if row['archive_link']],
+            'final_archive_links.txt': list(dict.fromkeys(row['archive_url'] for row in rows if row['archive_url'])),
+        }
+        for file_name, links in files.items():
+            with open(os.path.join(output_path, file_name), 'w') as outfile:
+                for link in links:
+                    outfile.write(f"{link}\n")
+
+        logger.info("Exported %d articles to %s", len(rows), output_path)
+        return {file_name: len(links) for file_name, links in files.items()}
@@ -0,0 +1,294 @@
+"""
+Module for adaptive per-host concurrency limits.
+
+How many requests a host tolerates at once varies from hour to hour, so
+instead of a fixed worker count each host gets an AIMD limiter
+(additive increase, multiplicative decrease, as in TCP congestion control).
+While requests succeed at normal latency and the limit is in use, it grows by
+about one request per round of requests; on a 429, a server error, a failed
+connection or a response much slower than the host's baseline latency, it is
+multiplied by the backoff factor (at most once per round trip, so one burst
+of failures counts as one signal). Requests beyond the current limit wait for
+a free slot.
+
+Limited requests draw their connections from shared keep-alive pools, so
+repeated requests to a host skip the TCP and TLS handshakes, and connections
+opened ahead of time by warm_up() are picked up by later requests.
+"""
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from news_archiver.deadline import DeadlineExceeded, request_timeout, remaining, check_deadline
+
+logger = logging.getLogger(__name__)
+
+# Request outcomes
+OUTCOME_OK = 'ok'
+OUTCOME_RATE_LIMITED = 'rate_limited'
+OUTCOME_ERROR = 'error'
+
+# A response only counts as slow if it is also this many seconds above the baseline
+LATENCY_SLACK = 1.0
+
+# Connection pools shared by all limited requests (one pool per host)
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+
+def pooled_session():
+    """
+    Create a session that draws its connections from the shared pools.
+
+    Each session keeps its own cookies. It must not be closed, since that
+    would close the shared pools; dropping it is enough.
+
+    Returns:
+        requests.Session: The session.
+    """
+    session = requests.Session()
+    session.mount('https://', _adapter)
+    session.mount('http://', _adapter)
+    return session
+
+def warm_up(url):
+    """
+    Open a keep-alive connection to a URL's host (following redirects) for later requests.
+
+    Failures are only logged; the request that needs the connection will open its own.
+
+    Args:
+        url (str): Any URL on the host.
+
+    Returns:
+        bool: True if the host answered.
+    """
+    try:
+        pooled_session().head(url, allow_redirects=True, timeout=request_timeout()).close()
+    except requests.exceptions.RequestException as e:
+        logger.debug("Could not warm up a connection to %s: %s", url, e)
+        return False
+    logger.debug("Warmed up a connection to %s", url)
+    return True
+
+def response_outcome(status_code):
+    """
+    Classify an HTTP status code for concurrency control.
+
+    Args:
+        status_code (int): The HTTP status code.
+
+    Returns:
+        str: OUTCOME_OK, OUTCOME_RATE_LIMITED or OUTCOME_ERROR.
+    """
+    if status_code == 429:
+        return OUTCOME_RATE_LIMITED
+    if status_code >= 500:
+        return OUTCOME_ERROR
+    return OUTCOME_OK
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests to one host."""
+
+    def __init__(self, host, initial_limit=2, min_limit=1, max_limit=8, backoff=0.5, latency_tolerance=2.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            host (str): The host the limiter guards.
+            initial_limit (float): Limit before any request has completed.
+            min_limit (float): Lowest limit (at least 1).
+            max_limit (float): Highest limit.
+            backoff (float): Factor the limit is multiplied by on overload.
+            latency_tolerance (float): Multiple of the baseline latency above which a response counts as overload.
+        """
+        self.host = host
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.baseline = None
+        self.requests = 0
+        self.decreases = 0
+        self._last_decrease = None
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """
+        Wait for a free request slot.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            bool: True if a slot was taken, False if the timeout expired.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def cancel(self):
+        """Free a request slot without sending the request."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def release(self, latency, outcome=OUTCOME_OK):
+        """
+        Free a request slot and adjust the limit to the request's outcome.
+
+        Args:
+            latency (float): Seconds the request took.
+            outcome (str): OUTCOME_OK, OUTCOME_RATE_LIMITED or OUTCOME_ERROR.
+        """
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self.requests += 1
+
+            slow = (outcome == OUTCOME_OK and self.baseline is not None
+                    and latency > max(self.baseline * self.latency_tolerance, self.baseline + LATENCY_SLACK))
+            if outcome != OUTCOME_OK or slow:
+                self._decrease(latency, 'slow responses' if slow else outcome.replace('_', ' '))
+            else:
+                # The baseline follows the fastest responses and drifts up slowly
+                self.baseline = latency if self.baseline is None else min(latency, self.baseline * 0.95 + latency * 0.05)
+                if saturated and self.limit < self.max_limit:
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, latency, reason):
+        now = time.monotonic()
+        # Requests that started before the last decrease report the old overload; ignore them
+        if self._last_decrease is not None and now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self.decreases += 1
+        if int(self.limit) < int(previous):
+            logger.debug("Lowering concurrency for %s to %d after %s.", self.host, int(self.limit), reason)
+
+class LimiterRegistry:
+    """Limiters keyed by host, created on first use with shared settings."""
+
+    def __init__(self, **settings):
+        """
+        Initialize the registry.
+
+        Args:
+            **settings: initial_limit, min_limit, max_limit, backoff and latency_tolerance for new limiters.
+        """
+        self._lock = threading.Lock()
+        self._limiters = {}
+        self.settings = {}
+        self.configure(**settings)
+
+    def configure(self, initial_limit=2, min_limit=1, max_limit=8, backoff=0.5, latency_tolerance=2.0):
+        """Change the settings of limiters created from now on and the bounds of existing ones."""
+        with self._lock:
+            self.settings = {
+                'initial_limit': initial_limit,
+                'min_limit': min_limit,
+                'max_limit': max_limit,
+                'backoff': backoff,
+                'latency_tolerance': latency_tolerance,
+            }
+            for limiter in self._limiters.values():
+                with limiter._cond:
+                    limiter.min_limit = max(1, min_limit)
+                    limiter.max_limit = max(limiter.min_limit, max_limit)
+                    limiter.backoff = backoff
+                    limiter.latency_tolerance = latency_tolerance
+                    limiter.limit = min(max(limiter.limit, limiter.min_limit), limiter.max_limit)
+                    limiter._cond.notify_all()
+
+    def get(self, url, scope=None):
+        """
+        Get the limiter of a URL's host.
+
+        Args:
+            url (str): Any URL on the host.
+            scope (str, optional): Name of a separately limited share of the host, e.g. one account.
+
+        Returns:
+            AIMDLimiter: The host's limiter (for the scope).
+        """
+        host = urlsplit(url).netloc.lower()
+        if scope:
+            host = f"{host} [{scope}]"
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = AIMDLimiter(host, **self.settings)
+            return limiter
+
+    def snapshot(self):
+        """
+        Report the state of every limiter.
+
+        Returns:
+            dict: Mapping of host to a dict with limit, peak_limit, requests and decreases.
+        """
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {
+            limiter.host: {
+                'limit': int(limiter.limit),
+                'peak_limit': int(limiter.peak_limit),
+                'requests': limiter.requests,
+                'decreases': limiter.decreases,
+            }
+            for limiter in sorted(limiters, key=lambda limiter: limiter.host)
+        }
+
+    def reset(self):
+        """Forget all limiters."""
+        with self._lock:
+            self._limiters = {}
+
+# Limiters shared by all blocking requests in the process
+limiters = LimiterRegistry()
+
+def limited_request(method, url, limiter_scope=None, **kwargs):
+    """
+    Send a request once the URL's host has a free slot, and adjust its limit to the outcome.
+
+    Unless a timeout is given, the request gets the configured connect and read
+    timeouts, shortened to the nearest deadline.
+
+    Args:
+        method (str): HTTP method.
+        url (str): The URL.
+        limiter_scope (str, optional): Limit the request separately from other requests to the host,
+                                       e.g. per account when the host rate limits each account.
+        **kwargs: Keyword arguments for requests.request.
+
+    Returns:
+        requests.Response: The response.
+
+    Raises:
+        DeadlineExceeded: If the deadline passed before the request could be sent.
+    """
+    limiter = limiters.get(url, limiter_scope)
+    while not limiter.acquire(remaining()):
+        check_deadline()
+    try:
+        kwargs.setdefault('timeout', request_timeout())
+    except DeadlineExceeded:
+        limiter.cancel()
+        raise
+    start = time.monotonic()
+    try:
+        response = pooled_session().request(method, url, **kwargs)
+    except Exception:
+        limiter.release(time.monotonic() - start, OUTCOME_ERROR)
+        raise
+    limiter.release(time.monotonic() - start, response_outcome(response.status_code))
+    return response
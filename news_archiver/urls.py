@@ -0,0 +1,146 @@
+"""
+Module for canonicalizing article URLs and tracking which ones have been seen.
+"""
+import os
+import threading
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only carry campaign/referral tracking
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'referrer',
+    'src', 'source', 'cid', 'giftcode', 'smid', 'share', 'ppcid', 'ppccampaignid',
+}
+TRACKING_PREFIXES = ('utm_', 'itm_', 'ga_', 'at_')
+
+def canonicalize_url(url, base_url=None, trailing_slash=None, keep_query=False):
+    """
+    Reduce an article URL to a canonical form so variants compare equal.
+
+    The scheme is forced to https, the host is lowercased, default ports and
+    fragments are dropped and repeated slashes are collapsed. The query string
+    is dropped entirely unless keep_query is set, in which case only tracking
+    parameters are removed and the rest are sorted.
+
+    Args:
+        url (str): The URL (or relative href) to canonicalize.
+        base_url (str, optional): Base URL used to resolve relative hrefs.
+        trailing_slash (bool, optional): True to always end the path with a slash,
+                                         False to always strip it, None to leave it.
+        keep_query (bool): Keep non-tracking query parameters.
+
+    Returns:
+        str: The canonical URL or None if it is not an absolute http(s) URL.
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    while '//' in path:
+        path = path.replace('//', '/')
+    if path != '/':
+        if trailing_slash is True and not path.endswith('/'):
+            path += '/'
+        elif trailing_slash is False:
+            path = path.rstrip('/') or '/'
+
+    query = ''
+    if keep_query and parts.query:
+        params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+        ]
+        query = urlencode(sorted(params))
+
+    return urlunsplit(('https', host, path, query, ''))
+
+class SeenUrlIndex:
+    """
+    Persistent index of canonical article URLs that have already been processed.
+
+    The index is a plain text file with one URL per line. A URL is only
+    recorded once its article is finished (archived and accepted by Readwise),
+    so articles that failed, were blocked, timed out or were cut off by an
+    interrupted run are picked up again by the next run. Recorded URLs are
+    appended, so the file survives interrupted runs.
+    """
+
+    def __init__(self, index_path, ignore_existing=False):
+        """
+        Initialize the index, loading any URLs recorded by earlier runs.
+
+        Args:
+            index_path (str): Path of the index file.
+            ignore_existing (bool): Treat previously recorded URLs as unseen for
+                                    this run (they are still kept in the file).
+        """
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._recorded = set()
+
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._recorded = {line.strip() for line in f if line.strip()}
+        if not ignore_existing:
+            self._seen.update(self._recorded)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._seen
+
+    def __len__(self):
+        with self._lock:
+            return len(self._seen)
+
+    def filter_new(self, urls):
+        """
+        Drop URLs that have already been processed or were already returned by this index.
+
+        Nothing is written; the URLs returned are only skipped for the rest of
+        this run until they are recorded.
+
+        Args:
+            urls (list): Canonical URLs, in order.
+
+        Returns:
+            list: The URLs not seen before, in their original order.
+        """
+        new_urls = []
+        with self._lock:
+            for url in urls:
+                if url and url not in self._seen:
+                    self._seen.add(url)
+                    new_urls.append(url)
+        return new_urls
+
+    def record(self, urls):
+        """
+        Record URLs whose articles are finished, so later runs skip them.
+
+        Args:
+            urls (list): Canonical URLs.
+        """
+        with self._lock:
+            self._seen.update(url for url in urls if url)
+            to_record = list(dict.fromkeys(url for url in urls if url and url not in self._recorded))
+            if not to_record:
+                return
+            directory = os.path.dirname(self.index_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                for url in to_record:
+                    f.write(url + '\n')
+            self._recorded.update(to_record)
@@ -0,0 +1,197 @@
+"""
+Module for checking archive snapshots before they are added to Readwise.
+
+The snapshot link scraped from an archive.today page is not always usable:
+it can point back at the original article or at the archive's front page,
+at a capture that never finished, or at a snapshot that has since been
+removed or is empty. Adding such a link to Readwise wastes the submission
+and a later one to replace it. Each snapshot is therefore checked first:
+the link itself, then a HEAD request (or, for hosts that do not answer HEAD,
+a GET for the first bytes only) for its status and size. Snapshots that
+fail are handed back to the archiver for another capture. When a check
+cannot be made (rate limiting, server errors, a broken connection, or a
+host paused by its circuit breaker), the snapshot is given the benefit of
+the doubt.
+"""
+import logging
+import requests
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from news_archiver import deadline
+from news_archiver.capture import is_capture_in_progress
+from news_archiver.circuit import guarded_request, ChallengeError, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Snapshots smaller than this many bytes are placeholders rather than article pages
+MIN_SNAPSHOT_BYTES = 512
+
+class SnapshotCheck:
+    """The outcome of checking one snapshot."""
+
+    __slots__ = ('url', 'valid', 'reason')
+
+    def __init__(self, url, valid, reason=None):
+        """
+        Args:
+            url (str): The snapshot URL.
+            valid (bool): True if the snapshot is usable, False if it is broken,
+                          None if it could not be checked.
+            reason (str, optional): Why the snapshot is broken or could not be checked.
+        """
+        self.url = url
+        self.valid = valid
+        self.reason = reason
+
+    @property
+    def broken(self):
+        """True if the snapshot was found to be unusable."""
+        return self.valid is False
+
+    def __repr__(self):
+        return f"SnapshotCheck({self.url!r}, valid={self.valid!r}, reason={self.reason!r})"
+
+def snapshot_link_problem(snapshot_url, article_url=None):
+    """
+    Check a snapshot link without requesting it.
+
+    Args:
+        snapshot_url (str): The snapshot URL.
+        article_url (str, optional): URL of the archived article.
+
+    Returns:
+        str: Why the link cannot be a snapshot, or None if it looks like one.
+    """
+    parts = urlsplit(snapshot_url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return "not an http(s) link"
+    if article_url and parts.netloc.lower() == urlsplit(article_url).netloc.lower():
+        return "links to the original article"
+    if parts.path in ('', '/') and not parts.query:
+        return "links to the archive's front page"
+    if is_capture_in_progress(snapshot_url):
+        return "capture still in progress"
+    return None
+
+def _content_size(response):
+    """Return the full size of a response's body from its headers, or None if unknown."""
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length', '')
+    if response.status_code == 206 or not length.strip().isdigit():
+        return None
+    return int(length)
+
+def check_snapshot(snapshot_url, article_url=None, min_bytes=MIN_SNAPSHOT_BYTES):
+    """
+    Check that a snapshot exists and is not an empty placeholder.
+
+    Args:
+        snapshot_url (str): The snapshot URL.
+        article_url (str, optional): URL of the archived article.
+        min_bytes (int): Smallest size of a usable snapshot page.
+
+    Returns:
+        SnapshotCheck: The outcome.
+    """
+    problem = snapshot_link_problem(snapshot_url, article_url)
+    if problem:
+        return SnapshotCheck(snapshot_url, False, problem)
+
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    try:
+        response = guarded_request('HEAD', snapshot_url, park=False, headers=headers, allow_redirects=True)
+        if response.status_code in (405, 501):
+            # Hosts that do not answer HEAD get a GET for the first bytes only
+            response = guarded_request(
+                'GET', snapshot_url, park=False, headers={**headers, 'Range': f'bytes=0-{max(min_bytes, 1) - 1}'}
+            )
+    except (ChallengeError, CircuitOpenError, requests.exceptions.RequestException) as e:
+        return SnapshotCheck(snapshot_url, None, str(e))
+
+    if is_capture_in_progress(response.url):
+        return SnapshotCheck(snapshot_url, False, "capture still in progress")
+    if response.status_code in (404, 410):
+        return SnapshotCheck(snapshot_url, False, f"snapshot not found (HTTP {response.status_code})")
+    if response.status_code >= 400:
+        return SnapshotCheck(snapshot_url, None, f"HTTP {response.status_code}")
+    size = _content_size(response)
+    if size is not None and size < min_bytes:
+        return SnapshotCheck(snapshot_url, False, f"empty snapshot ({size} bytes)")
+    return SnapshotCheck(snapshot_url, True)
+
+class SnapshotVerifier:
+    """Settings and worker pool of the snapshot verification stage."""
+
+    def __init__(self, enabled=True, retries=1, min_bytes=MIN_SNAPSHOT_BYTES, max_workers=8, timeout=15):
+        """
+        Initialize the verifier.
+
+        Args:
+            enabled (bool): Check snapshots before they are added to Readwise.
+            retries (int): Captures attempted after a broken snapshot before the article is given up on.
+            min_bytes (int): Smallest size of a usable snapshot page.
+            max_workers (int): Number of snapshots checked at once by run_all.
+            timeout (float): Seconds one check may take; a snapshot not checked in time is kept.
+        """
+        self.configure(enabled, retries, min_bytes, max_workers, timeout)
+
+    def configure(self, enabled=True, retries=1, min_bytes=MIN_SNAPSHOT_BYTES, max_workers=8, timeout=15):
+        """Change the verifier's settings (see __init__)."""
+        self.enabled = enabled
+        self.retries = max(0, retries)
+        self.min_bytes = min_bytes
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+    def check(self, snapshot_url, article_url=None):
+        """
+        Check one snapshot.
+
+        Args:
+            snapshot_url (str): The snapshot URL.
+            article_url (str, optional): URL of the archived article.
+
+        Returns:
+            SnapshotCheck: The outcome (always valid while verification is disabled).
+        """
+        if not self.enabled:
+            return SnapshotCheck(snapshot_url, True)
+        with deadline.budget(self.timeout):
+            check = check_snapshot(snapshot_url, article_url, self.min_bytes)
+        if check.valid is None:
+            logger.debug("Could not check snapshot %s: %s", snapshot_url, check.reason)
+        return check
+
+    def run_all(self, fn, items):
+        """
+        Run a verification function over items concurrently.
+
+        The calling thread's time budget applies to every call.
+
+        Args:
+            fn (callable): Function taking one item.
+            items (list): The items.
+
+        Returns:
+            list: fn's return values, in the order of items.
+        """
+        items = list(items)
+        if not items:
+            return []
+        left = deadline.remaining()
+
+        def run(item):
+            with deadline.budget(left):
+                return fn(item)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(run, items))
+
+# Verifier used between archiving and Readwise
+verifier = SnapshotVerifier()
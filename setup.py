@@ -11,6 +11,9 @@ setup(
         "requests>=2.25.0",
         "beautifulsoup4>=4.9.0",
     ],
+    extras_require={
+        "aio": ["aiohttp>=3.8.0"],
+    },
     entry_points={
         "console_scripts": [
             "news-archiver=news_archiver.main:main",